@@ -0,0 +1,278 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy import stats as scipy_stats
+except ImportError:  # scipyΪѡȱʧʱֻFͳpֵ
+    scipy_stats = None
+
+# ԤĶȡдͬParquet/Arrowʽļpreprocessing/columnar_tables.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "preprocessing"))
+from columnar_tables import read_output_table
+
+# --------------------------
+# ڶȫֲ
+# --------------------------
+class Config:
+    # 1. ļ·ãԤűʵԱ뻥ͳƱ
+    DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data")
+    OUTPUT_DIR = None  # Ŀ¼NoneΪ棬ӡ
+
+    # 2. ʵģھ
+    SIZE_COLUMN = "Ծû"  # ģУ"Ծû" / "û"
+    ACTIVE_USER_THRESHOLDS = [1, 5, 20]  # ηĻԾûޣ20Ϊʵھ
+    MIN_TOTAL_INTERACTIONS = 1  # ܻޣCIIRĸ0
+
+    # 3. ģ
+    SIZE_BUCKETS = [("Small", 0, 10), ("Medium", 10, 100), ("Large", 100, np.inf)]  # (ǩ, , )ҿ
+    N_LEVELS = 5  # ģλֵĵlevel1C5
+
+    # 4. λعBootstrap
+    N_BOOTSTRAP = 2000  # س
+    BOOTSTRAP_BATCH = 256  # ÿͬʱسȨؾڴ棺С
+    CONFIDENCE = 0.95
+    RANDOM_SEED = 42
+
+# --------------------------
+# زϲʵ
+# --------------------------
+def load_instance_table(data_dir):
+    """ȡinstance_attributes.csvinstance_interaction_stats.csvʵID"""
+    attrs = read_output_table(
+        data_dir, "instance_attributes.csv", usecols=["ʵID", "û", "Ծû"], dtype={"ʵID": str}
+    )
+    stats = read_output_table(
+        data_dir, "instance_interaction_stats.csv", usecols=["ʵID", "ڲ", "ʵܻ"], dtype={"ʵID": str}
+    )
+    return attrs.merge(stats, on="ʵID", how="inner")
+
+
+def add_ciir_columns(df):
+    """
+    У
+    - ܻ = ڲ + ʵܻ+
+    - CIIR = ʵܻ / ܻܻΪ0ʱΪNaN
+    - ģ = log10(ģ)ģΪ0ʱΪNaN
+    """
+    df = df.copy()
+    total = df["ڲ"].to_numpy(dtype=np.float64) + df["ʵܻ"].to_numpy(dtype=np.float64)
+    size = df[Config.SIZE_COLUMN].to_numpy(dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["ܻ"] = total.astype(np.int64)
+        df["CIIR"] = np.where(total > 0, df["ʵܻ"].to_numpy() / total, np.nan)
+        df["ģ"] = np.where(size > 0, np.log10(size), np.nan)
+    return df
+
+
+def add_bucket_columns(df, n_levels=None):
+    """ӹģ飺Small/Medium/Largeǩ + λֵlevel1CN"""
+    n_levels = n_levels or Config.N_LEVELS
+    df = df.copy()
+    size = df[Config.SIZE_COLUMN].to_numpy(dtype=np.float64)
+
+    # 1. ̶ֵ飨Уsearchsortedλ䣩
+    labels = np.array([label for label, _, _ in Config.SIZE_BUCKETS] + [""], dtype=object)
+    lowers = np.array([lower for _, lower, _ in Config.SIZE_BUCKETS], dtype=np.float64)
+    uppers = np.array([upper for _, _, upper in Config.SIZE_BUCKETS], dtype=np.float64)
+    pos = np.searchsorted(lowers, size, side="right") - 1
+    in_range = (pos >= 0) & (size < uppers[np.clip(pos, 0, None)])
+    df["ģ"] = labels[np.where(in_range, pos, len(lowers))]
+
+    # 2. λֵֵͬͬһ
+    cut_points = np.quantile(size, np.linspace(0, 1, n_levels + 1)[1:-1])
+    df["ģ"] = np.searchsorted(cut_points, size, side="right") + 1
+    return df
+
+
+def select_sample(df, min_active_users):
+    """ԾûܻɸѡCIIRģЧ"""
+    mask = (
+        (df["Ծû"].to_numpy() >= min_active_users)
+        & (df["ܻ"].to_numpy() >= Config.MIN_TOTAL_INTERACTIONS)
+        & np.isfinite(df["CIIR"].to_numpy())
+        & np.isfinite(df["ģ"].to_numpy())
+    )
+    return df[mask]
+
+# --------------------------
+# ĲȽϣط
+# --------------------------
+def oneway_anova(values, groups):
+    """ط (Fͳ, pֵ)pֵscipyȱʧʱΪNone"""
+    _, codes = np.unique(groups, return_inverse=True)
+    n_groups = codes.max() + 1 if len(codes) else 0
+    if n_groups < 2 or len(values) <= n_groups:
+        return np.nan, None
+    counts = np.bincount(codes, minlength=n_groups)
+    group_means = np.bincount(codes, weights=values, minlength=n_groups) / counts
+    grand_mean = values.mean()
+    ss_between = np.sum(counts * (group_means - grand_mean) ** 2)
+    ss_within = np.sum((values - group_means[codes]) ** 2)
+    df_between, df_within = n_groups - 1, len(values) - n_groups
+    f_stat = (ss_between / df_between) / (ss_within / df_within)
+    p_value = float(scipy_stats.f.sf(f_stat, df_between, df_within)) if scipy_stats is not None else None
+    return f_stat, p_value
+
+
+def format_p_value(p_value):
+    return f"{p_value:.3g}" if p_value is not None else "n/a (scipy not installed)"
+
+
+def summarize_groups(df, group_column):
+    """CIIRֵ/λ"""
+    return df.groupby(group_column)["CIIR"].agg(["count", "mean", "median"]).reset_index()
+
+# --------------------------
+# 岽λعBootstrap
+# --------------------------
+def quadratic_design(x):
+    return np.column_stack([np.ones_like(x), x, x * x])
+
+
+def fit_quadratic(x, y):
+    """
+    OLS y = b0 + b1*x + b2*x^2
+    أϵ׼R^2ֵ -b1/(2*b2)
+    """
+    X = quadratic_design(x)
+    beta, _, _, _ = np.linalg.lstsq(X, y, rcond=None)
+    residuals = y - X @ beta
+    dof = len(y) - X.shape[1]
+    sigma2 = residuals @ residuals / dof
+    std_err = np.sqrt(np.diag(sigma2 * np.linalg.inv(X.T @ X)))
+    r2 = 1 - (residuals @ residuals) / np.sum((y - y.mean()) ** 2)
+    return {"beta": beta, "std_err": std_err, "r2": r2, "vertex": -beta[1] / (2 * beta[2])}
+
+
+def bootstrap_quadratic(x, y, n_bootstrap=None, batch_size=None, seed=None):
+    """
+    Bootstrapλع飨ԴPythonع飩
+    - ÿسȼȨwдϵ (X^T W X) beta = X^T W y
+    - һسȨؾСnXг˻ˣһεõX^T W XX^T W y
+      np.linalg.solve33
+    أ״Ϊ(n_bootstrap, 3)ϵ
+    """
+    n_bootstrap = n_bootstrap or Config.N_BOOTSTRAP
+    batch_size = batch_size or Config.BOOTSTRAP_BATCH
+    rng = np.random.default_rng(Config.RANDOM_SEED if seed is None else seed)
+
+    X = quadratic_design(x)
+    n, p = X.shape
+    # X^T W X ÿԪ = sum(w * X[:, i] * X[:, j])ԤչΪ np^2 г˻
+    cross_terms = (X[:, :, None] * X[:, None, :]).reshape(n, p * p)
+    xy_terms = X * y[:, None]
+
+    betas = np.empty((n_bootstrap, p))
+    for start in range(0, n_bootstrap, batch_size):
+        size = min(batch_size, n_bootstrap - start)
+        # س±  ÿеĴƫƺһbincount
+        draws = rng.integers(0, n, size=(size, n))
+        offsets = draws + (np.arange(size) * n)[:, None]
+        weights = np.bincount(offsets.ravel(), minlength=size * n).reshape(size, n).astype(np.float64)
+        xtwx = (weights @ cross_terms).reshape(size, p, p)
+        xtwy = weights @ xy_terms
+        betas[start:start + size] = np.linalg.solve(xtwx, xtwy[:, :, None])[:, :, 0]
+    return betas
+
+
+def percentile_interval(samples, confidence=None):
+    confidence = confidence or Config.CONFIDENCE
+    alpha = (1 - confidence) / 2 * 100
+    return np.percentile(samples, [alpha, 100 - alpha], axis=0)
+
+# --------------------------
+# ֵ
+# --------------------------
+def analyze_threshold(df, min_active_users):
+    """ԻԾûmin_active_usersʵȽλع"""
+    sample = select_sample(df, min_active_users)
+    sample = add_bucket_columns(sample)  # λֵɸѡڼ
+    result = {"min_active_users": min_active_users, "n_instances": len(sample)}
+    if len(sample) < 10:
+        print(f"\n[>={min_active_users} active users] Too few instances ({len(sample)}), skipped")
+        return result, None
+
+    x = sample["ģ"].to_numpy(dtype=np.float64)
+    y = sample["CIIR"].to_numpy(dtype=np.float64)
+
+    # 1. Ƚϣ鰴Small/Medium/LargeSIZE_BUCKETSκڵʵ룩
+    #    ̶ֵڻԾû޽ϸʱп顢⣬ڷλֵĹģһ
+    buckets = sample["ģ"].to_numpy()
+    in_bucket = buckets != ""
+    f_stat, p_value = oneway_anova(y[in_bucket], buckets[in_bucket])
+    level_f_stat, level_p_value = oneway_anova(y, sample["ģ"].to_numpy())
+    bucket_summary = summarize_groups(sample, "ģ")
+
+    # 2. λع + Bootstrap
+    fit = fit_quadratic(x, y)
+    betas = bootstrap_quadratic(x, y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vertices = -betas[:, 1] / (2 * betas[:, 2])
+    b2_low, b2_high = percentile_interval(betas[:, 2])
+    v_low, v_high = percentile_interval(vertices[np.isfinite(vertices)])
+
+    result.update({
+        "anova_F": f_stat, "anova_p": p_value, "level_anova_F": level_f_stat, "level_anova_p": level_p_value,
+        "b0": fit["beta"][0], "b1": fit["beta"][1], "b2": fit["beta"][2],
+        "b2_se": fit["std_err"][2], "r2": fit["r2"], "vertex_log_size": fit["vertex"],
+        "b2_ci_low": b2_low, "b2_ci_high": b2_high,
+        "vertex_ci_low": v_low, "vertex_ci_high": v_high,
+        "share_b2_negative": float(np.mean(betas[:, 2] < 0))
+    })
+
+    print(f"\n[>={min_active_users} active users] {len(sample)} instances")
+    print(bucket_summary.to_string(index=False))
+    n_buckets = len(np.unique(buckets[in_bucket]))
+    print(f"ANOVA across Small/Medium/Large buckets ({n_buckets} non-empty): F = {f_stat:.2f}, p = {format_p_value(p_value)}")
+    print(f"ANOVA across {Config.N_LEVELS} quantile size levels (equal-sized groups, robust to empty buckets): "
+          f"F = {level_f_stat:.2f}, p = {format_p_value(level_p_value)}")
+    print(f"Quadratic OLS: CIIR = {fit['beta'][0]:.4f} + {fit['beta'][1]:.4f}*x + {fit['beta'][2]:.4f}*x^2  (R^2 = {fit['r2']:.3f})")
+    print(f"  b2 {Config.CONFIDENCE:.0%} bootstrap CI: [{b2_low:.4f}, {b2_high:.4f}], share of resamples with b2 < 0: {result['share_b2_negative']:.1%}")
+    # ֵb2ķžb2<0ΪUεķֵb2>0ΪUεĹֵ
+    vertex_kind = "Peak" if fit["beta"][2] < 0 else "Trough"
+    print(f"  {vertex_kind} at log10 size {fit['vertex']:.2f} (CI [{v_low:.2f}, {v_high:.2f}])")
+    return result, sample
+
+# --------------------------
+# ߲
+# --------------------------
+def main():
+    print("="*60)
+    print("        RQ1: Instance Size vs CIIR")
+    print("="*60)
+    start = time.perf_counter()
+
+    df = add_ciir_columns(load_instance_table(Config.DATA_DIR))
+    print(f"Loaded {len(df)} instances (size column: {Config.SIZE_COLUMN}, {Config.N_BOOTSTRAP} bootstrap resamples)")
+
+    results = []
+    for threshold in Config.ACTIVE_USER_THRESHOLDS:
+        result, sample = analyze_threshold(df, threshold)
+        results.append(result)
+        if Config.OUTPUT_DIR and sample is not None:
+            os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
+            sample.to_csv(
+                os.path.join(Config.OUTPUT_DIR, f"ciir_instances_min{threshold}.csv"),
+                index=False, encoding="utf-8-sig"
+            )
+
+    summary = pd.DataFrame(results)
+    if Config.OUTPUT_DIR:
+        os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
+        output_path = os.path.join(Config.OUTPUT_DIR, "ciir_threshold_summary.csv")
+        summary.to_csv(output_path, index=False, encoding="utf-8-sig")
+        print(f"\nSummary saved: {output_path}")
+    print(f"\nTotal time: {time.perf_counter() - start:.2f}s")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,116 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import gzip
+import lzma
+import time
+import tempfile
+
+from json_reader import PROJECTIONS, iter_json_items, select_backend
+from chunk_codecs import zstandard, open_decompressed, chunk_data_size
+from benchmark_json_backends import write_synthetic_chunks, digest
+
+# --------------------------
+# ڶȫֲ
+# --------------------------
+class BenchConfig:
+    # 1. ѹʽѹzstd谲װzstandardδװʱ
+    GZIP_LEVEL = 6
+    XZ_PRESET = 6
+    ZSTD_LEVEL = 3
+
+    # 2. ȡãԤűConfigһ£
+    JSON_BACKEND = "auto"
+    READ_BUFFER_SIZE = 1024 * 1024
+
+    # 3. 㹲洢ϵĺʱ̶ȡѹ/صʱȡ߽ϴ
+    DISK_MB_PER_S = 100  # ʵʹ洢Ķȡ
+
+    # 4. ÿָʽظʱȡһΣļҳУõǽѹ+CPUʱ
+    REPEAT = 3
+
+# --------------------------
+# ɸѹʽķֿ
+# --------------------------
+def compressors():
+    """(׺, ѹ)δѹ.jsonǰΪ׼"""
+    codecs = [
+        (".json", None),
+        (".json.gz", lambda data: gzip.compress(data, compresslevel=BenchConfig.GZIP_LEVEL)),
+        (".json.xz", lambda data: lzma.compress(data, preset=BenchConfig.XZ_PRESET))
+    ]
+    if zstandard is not None:
+        codecs.append((".json.zst", lambda data: zstandard.ZstdCompressor(level=BenchConfig.ZSTD_LEVEL).compress(data)))
+    else:
+        print("zstandard not installed, skipping .json.zst")
+    return codecs
+
+
+def write_compressed(paths, suffix, compress):
+    """δѹֿдΪָʽ {ֿ: ļ·}"""
+    if compress is None:
+        return paths
+    compressed = {}
+    for chunk_type, path in paths.items():
+        compressed[chunk_type] = path[:-len(".json")] + suffix
+        with open(path, "rb") as src, open(compressed[chunk_type], "wb") as dst:
+            dst.write(compress(src.read()))
+    return compressed
+
+# --------------------------
+# Ĳʽʱ
+# --------------------------
+def read_items(path, chunk_type):
+    """ԤűͬĶȡ·󻺳  ʽѹ  ijson˲ͶӰ"""
+    with open(path, "rb", buffering=BenchConfig.READ_BUFFER_SIZE) as f:
+        stream = open_decompressed(f, path, BenchConfig.READ_BUFFER_SIZE)
+        yield from iter_json_items(
+            stream, BenchConfig.JSON_BACKEND, chunk_data_size(path), projection=PROJECTIONS[chunk_type],
+            buf_size=BenchConfig.READ_BUFFER_SIZE
+        )
+
+
+def time_codec(paths):
+    """ֿȫʱĿ"""
+    best, count = float("inf"), 0
+    for _ in range(BenchConfig.REPEAT):
+        count = 0
+        start = time.perf_counter()
+        for chunk_type, path in paths.items():
+            for _ in read_items(path, chunk_type):
+                count += 1
+        best = min(best, time.perf_counter() - start)
+    return count, best
+
+
+def main():
+    print("="*60)
+    print("        Compressed Chunk Input Benchmark")
+    print("="*60)
+    print(f"ijson backend: {select_backend(BenchConfig.JSON_BACKEND)[0]}, read buffer {BenchConfig.READ_BUFFER_SIZE // 1024} KB, "
+          f"disk estimate at {BenchConfig.DISK_MB_PER_S} MB/s")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        raw_paths = write_synthetic_chunks(tmp_dir)
+        raw_bytes = sum(os.path.getsize(path) for path in raw_paths.values())
+        reference, baseline = None, None
+        print(f"\n{'format':<10} {'MB on disk':>10} {'ratio':>6} {'cached items/s':>15} {'est. disk items/s':>18} {'speedup':>8}  identical")
+        for suffix, compress in compressors():
+            paths = write_compressed(raw_paths, suffix, compress)
+            disk_bytes = sum(os.path.getsize(path) for path in paths.values())
+            count, seconds = time_codec(paths)
+            # 㣺̶ȡѹֽCPUѹص
+            disk_seconds = max(seconds, disk_bytes / 1024 ** 2 / BenchConfig.DISK_MB_PER_S)
+            # УõĿбֻժҪڼڣפĴбʽʱʱգ
+            items_digest = digest([item for chunk_type, path in paths.items() for item in read_items(path, chunk_type)])
+            if reference is None:
+                reference, baseline = items_digest, disk_seconds
+            print(f"{suffix:<10} {disk_bytes / 1024 ** 2:>10.1f} {raw_bytes / disk_bytes:>6.1f} {count / seconds:>15,.0f} "
+                  f"{count / disk_seconds:>18,.0f} {baseline / disk_seconds:>7.2f}x  {items_digest == reference}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
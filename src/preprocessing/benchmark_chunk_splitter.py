@@ -0,0 +1,75 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import time
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from json_reader import iter_json_items
+from chunk_splitter import split_chunk_file, open_chunk_range
+from benchmark_json_backends import BenchConfig as SyntheticConfig, write_synthetic_chunks, digest
+
+# --------------------------
+# ڶȫֲ
+# --------------------------
+class BenchConfig:
+    # 1. ϳɵĳboostersfavouritesֿĿģԶֿĵļ
+    N_BOOSTERS = 60000
+
+    # 2. з벢
+    SPLIT_BYTES = [64 * 1024 ** 2, 16 * 1024 ** 2, 4 * 1024 ** 2]
+    WORKERS = max(1, os.cpu_count() or 1)
+    JSON_BACKEND = "auto"
+
+# --------------------------
+# ļ밴䲢н
+# --------------------------
+def parse_task(task):
+    """
+    workerļһֽ䣬ÿĿժҪ
+    ԤűworkerصǾۺϺĲֻֽͬشݣʱĿл
+    """
+    if isinstance(task, str):
+        with open(task, "rb") as f:
+            return [digest(item) for item in iter_json_items(f, BenchConfig.JSON_BACKEND)]
+    return [digest(item) for item in iter_json_items(open_chunk_range(task), BenchConfig.JSON_BACKEND)]
+
+
+def parse_parallel(tasks):
+    """˳ƴӸworkerĿժҪ"""
+    with ProcessPoolExecutor(max_workers=BenchConfig.WORKERS) as executor:
+        return [item for items in executor.map(parse_task, tasks) for item in items]
+
+
+def main():
+    print("="*60)
+    print("        Intra-File Chunk Splitting Benchmark")
+    print("="*60)
+    SyntheticConfig.N_BOOSTERS = BenchConfig.N_BOOSTERS
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = write_synthetic_chunks(tmp_dir)["boostersfavourites"]
+        size_mb = os.path.getsize(path) / 1024 ** 2
+        print(f"Chunk: {size_mb:.1f} MB, {BenchConfig.WORKERS} workers")
+
+        start = time.perf_counter()
+        reference = parse_task(path)
+        sequential = time.perf_counter() - start
+        print(f"\nSequential ijson.items:      {sequential:.2f}s")
+
+        for split_bytes in BenchConfig.SPLIT_BYTES:
+            start = time.perf_counter()
+            ranges = split_chunk_file(path, split_bytes) or [path]
+            scan = time.perf_counter() - start
+            start = time.perf_counter()
+            identical = parse_parallel(ranges) == reference
+            parallel = time.perf_counter() - start
+            print(f"Split {split_bytes / 1024 ** 2:>4.0f} MB: {len(ranges):>3} ranges, scan {scan:.2f}s "
+                  f"({size_mb / max(scan, 1e-9):.0f} MB/s), parse {parallel:.2f}s, "
+                  f"speedup {sequential / (scan + parallel):.2f}x, identical: {identical}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
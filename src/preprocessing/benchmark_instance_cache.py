@@ -0,0 +1,136 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import time
+import random
+import importlib.util
+import pandas as pd
+from urllib.parse import urlparse
+
+from instance_url import format_cache_info
+
+# --------------------------
+# ڶȫֲ
+# --------------------------
+class BenchConfig:
+    # 1. ʵԱڰʵʵģ˺URL
+    DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data")
+
+    # 2. ģ˺ųشСҴԾûظ֣ҴԶ˺
+    N_ACCOUNTS = 50000
+    N_LOOKUPS = 500000
+    RANDOM_SEED = 42
+
+# --------------------------
+# ˺URL
+# --------------------------
+def load_script(file_name, module_name):
+    """·Ԥűdata_cleaning_rq1&2.pyļ޷ֱimport"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_account_urls():
+    """ʵûȨȡ˺ţٰZipfʽԾظǳURL"""
+    rng = random.Random(BenchConfig.RANDOM_SEED)
+    attrs = pd.read_csv(
+        os.path.join(BenchConfig.DATA_DIR, "instance_attributes.csv"),
+        encoding="utf-8-sig", dtype={"ʵID": str}, keep_default_na=False
+    )
+    instances = attrs["ʵID"].tolist()
+    weights = attrs["û"].clip(lower=1).tolist()
+
+    accounts = [
+        f"https://{instance}/@user{i}"
+        for i, instance in enumerate(rng.choices(instances, weights=weights, k=BenchConfig.N_ACCOUNTS))
+    ]
+    # ǳʽhttpǰ׺ѯβհסֵurlparse·
+    accounts[::97] = [f"http://{url[8:]}" for url in accounts[::97]]
+    accounts[::89] = [f"{url}?lang=en" for url in accounts[::89]]
+    accounts[::83] = [f"  {url}  " for url in accounts[::83]]
+    accounts[::211] = ["" for _ in accounts[::211]]
+
+    activity = [1.0 / (rank + 1) for rank in range(len(accounts))]
+    return rng.choices(accounts, weights=activity, k=BenchConfig.N_LOOKUPS)
+
+# --------------------------
+# Ĳɰʵ֣ÿ¼urlparse
+# --------------------------
+def legacy_rq3_extract_instance_id(url_or_sid):
+    url_or_sid_str = str(url_or_sid).strip()
+    if '#' in url_or_sid_str:
+        return url_or_sid_str.split('#')[0]
+    parsed = urlparse(url_or_sid_str)
+    return parsed.netloc if parsed.netloc else ""
+
+
+def make_legacy_rq12_extract_instance_id(is_valid_instance):
+    def legacy_rq12_extract_instance_id(url_or_sid):
+        if not url_or_sid:
+            return ""
+        url_or_sid_str = str(url_or_sid).strip()
+        if '#' in url_or_sid_str:
+            url_or_sid_str = url_or_sid_str.split('#')[0]
+        try:
+            parsed = urlparse(url_or_sid_str)
+            instance = parsed.netloc if parsed.netloc else parsed.path.strip()
+            return instance if is_valid_instance(instance) else ""
+        except Exception:
+            return ""
+    return legacy_rq12_extract_instance_id
+
+# --------------------------
+# 岽ʱУһ
+# --------------------------
+def time_per_record(fn, urls):
+    start = time.perf_counter()
+    results = [fn(url) for url in urls]
+    elapsed = time.perf_counter() - start
+    return results, elapsed / len(urls) * 1e9
+
+
+def run_script_benchmark(label, module, legacy_fn, urls):
+    print(f"\n[{label}]")
+    module.parse_instance_url.cache_clear()
+    legacy_results, legacy_ns = time_per_record(legacy_fn, urls)
+
+    def uncached(url):
+        # Ƭ·
+        url_str = str(url).strip()
+        if '#' in url_str:
+            return module.extract_instance_id(url_str)
+        return module.parse_instance_url.__wrapped__(url_str)
+
+    fast_results, fast_ns = time_per_record(uncached, urls)
+    cached_results, cached_ns = time_per_record(module.extract_instance_id, urls)
+
+    print(f"  urlparse every record:   {legacy_ns:8.1f} ns/record")
+    print(f"  host slicing (no cache): {fast_ns:8.1f} ns/record ({legacy_ns / fast_ns:.1f}x)")
+    print(f"  host slicing + LRU:      {cached_ns:8.1f} ns/record ({legacy_ns / cached_ns:.1f}x)")
+    print(f"  {format_cache_info('Instance-ID', module.parse_instance_url.cache_info())}")
+    print(f"  Results identical to urlparse version: {legacy_results == fast_results == cached_results}")
+
+
+def main():
+    print("="*60)
+    print("        Instance-ID Extraction Micro-Benchmark")
+    print("="*60)
+    urls = build_account_urls()
+    print(f"Sampled {len(urls)} lookups over {len(set(urls))} distinct account URLs")
+
+    rq3 = load_script("data_cleaning_rq3new.py", "data_cleaning_rq3new")
+    rq12 = load_script("data_cleaning_rq1&2.py", "data_cleaning_rq12")
+    run_script_benchmark("data_cleaning_rq3new.py", rq3, legacy_rq3_extract_instance_id, urls)
+    run_script_benchmark(
+        "data_cleaning_rq1&2.py", rq12, make_legacy_rq12_extract_instance_id(rq12.is_valid_instance), urls
+    )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
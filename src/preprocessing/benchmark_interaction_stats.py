@@ -0,0 +1,170 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import time
+import random
+import tempfile
+import filecmp
+import pandas as pd
+from collections import Counter
+
+from data_cleaning_rq3new import build_instance_interaction_stats
+
+# --------------------------
+# ڶȫֲ
+# --------------------------
+class BenchConfig:
+    # 1. Ŀ¼ĬϲֿdataĿ¼
+    DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data")
+
+    # 2. ɰǶѭʱԼΪ ʵȫʮ
+    #    NoneʾȫΪÿȡ
+    SAMPLE_PAIRS = 5000
+    RANDOM_SEED = 42
+
+    # 3. ظʱȡСֵ
+    REPEAT = 3
+
+# --------------------------
+# ؼɰʵ
+# --------------------------
+def load_counter(file_name):
+    """ӻCSVԭ(ʵ, Ŀʵ)  """
+    path = os.path.join(BenchConfig.DATA_DIR, file_name)
+    df = pd.read_csv(path, encoding="utf-8-sig", dtype={"ʵ": str, "Ŀʵ": str}, keep_default_na=False)
+    return Counter({
+        (from_inst, to_inst): int(count)
+        for from_inst, to_inst, count in zip(df["ʵ"], df["Ŀʵ"], df[""])
+    })
+
+
+def sample_counter(counter, n_pairs, rng):
+    """ȡԣԭ˳"""
+    if n_pairs is None or n_pairs >= len(counter):
+        return counter
+    keep = set(rng.sample(range(len(counter)), n_pairs))
+    return Counter({pair: count for i, (pair, count) in enumerate(counter.items()) if i in keep})
+
+
+def legacy_build_instance_interaction_stats(reply_counter, boost_counter, fav_counter):
+    """ɰʵ֣ʵظɨڻ׼Աȣ"""
+    all_instances = set()
+    for counter in [reply_counter, boost_counter, fav_counter]:
+        for (from_inst, to_inst) in counter.keys():
+            all_instances.add(from_inst)
+            all_instances.add(to_inst)
+    all_instances = [inst for inst in all_instances if inst]
+
+    stats_dict = {}
+    for inst in all_instances:
+        stats_dict[inst] = {
+            "ڲظ": 0, "ڲת": 0, "ڲ": 0, "ڲ": 0,
+            "ʵظ": 0, "ʵת": 0, "ʵ": 0, "ʵ": 0,
+            "ʵظ": 0, "ʵת": 0, "ʵ": 0, "ʵ": 0,
+            "ʵܻ": 0
+        }
+
+    for inst in all_instances:
+        for (from_inst, to_inst), count in reply_counter.items():
+            if from_inst == to_inst == inst:
+                stats_dict[inst]["ڲظ"] += count
+            elif from_inst == inst and to_inst != inst:
+                stats_dict[inst]["ʵظ"] += count
+            elif to_inst == inst and from_inst != inst:
+                stats_dict[inst]["ʵظ"] += count
+
+        for (from_inst, to_inst), count in boost_counter.items():
+            if from_inst == to_inst == inst:
+                stats_dict[inst]["ڲת"] += count
+            elif from_inst == inst and to_inst != inst:
+                stats_dict[inst]["ʵת"] += count
+            elif to_inst == inst and from_inst != inst:
+                stats_dict[inst]["ʵת"] += count
+
+        for (from_inst, to_inst), count in fav_counter.items():
+            if from_inst == to_inst == inst:
+                stats_dict[inst]["ڲ"] += count
+            elif from_inst == inst and to_inst != inst:
+                stats_dict[inst]["ʵ"] += count
+            elif to_inst == inst and from_inst != inst:
+                stats_dict[inst]["ʵ"] += count
+
+        stats = stats_dict[inst]
+        stats["ڲ"] = stats["ڲظ"] + stats["ڲת"] + stats["ڲ"]
+        stats["ʵ"] = stats["ʵظ"] + stats["ʵת"] + stats["ʵ"]
+        stats["ʵ"] = stats["ʵظ"] + stats["ʵת"] + stats["ʵ"]
+        stats["ʵܻ"] = stats["ʵ"] + stats["ʵ"]
+
+    stats_list = []
+    for inst, stats in stats_dict.items():
+        stats["ʵID"] = inst
+        stats_list.append(stats)
+
+    df = pd.DataFrame(stats_list)
+    col_order = ["ʵID"] + [col for col in df.columns if col != "ʵID"]
+    df = df[col_order]
+    df = df.drop_duplicates(subset=["ʵID"])
+    df = df.dropna(subset=["ʵID"])
+    return df
+
+# --------------------------
+# ĲʱУһ
+# --------------------------
+def main():
+    print("="*60)
+    print("        instance_interaction_stats Builder Benchmark")
+    print("="*60)
+
+    reply_counter = load_counter("interaction_matrix_reply.csv")
+    boost_counter = load_counter("interaction_matrix_boost.csv")
+    fav_counter = load_counter("interaction_matrix_fav.csv")
+    print(f"Loaded pairs: reply={len(reply_counter)}, boost={len(boost_counter)}, fav={len(fav_counter)}")
+
+    # 1. ȫʱ
+    full_times = []
+    for _ in range(BenchConfig.REPEAT):
+        start = time.perf_counter()
+        full_df = build_instance_interaction_stats(reply_counter, boost_counter, fav_counter)
+        full_times.append(time.perf_counter() - start)
+    print(f"\nSingle-pass engine (full data, {len(full_df)} instances): {min(full_times):.3f}s")
+
+    # 2. ֿѷͳƱʵȶԣ˳ϱ˳򣬹ʰID룩
+    published_path = os.path.join(BenchConfig.DATA_DIR, "instance_interaction_stats.csv")
+    if os.path.exists(published_path):
+        published = pd.read_csv(published_path, encoding="utf-8-sig", dtype={"ʵID": str}, keep_default_na=False)
+        aligned = full_df.set_index("ʵID").sort_index()
+        published = published.set_index("ʵID").sort_index()
+        same = aligned.index.equals(published.index) and (aligned.values == published.values).all()
+        print(f"Matches published instance_interaction_stats.csv (aligned by instance): {same}")
+
+    # 3. ڳ϶Ա¾ʵֺʱУCSVֽһ
+    rng = random.Random(BenchConfig.RANDOM_SEED)
+    sampled = [sample_counter(c, BenchConfig.SAMPLE_PAIRS, rng) for c in (reply_counter, boost_counter, fav_counter)]
+    print(f"\nComparison sample: {sum(len(c) for c in sampled)} pairs (SAMPLE_PAIRS={BenchConfig.SAMPLE_PAIRS})")
+
+    start = time.perf_counter()
+    legacy_df = legacy_build_instance_interaction_stats(*sampled)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine_df = build_instance_interaction_stats(*sampled)
+    engine_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy_path = os.path.join(tmp_dir, "legacy.csv")
+        engine_path = os.path.join(tmp_dir, "engine.csv")
+        legacy_df.to_csv(legacy_path, index=False, encoding="utf-8-sig")
+        engine_df.to_csv(engine_path, index=False, encoding="utf-8-sig")
+        identical = filecmp.cmp(legacy_path, engine_path, shallow=False)
+
+    print(f"Nested loop:        {legacy_time:.3f}s ({len(legacy_df)} instances)")
+    print(f"Single-pass engine: {engine_time:.3f}s ({len(engine_df)} instances)")
+    print(f"Speedup: {legacy_time / max(engine_time, 1e-9):.1f}x")
+    print(f"Byte-identical CSV output: {identical}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,162 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import json
+import time
+import random
+import hashlib
+import tempfile
+
+from json_reader import BACKEND_PREFERENCE, PROJECTIONS, select_backend, full_document_parser, iter_json_items
+
+# --------------------------
+# ڶȫֲ
+# --------------------------
+class BenchConfig:
+    # 1. ϳɷֿģÿֿĿ
+    N_LIVEFEEDS = 20000
+    N_REPLY = 30000
+    N_BOOSTERS = 15000
+    N_ACCOUNTS = 5000
+    N_INSTANCES = 300
+    RANDOM_SEED = 42
+
+    # 2. ÿظʱȡһΣ
+    REPEAT = 3
+
+# --------------------------
+# FediLive״ĺϳɷֿ
+# --------------------------
+def make_account(rng, user):
+    """Mastodon accountֶһµ˺ţűʹõdisplay_name/noteֶΣ"""
+    instance = f"inst{user % BenchConfig.N_INSTANCES}.social"
+    return {
+        "id": str(100000 + user), "username": f"user{user}", "acct": f"user{user}@{instance}",
+        "display_name": f"User {user}", "locked": False, "bot": rng.random() < 0.05,
+        "created_at": "2022-11-0%dT12:00:00.000Z" % rng.randint(1, 9),
+        "note": "<p>" + "about me " * rng.randint(1, 20) + "</p>",
+        "url": f"https://{instance}/@user{user}",
+        "avatar": f"https://{instance}/avatars/{user}.png",
+        "followers_count": rng.randint(0, 5000), "following_count": rng.randint(0, 2000),
+        "statuses_count": rng.randint(0, 20000),
+        "last_status_at": "2024-12-%02d" % rng.randint(1, 12),
+        "emojis": [], "fields": [{"name": "site", "value": "<a href='https://example.org'>example</a>"}]
+    }
+
+
+def make_status(rng, index, accounts):
+    user = rng.randrange(len(accounts))
+    instance = accounts[user]["url"].split("/")[2]
+    return {
+        "sid": f"{instance}#{110000000 + index}",
+        "created_at": "2024-12-%02dT%02d:%02d:00.000Z" % (rng.randint(1, 12), rng.randint(0, 23), rng.randint(0, 59)),
+        "content": "<p>" + "lorem ipsum dolor sit amet " * rng.randint(2, 30) + "</p>",
+        "account": accounts[user],
+        "media_attachments": [{"type": "image", "url": f"https://{instance}/media/{index}.jpg", "meta": {"width": 1200, "height": 800}}] if rng.random() < 0.2 else [],
+        "tags": [{"name": rng.choice(["art", "news", "photography", "music", "fediverse", "linux"])} for _ in range(rng.randint(0, 3))],
+        "emojis": [], "card": None, "replies_count": rng.randint(0, 10), "reblogs_count": rng.randint(0, 20),
+        "favourites_count": rng.randint(0, 50), "language": rng.choice(["en", "ja", "de", "fr"])
+    }
+
+
+def write_synthetic_chunks(out_dir):
+    """livefeeds / reply / boostersfavouritesֿ飬 {ֿ: ļ·}"""
+    rng = random.Random(BenchConfig.RANDOM_SEED)
+    accounts = [make_account(rng, user) for user in range(BenchConfig.N_ACCOUNTS)]
+    statuses = [make_status(rng, index, accounts) for index in range(BenchConfig.N_LIVEFEEDS)]
+    chunks = {
+        "livefeeds": statuses,
+        "reply": [
+            {"acct": rng.choice(accounts), "reply_to_acct": rng.choice(accounts), "sid": rng.choice(statuses)["sid"]}
+            for _ in range(BenchConfig.N_REPLY)
+        ],
+        "boostersfavourites": [
+            {"sid": rng.choice(statuses)["sid"],
+             "favourites": rng.sample(accounts, rng.randint(0, 8)), "reblogs": rng.sample(accounts, rng.randint(0, 4))}
+            for _ in range(BenchConfig.N_BOOSTERS)
+        ]
+    }
+    paths = {}
+    for chunk_type, items in chunks.items():
+        paths[chunk_type] = os.path.join(out_dir, f"{chunk_type}_1.json")
+        with open(paths[chunk_type], "w", encoding="utf-8") as f:
+            json.dump(items, f, ensure_ascii=False)
+    return paths
+
+# --------------------------
+# Ĳ˼ʱ
+# --------------------------
+def available_readers():
+    """ȫõĶȡʽ(, ˲, ֵ, ǷֶͶӰ)PythonǰΪٱȻ׼"""
+    readers = []
+    for name in sorted(BACKEND_PREFERENCE, key=lambda name: name != "python"):
+        try:
+            select_backend(name)
+        except ImportError:
+            continue
+        readers.append((f"ijson/{name}", name, None, False))
+        readers.append((f"ijson/{name}+projection", name, None, True))
+    readers.append((f"whole-chunk/{full_document_parser()[0]}", "auto", float("inf"), False))
+    return readers
+
+
+def project(value, projection):
+    """ĶӦֶͶӰУͶӰȡĽ"""
+    if isinstance(value, dict) and isinstance(projection, dict):
+        return {key: project(item, projection[key]) for key, item in value.items() if key in projection}
+    if isinstance(value, list) and isinstance(projection, list):
+        return [project(item, projection[0]) for item in value]
+    return value
+
+
+def digest(items):
+    """ĿժҪСͳһתΪfloatȽϲͬ˵Ľ"""
+    return hashlib.md5(json.dumps(items, default=float, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def time_reader(path, backend, full_parse_max_bytes, projection):
+    """ѣĿȡһεĺʱһζռĿУ"""
+    best = float("inf")
+    for _ in range(BenchConfig.REPEAT):
+        count = 0
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            for _ in iter_json_items(f, backend, os.path.getsize(path), full_parse_max_bytes, projection, projection_mode=True):
+                count += 1
+        best = min(best, time.perf_counter() - start)
+    with open(path, "rb") as f:
+        items = list(iter_json_items(f, backend, os.path.getsize(path), full_parse_max_bytes, projection, projection_mode=True))
+    return items, best
+
+
+def main():
+    print("="*60)
+    print("        JSON Parsing Backend Throughput Benchmark")
+    print("="*60)
+    readers = available_readers()
+    print("Readers: " + ", ".join(name for name, _, _, _ in readers) + f" (speedup relative to {readers[0][0]})")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = write_synthetic_chunks(tmp_dir)
+        for chunk_type, path in paths.items():
+            size_mb = os.path.getsize(path) / 1024 ** 2
+            print(f"\n[{chunk_type}] {size_mb:.1f} MB")
+            reference, baseline = None, None
+            for name, backend, full_parse_max_bytes, projected in readers:
+                projection = PROJECTIONS[chunk_type] if projected else None
+                items, seconds = time_reader(path, backend, full_parse_max_bytes, projection)
+                if reference is None:
+                    reference = items
+                    baseline = seconds
+                # ͶӰȡĽӦڶͬͶӰ
+                expected = [project(item, projection) for item in reference] if projected else reference
+                identical = digest(items) == digest(expected)
+                print(f"  {name:<22} {len(items) / seconds:>12,.0f} items/s  {size_mb / seconds:>8.1f} MB/s  "
+                      f"{baseline / seconds:>6.2f}x  identical: {identical}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,201 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import subprocess
+import importlib.util
+
+import synthetic_fedilive
+from synthetic_fedilive import fit_profile, generate_chunks, fit_power_law, read_csv
+
+# --------------------------
+# ڶȫֲ
+# --------------------------
+class BenchConfig:
+    # 1. ģsynthetic_fedilive.Config1ģı
+    SCALES = [1, 10, 100]
+    RANDOM_SEED = 42
+
+    # 2. ű  жгɹļ
+    SCRIPTS = {"data_cleaning_rq1&2.py": "interaction_table.csv", "data_cleaning_rq3new.py": "instance_attributes.csv"}
+    SCRIPT_SETTINGS = {}  # űConfigеĲ{"WORKERS": 4, "JSON_BACKEND": "python"}JSON_DIR/OUTPUT_DIR/PROFILE_REPORTɻ׼ã
+
+    # 3. Ŀ¼
+    WORK_DIR = None  # ϳɷֿűĿ¼NoneΪʱĿ¼ɾָĿ¼ʱͬɵķֱֿӸ
+    RESULT_FILE = "benchmark_scale_results.json"  # ܽÿеĽ׶棩ԵǰĿ¼NoneΪ
+
+PROFILE_REPORT = "stage_profile.json"
+
+# --------------------------
+# ɣãģĺϳɷֿ
+# --------------------------
+def synthetic_params(scale):
+    """ϳݵĲɷֿ嵥һʱã"""
+    config = synthetic_fedilive.Config
+    return {
+        "generator": synthetic_fedilive.GENERATOR_VERSION, "scale": scale, "seed": BenchConfig.RANDOM_SEED, "base_users": config.BASE_USERS, "base_posts": config.BASE_POSTS,
+        "base_interactions": config.BASE_INTERACTIONS, "base_booster_items": config.BASE_BOOSTER_ITEMS,
+        "user_activity_alpha": config.USER_ACTIVITY_ALPHA, "post_popularity_alpha": config.POST_POPULARITY_ALPHA,
+        "chunk_items": config.CHUNK_ITEMS
+    }
+
+
+def prepare_chunks(work_dir, scale, profile):
+    """ (ֿĿ¼, ͳ)嵥еĲһʱ"""
+    chunk_dir = os.path.join(work_dir, f"chunks_{scale}x")
+    manifest_path = os.path.join(chunk_dir, "synthetic.json")
+    params = synthetic_params(scale)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest["params"] == params:
+            print(f"Reusing {scale}x chunks in {chunk_dir}")
+            return chunk_dir, manifest["stats"]
+        shutil.rmtree(chunk_dir)
+    start = time.perf_counter()
+    stats = generate_chunks(chunk_dir, scale, profile, BenchConfig.RANDOM_SEED)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"params": params, "stats": stats}, f, indent=2)
+    print(f"Generated {scale}x chunks in {time.perf_counter() - start:.1f}s: {stats['instances']} instances, "
+          f"{stats['users']} accounts, {input_bytes(stats) / 1024 ** 2:.0f} MB")
+    return chunk_dir, stats
+
+
+def input_bytes(stats):
+    return sum(stats[chunk_type][2] for chunk_type in ("livefeeds", "reply", "boostersfavourites"))
+
+# --------------------------
+# ĲڶӽԤű
+# --------------------------
+def load_script(file_name):
+    """
+    ·Ԥűdata_cleaning_rq1&2.pyļ޷ֱimportǼǵsys.modules
+    ű̳ʱworkerܰģҵеĺ
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name)
+    module_name = os.path.splitext(file_name)[0].replace("&", "")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# ӽģʽ--run ű ֿĿ¼ Ŀ¼ JSON뱾ģʱرű
+# spawnʽĽ̳workerͬвµ뱾ģ飩
+RUN_MODULE = load_script(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[1] == "--run" else None
+
+
+def run_in_process(json_dir, output_dir, settings):
+    """ӽڣǱűConfig׶main()"""
+    module = RUN_MODULE
+    module.Config.JSON_DIR = json_dir
+    module.Config.OUTPUT_DIR = output_dir
+    for key, value in settings.items():
+        setattr(module.Config, key, value)
+    module.Config.PROFILE_REPORT = PROFILE_REPORT
+    module.main()
+
+
+def run_script(script, json_dir, output_dir):
+    """
+    ÿʹµӽֵ̣RSSӰ죬ҲǰһеڴӰ죩
+    ؽűдӽܺʱ뵼룩
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    log_path = output_dir + ".log"
+    args = [sys.executable, os.path.abspath(__file__), "--run", script, json_dir, output_dir, json.dumps(BenchConfig.SCRIPT_SETTINGS)]
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        subprocess.run(args, stdout=log, stderr=subprocess.STDOUT, check=True,
+                       env=dict(os.environ, PYTHONIOENCODING="utf-8"), cwd=os.path.dirname(os.path.abspath(__file__)))
+    elapsed = time.perf_counter() - start
+    report_path = os.path.join(output_dir, PROFILE_REPORT)
+    if not os.path.exists(os.path.join(output_dir, BenchConfig.SCRIPTS[script])) or not os.path.exists(report_path):
+        raise RuntimeError(f"{script} did not complete, see {log_path}")
+    with open(report_path, "r", encoding="utf-8") as f:
+        return json.load(f), elapsed
+
+
+def summarize(report, elapsed, stats):
+    """һеڴ棺Ŀȡ׶νJSONĿ"""
+    items = sum(stage["items"] for stage in report["stages"] if stage["parent"] is None and stage["item_unit"] == "json items")
+    wall = report["total_wall_s"]
+    return {
+        "items": items, "input_mb": round(input_bytes(stats) / 1024 ** 2, 1), "wall_s": wall, "process_s": round(elapsed, 2),
+        "items_per_s": round(items / wall, 1), "mb_per_s": round(input_bytes(stats) / 1024 ** 2 / wall, 2),
+        "peak_rss_mb": report["peak_rss_mb"], "worker_peak_rss_mb": report["worker_peak_rss_mb"]
+    }
+
+
+def shape_check(output_dir, profile):
+    """RQ3ĿķֲգʵûָʵԻָʵڻռ"""
+    attrs = read_csv(output_dir, "instance_attributes.csv")
+    total = read_csv(output_dir, "interaction_matrix_total.csv")
+    internal = total.loc[total["ʵ"] == total["Ŀʵ"], ""].sum() / total[""].sum()
+    data_internal = sum(profile["type_share"][t] * profile["self_share"][t] for t in profile["type_share"])
+    return {
+        "instances": len(attrs),
+        "instance_alpha": [round(fit_power_law(attrs["û"]), 3), round(profile["instance_alpha"], 3)],
+        "pair_alpha": [round(fit_power_law(total[""]), 3), round(profile["pair_alpha"], 3)],
+        "internal_share": [round(float(internal), 3), round(data_internal, 3)]
+    }
+
+# --------------------------
+# 岽ģв
+# --------------------------
+def main():
+    print("="*60)
+    print("        Preprocessing Scale Benchmark (synthetic FediLive chunks)")
+    print("="*60)
+    work_dir = BenchConfig.WORK_DIR or tempfile.mkdtemp(prefix="fedilive_bench_")
+    profile = fit_profile()
+    results = []
+    try:
+        for scale in BenchConfig.SCALES:
+            print(f"\n--- {scale}x ---")
+            chunk_dir, stats = prepare_chunks(work_dir, scale, profile)
+            for script in BenchConfig.SCRIPTS:
+                output_dir = os.path.join(work_dir, f"out_{scale}x", os.path.splitext(script)[0].replace("&", ""))
+                report, elapsed = run_script(script, chunk_dir, output_dir)
+                result = {"scale": scale, "script": script, **summarize(report, elapsed, stats), "report": report}
+                if BenchConfig.SCRIPTS[script] == "instance_attributes.csv":
+                    result["shape"] = shape_check(output_dir, profile)
+                results.append(result)
+                print(f"{script}: {result['wall_s']:.1f}s, {result['items_per_s']:,.0f} items/s, "
+                      f"{result['mb_per_s']:.1f} MB/s, peak RSS {result['peak_rss_mb']} MB")
+    finally:
+        if not BenchConfig.WORK_DIR:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"\n{'scale':>5} {'script':<24} {'MB':>8} {'items':>10} {'wall s':>8} {'items/s':>9} {'MB/s':>6} {'peak RSS MB':>12} {'vs 1x':>6}")
+    baseline = {}
+    for result in results:
+        baseline.setdefault(result["script"], result["items_per_s"])
+        print(f"{result['scale']:>4}x {result['script']:<24} {result['input_mb']:>8.1f} {result['items']:>10} "
+              f"{result['wall_s']:>8.1f} {result['items_per_s']:>9,.0f} {result['mb_per_s']:>6.1f} "
+              f"{result['peak_rss_mb']:>12} {result['items_per_s'] / baseline[result['script']]:>5.2f}x")
+    print("\nShape check (generated / fitted): " + "; ".join(
+        f"{r['scale']}x instance alpha {r['shape']['instance_alpha'][0]}/{r['shape']['instance_alpha'][1]}, "
+        f"pair alpha {r['shape']['pair_alpha'][0]}/{r['shape']['pair_alpha'][1]}, "
+        f"internal share {r['shape']['internal_share'][0]}/{r['shape']['internal_share'][1]}"
+        for r in results if "shape" in r
+    ))
+    if BenchConfig.RESULT_FILE:
+        with open(BenchConfig.RESULT_FILE, "w", encoding="utf-8") as f:
+            json.dump({"settings": BenchConfig.SCRIPT_SETTINGS, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"Results saved: {os.path.abspath(BenchConfig.RESULT_FILE)}")
+
+
+if __name__ == "__main__":
+    if RUN_MODULE is not None:
+        run_in_process(sys.argv[3], sys.argv[4], json.loads(sys.argv[5]))
+    else:
+        main()
\ No newline at end of file
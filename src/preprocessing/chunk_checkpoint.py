@@ -0,0 +1,135 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import json
+import pickle
+from tqdm import tqdm
+from concurrent.futures import ProcessPoolExecutor
+
+from sid_index import chunk_fingerprint
+
+# --------------------------
+# ڶֿ鼶
+# --------------------------
+def atomic_write(path, write_fn, mode="wb", encoding=None):
+    """дʱļ滻жʱдһļ"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, mode, encoding=encoding) as f:
+        write_fn(f)
+    os.replace(tmp_path, path)
+
+
+class ChunkCheckpoint:
+    """
+    㣨ÿ׶һĿ¼
+    - ÿһֿ飬䲿ֽpickle嵥manifest.json
+    - 嵥¼ָֿƣС+޸ʱ䣩ʱָһµķֱֿӼزֽ
+      ֻ仯ķֿҪ½жϵдһɷֿ
+    - settings¼Ӱ첿ֽ嵥һʱý׶εļȫ
+    - ֽֿ˳鲢ȫһ
+    """
+    def __init__(self, checkpoint_dir, stage, settings=None):
+        self.stage = stage
+        self.stage_dir = os.path.join(checkpoint_dir, stage)
+        os.makedirs(self.stage_dir, exist_ok=True)
+        self.manifest_path = os.path.join(self.stage_dir, "manifest.json")
+        self.settings = settings or {}
+        self.entries = {}  # ֿļ  {"fingerprint": [size, mtime_ns]}
+
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("settings") == self.settings:
+                self.entries = manifest.get("chunks", {})
+            else:
+                print(f"Checkpoint settings changed for stage '{stage}', reprocessing all chunks")
+
+    def _partial_path(self, file_name):
+        return os.path.join(self.stage_dir, file_name + ".pkl")
+
+    def _write_manifest(self):
+        manifest = {"settings": self.settings, "chunks": self.entries}
+        atomic_write(self.manifest_path, lambda f: json.dump(manifest, f, indent=2), mode="w", encoding="utf-8")
+
+    def is_current(self, file):
+        """ֿԱδ仯Ҳֽļڣ"""
+        file_name, *fingerprint = chunk_fingerprint([file])[0]
+        entry = self.entries.get(file_name)
+        return entry is not None and entry["fingerprint"] == fingerprint and os.path.exists(self._partial_path(file_name))
+
+    def load(self, file):
+        """ֿδ仯ʱرĲֽ򷵻None"""
+        if not self.is_current(file):
+            return None
+        with open(self._partial_path(os.path.basename(file)), "rb") as f:
+            return pickle.load(f)
+
+    def save(self, file, partial):
+        """浥ֿĲֽ嵥"""
+        file_name, *fingerprint = chunk_fingerprint([file])[0]
+        atomic_write(self._partial_path(file_name), lambda f: pickle.dump(partial, f, protocol=pickle.HIGHEST_PROTOCOL))
+        self.entries[file_name] = {"fingerprint": fingerprint}
+        self._write_manifest()
+
+    def prune(self, chunk_files):
+        """ɾѲڵķֿļ"""
+        current = {os.path.basename(file) for file in chunk_files}
+        removed = [file_name for file_name in self.entries if file_name not in current]
+        for file_name in removed:
+            del self.entries[file_name]
+            if os.path.exists(self._partial_path(file_name)):
+                os.remove(self._partial_path(file_name))
+        if removed:
+            self._write_manifest()
+        return removed
+
+# --------------------------
+# ռֿ鲿ֽ
+# --------------------------
+def iter_parsed_chunks(parse_fn, chunk_files, desc, workers=1, initializer=None, initargs=()):
+    """ֿΪֽֿ˳ (file, partial)workers>1ʱʹý̳"""
+    if not chunk_files:
+        return
+    with tqdm(total=len(chunk_files), desc=f"{desc} [{workers} workers]", unit="file") as pbar:
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+                for file, partial in zip(chunk_files, executor.map(parse_fn, chunk_files)):
+                    yield file, partial
+                    pbar.update(1)
+        else:
+            if initializer is not None:
+                initializer(*initargs)
+            for file in chunk_files:
+                yield file, parse_fn(file)
+                pbar.update(1)
+
+
+def collect_chunk_partials(checkpoint, chunk_files, parse_fn, desc, workers=1, initializer=None, initargs=(), unpack=None):
+    """
+    ֿ˳ֽδ仯ķֵֿʱŴӼأ
+    /仯ķֿ½ɺд㣻÷ɱ߲߹鲢ͬʱȫֽ
+    unpackǿʱȶparse_fnķֵunpackõֽصĿ
+    """
+    pending = [file for file in chunk_files if not checkpoint.is_current(file)]
+    removed = checkpoint.prune(chunk_files)
+    print(
+        f"Checkpoint '{checkpoint.stage}': {len(chunk_files) - len(pending)} chunks unchanged, "
+        f"{len(pending)} new/changed to process, {len(removed)} removed"
+    )
+
+    # ֿ鰴ԭ˳ɽ̳βӼصķֿ齻ֿ˳
+    parsed = iter_parsed_chunks(parse_fn, pending, desc, workers, initializer, initargs)
+    pending = set(pending)
+    for file in chunk_files:
+        if file not in pending:
+            yield checkpoint.load(file)
+            continue
+        _, partial = next(parsed)
+        if unpack is not None:
+            partial = unpack(partial)
+        checkpoint.save(file, partial)
+        yield partial
+    next(parsed, None)  # еرս̳
\ No newline at end of file
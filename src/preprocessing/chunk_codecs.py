@@ -0,0 +1,80 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import glob
+import gzip
+import lzma
+
+try:
+    import zstandard  # ѡȡ.json.zstֿ
+except ImportError:
+    zstandard = None
+
+# --------------------------
+# ڶֿļ׺
+# --------------------------
+# ֵ֧ķֿ׺ͬһֿڶʽʱ˳ȡһδѹļȣ
+CHUNK_SUFFIXES = (".json", ".json.gz", ".json.zst", ".json.xz")
+CODECS = {".json.gz": "gzip", ".json.zst": "zstd", ".json.xz": "xz"}
+
+# Ĭ϶壺ѹļĴ̶ȡÿȡĽѹݾ˴С
+READ_BUFFER_SIZE = 1024 * 1024
+
+
+def chunk_codec(path):
+    """ֿļѹʽ"gzip" / "zstd" / "xz"δѹ.jsonNone"""
+    for suffix, codec in CODECS.items():
+        if path.endswith(suffix):
+            return codec
+    return None
+
+
+def list_chunk_files(json_dir, file_prefix):
+    """
+     ǰ׺*.json / .json.gz / .json.zst / .json.xz ֿļδ
+    ͬһֿ飨ȥ׺ͬͬʱڶʽʱֻһظ
+    """
+    chunk_files = {}
+    for suffix in CHUNK_SUFFIXES:
+        for path in glob.glob(os.path.join(json_dir, f"{file_prefix}*{suffix}")):
+            stem = path[:-len(suffix)]
+            if stem in chunk_files:
+                print(f"Warning: {os.path.basename(path)} ignored, {os.path.basename(chunk_files[stem])} already covers this chunk")
+                continue
+            chunk_files[stem] = path
+    return list(chunk_files.values())
+
+# --------------------------
+# ʽѹ
+# --------------------------
+def open_decompressed(f, path, buffer_size=READ_BUFFER_SIZE):
+    """
+    ļ׺Ѵ򿪵ĶļװΪʽѹȡδѹļԭأ
+    - fΪProgressReaderֻṩread()İװ󣬽Ȱѹֽڼ
+    - ѹڶȡʱУֿѹڴ
+    - .json.zstҪװzstandard
+    """
+    codec = chunk_codec(path)
+    if codec is None:
+        return f
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=f, mode="rb")
+    if codec == "xz":
+        return lzma.LZMAFile(f)
+    if zstandard is None:
+        raise ImportError(f"Reading {os.path.basename(path)} requires the zstandard package (pip install zstandard)")
+    return zstandard.ZstdDecompressor().stream_reader(f, read_size=buffer_size, read_across_frames=True)
+
+
+def chunk_data_size(path):
+    """
+    ֿJSONֵֽδѹļΪļС
+    ѹļԭʼС޷ۿɿص֪gzipβֻ¼ģ2^32ֵ֡zstdֻ¼֡None
+    ɶȡ˰ʵʽѹֽж
+    """
+    if chunk_codec(path) is None:
+        return os.path.getsize(path)
+    return None
\ No newline at end of file
@@ -0,0 +1,180 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import io
+import os
+import mmap
+import numpy as np
+from typing import NamedTuple
+
+from chunk_codecs import chunk_codec
+
+# --------------------------
+# ڶֽֿ
+# --------------------------
+class ChunkRange(NamedTuple):
+    """
+    ֿļеһֽ [start, end)ɸĶԪؼĶ
+    "[""]"ϷżΪϷJSON
+    """
+    path: str
+    start: int
+    end: int
+
+    @property
+    def json_size(self):
+        """ϷźJSONֵֽ"""
+        return self.end - self.start + 2
+
+
+def open_chunk_range(chunk_range):
+    """mmapȡ䲢Ϸţؿɽijson/ڴֻƸֽڣ"""
+    with open(chunk_range.path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return io.BytesIO(b"[" + mm[chunk_range.start:chunk_range.end] + b"]")
+
+# --------------------------
+# Ľṹɨ裨У
+# --------------------------
+SCAN_BLOCK_BYTES = 16 * 1024 * 1024  # ÿɨֽʱԼΪ
+
+QUOTE, BACKSLASH, COMMA = ord('"'), ord('\\'), ord(',')
+OPEN_BRACKETS, CLOSE_BRACKETS = (ord('['), ord('{')), (ord(']'), ord('}'))
+WHITESPACE = b" \t\r\n"
+
+
+class StructuralScanner:
+    """
+    ɨJSONıҳֹԪؼĶ㶺ţ
+    - ת壺ֻڷбλãټϼΣγΪʱűת
+    - ַÿ/ţöֲǰʵŸλַ
+    - ȣַǰ׺ͣΪ1ĶżԪطֽ
+    ֻֽڵϡλ㣻״̬ΪǷַڡĩβбܶż뵱ǰ
+    """
+    def __init__(self):
+        self.in_string = False
+        self.trailing_backslash = False
+        self.depth = 0
+        self.array_start = None  # "["λ
+        self.array_end = None  # ֮ƥ"]"λãɨ赽ֹͣ
+        self.not_array = False  # 㲻
+
+    def scan_block(self, block, offset):
+        """ɨһֽڣnumpy uint8飬λļoffsetظÿڵĶ㶺λãļƫƣ"""
+        if self.array_start is None:
+            self._find_array_start(block, offset)
+            if self.not_array or self.array_start is None:
+                return np.empty(0, dtype=np.int64)
+
+        # 1. ʵţȥתţ
+        quotes = np.flatnonzero(block == QUOTE)
+        backslashes = np.flatnonzero(block == BACKSLASH)
+        if len(backslashes) or self.trailing_backslash:
+            escaped = self._escaped_positions(backslashes, len(block))
+            quotes = quotes[~np.isin(quotes, escaped, assume_unique=True)]
+
+        # 2. ַ붺
+        candidates = np.flatnonzero(
+            (block == COMMA) | (block == OPEN_BRACKETS[0]) | (block == OPEN_BRACKETS[1]) |
+            (block == CLOSE_BRACKETS[0]) | (block == CLOSE_BRACKETS[1])
+        )
+        before = np.searchsorted(quotes, candidates)
+        candidates = candidates[(before + self.in_string) % 2 == 0]
+        chars = block[candidates]
+
+        # 3. ȣֽ֮
+        is_close = (chars == CLOSE_BRACKETS[0]) | (chars == CLOSE_BRACKETS[1])
+        delta = (chars != COMMA).astype(np.int64) - 2 * is_close
+        depth = self.depth + np.cumsum(delta)
+        commas = candidates[(chars == COMMA) & (depth == 1)]
+        closed = np.flatnonzero(is_close & (depth == 0))
+        if len(closed):
+            # һȻص0ı
+            end = candidates[closed[0]]
+            self.array_end = offset + int(end)
+            commas = commas[commas < end]
+
+        # 4. ״̬
+        self.in_string = bool((len(quotes) + self.in_string) % 2)
+        if len(depth):
+            self.depth = int(depth[-1])
+        return commas.astype(np.int64) + offset
+
+    def _escaped_positions(self, backslashes, block_len):
+        """бгΪĶ֮λãλõַת壩ĩβбܶż"""
+        starts = np.ones(len(backslashes), dtype=bool)
+        starts[1:] = np.diff(backslashes) != 1
+        run_starts = np.flatnonzero(starts)
+        run_lengths = np.diff(np.append(run_starts, len(backslashes)))
+        run_ends = backslashes[run_starts] + run_lengths  # κһλ
+        if self.trailing_backslash:
+            # һбܽβӱ鿪ͷĶγ1򱾿ֱֽӱת
+            if len(backslashes) and backslashes[0] == 0:
+                run_lengths[0] += 1
+            else:
+                run_ends = np.append(0, run_ends)
+                run_lengths = np.append(1, run_lengths)
+        odd = run_lengths % 2 == 1
+        self.trailing_backslash = bool(len(run_ends) and run_ends[-1] == block_len and odd[-1])
+        return run_ends[odd]
+
+    def _find_array_start(self, block, offset):
+        """λһǿհֽڣΪ"["Ƕ飬֣"""
+        non_space = np.flatnonzero(~np.isin(block[:4096], np.frombuffer(WHITESPACE, dtype=np.uint8)))
+        if len(non_space) == 0:
+            if len(block) > 4096:
+                self._find_array_start(block[4096:], offset + 4096)
+            return
+        if block[non_space[0]] != ord("["):
+            self.not_array = True
+            return
+        self.array_start = offset + int(non_space[0])
+
+
+def split_chunk_file(path, target_bytes, block_bytes=SCAN_BLOCK_BYTES):
+    """
+    һδѹֿ鰴Լtarget_bytesֽгChunkRangeеΪӽĿλ֮Ķ㶺ţ
+    - Noneʾ֣ļtarget_bytesΪѹֿ顢㲻δպϣ÷ļ
+    - ƴӼΪԭȫԪأĽijson.items(f, 'item')ȫһ
+    """
+    size = os.path.getsize(path)
+    if not target_bytes or size <= target_bytes or chunk_codec(path) is not None:
+        return None
+    scanner = StructuralScanner()
+    cuts = []
+    next_target = target_bytes
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = np.frombuffer(mm, dtype=np.uint8)
+            try:
+                for offset in range(0, size, block_bytes):
+                    commas = scanner.scan_block(data[offset:offset + block_bytes], offset)
+                    if scanner.not_array:
+                        return None
+                    # ÿĿλȡĵһ㶺
+                    while len(commas):
+                        index = np.searchsorted(commas, next_target)
+                        if index == len(commas):
+                            break
+                        cuts.append(int(commas[index]))
+                        next_target = cuts[-1] + target_bytes
+                        commas = commas[index + 1:]
+                    if scanner.array_end is not None:
+                        break
+            finally:
+                del data  # ͷŶmmapãmmapܹر
+    if scanner.array_start is None or scanner.array_end is None:
+        return None
+    bounds = [scanner.array_start] + cuts + [scanner.array_end]
+    return [ChunkRange(path, bounds[i] + 1, bounds[i + 1]) for i in range(len(bounds) - 1)]
+
+
+def expand_chunk_tasks(chunk_files, target_bytes):
+    """ѷֿļбչΪ̳񣺳target_bytesδѹֿ滻Ϊ˳еChunkRangeౣΪļ·"""
+    tasks = []
+    for file in chunk_files:
+        ranges = split_chunk_file(file, target_bytes)
+        tasks.extend(ranges if ranges else [file])
+    return tasks
\ No newline at end of file
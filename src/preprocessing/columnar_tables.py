@@ -0,0 +1,170 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import json
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.feather as feather
+except ImportError:  # pyarrowΪѡȱʧʱCSV
+    pa = None
+    pq = None
+    feather = None
+
+# --------------------------
+# ڶӢı
+# --------------------------
+# ʵIDУֵ루int32± + ֵַ䣩
+INSTANCE_COLUMNS = ["ʵID", "ʵ", "Ŀʵ"]
+# ǩУCSVΪƴַޱǩΪ""ʽļΪַбޱǩΪб
+TAG_COLUMN = "ǩ"
+TAG_SEPARATOR = ","
+NO_TAG = ""
+
+#   ӢıдֶԪԪݣоΪint64
+COLUMN_ALIASES = {
+    "ʵID": "instance_id",
+    "û": "total_users",
+    "Ծû": "active_users",
+    "ǩ": "top_tags",
+    "ʵ": "from_instance",
+    "Ŀʵ": "to_instance",
+    "": "interaction_count",
+    "ڲظ": "internal_replies",
+    "ڲת": "internal_boosts",
+    "ڲ": "internal_favourites",
+    "ڲ": "internal_total",
+    "ʵظ": "cross_out_replies",
+    "ʵת": "cross_out_boosts",
+    "ʵ": "cross_out_favourites",
+    "ʵ": "cross_out_total",
+    "ʵظ": "cross_in_replies",
+    "ʵת": "cross_in_boosts",
+    "ʵ": "cross_in_favourites",
+    "ʵ": "cross_in_total",
+    "ʵܻ": "cross_total"
+}
+
+COLUMNAR_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def column_type(column):
+    if column in INSTANCE_COLUMNS:
+        return pa.dictionary(pa.int32(), pa.string())
+    if column == TAG_COLUMN:
+        return pa.list_(pa.string())
+    return pa.int64()
+
+
+def table_schema(columns):
+    """ʽschemaÿֶδӢıԪݣԪбıӳ"""
+    fields = [
+        pa.field(column, column_type(column), nullable=False,
+                 metadata={"alias": COLUMN_ALIASES.get(column, column)})
+        for column in columns
+    ]
+    aliases = {column: COLUMN_ALIASES.get(column, column) for column in columns}
+    return pa.schema(fields, metadata={"column_aliases": json.dumps(aliases, ensure_ascii=False)})
+
+# --------------------------
+# DataFrame  ͵Arrow
+# --------------------------
+def split_tags(value):
+    """ƴӵıǩַ  ǩб""ַΪб"""
+    if not value or value == NO_TAG:
+        return []
+    return [tag for tag in value.split(TAG_SEPARATOR) if tag]
+
+
+def to_arrow_table(df):
+    """table_schemaת˳CSVһ£ʵֵ룬int64ǩΪַб"""
+    schema = table_schema(list(df.columns))
+    arrays = []
+    for column in df.columns:
+        values = df[column]
+        if column in INSTANCE_COLUMNS:
+            arrays.append(pa.array(values.astype(str).tolist(), type=pa.string()).dictionary_encode())
+        elif column == TAG_COLUMN:
+            arrays.append(pa.array([split_tags(value) for value in values], type=pa.list_(pa.string())))
+        else:
+            arrays.append(pa.array(values.to_numpy(dtype=np.int64), type=pa.int64()))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def write_columnar_table(df, csv_path, columnar_format):
+    """
+    CSVдͬʽļ.parquetArrow IPCļ.arrow·
+    columnar_formatΪNoneδװpyarrowʱдNone
+    """
+    if not columnar_format:
+        return None
+    if pa is None:
+        print(f"Warning: pyarrow not installed, skipping {columnar_format} output for {os.path.basename(csv_path)}")
+        return None
+    if columnar_format not in COLUMNAR_EXTENSIONS:
+        raise ValueError(f"Unsupported columnar format: {columnar_format} (expected 'parquet' or 'arrow')")
+    path = os.path.splitext(csv_path)[0] + COLUMNAR_EXTENSIONS[columnar_format]
+    table = to_arrow_table(df)
+    if columnar_format == "parquet":
+        pq.write_table(table, path)
+    else:
+        feather.write_feather(table, path, compression="uncompressed")  # ѹIPCļֱmmapȡ
+    return path
+
+# --------------------------
+# ĲȡԤűã
+# --------------------------
+def read_output_table(data_dir, file_name, usecols=None, dtype=None):
+    """
+    ȡԤͬ.parquet / .arrowʽļҲCSVʱֱӶȡȥCSVƶϣȡCSV
+    ʽļֵʵлԭΪַCSVȡΪһ
+    """
+    csv_path = os.path.join(data_dir, file_name)
+    stem = os.path.splitext(csv_path)[0]
+    for extension, reader in ((".parquet", pd.read_parquet), (".arrow", pd.read_feather)):
+        path = stem + extension
+        if os.path.exists(path) and (not os.path.exists(csv_path) or os.path.getmtime(path) >= os.path.getmtime(csv_path)):
+            df = reader(path, columns=usecols)
+            for column in df.columns:
+                if isinstance(df[column].dtype, pd.CategoricalDtype):
+                    df[column] = df[column].astype(str)
+            return df
+    return pd.read_csv(csv_path, encoding="utf-8-sig", dtype=dtype, keep_default_na=False, usecols=usecols)
+
+# --------------------------
+# 岽ѷCSVתΪʽļ
+# --------------------------
+PUBLISHED_TABLES = [
+    "instance_attributes.csv", "instance_interaction_stats.csv",
+    "interaction_matrix_reply.csv", "interaction_matrix_boost.csv",
+    "interaction_matrix_fav.csv", "interaction_matrix_total.csv"
+]
+
+
+def convert_csv_dir(data_dir, columnar_format="parquet"):
+    """ΪĿ¼еԤCSVдʽļֿdataĿ¼д·б"""
+    paths = []
+    for file_name in PUBLISHED_TABLES:
+        csv_path = os.path.join(data_dir, file_name)
+        if not os.path.exists(csv_path):
+            continue
+        df = pd.read_csv(
+            csv_path, encoding="utf-8-sig", keep_default_na=False,
+            dtype={column: str for column in INSTANCE_COLUMNS + [TAG_COLUMN]}
+        )
+        path = write_columnar_table(df, csv_path, columnar_format)
+        if path is None:
+            continue
+        paths.append(path)
+        print(f"{file_name}: {len(df)} rows  {os.path.basename(path)}")
+    return paths
+
+
+if __name__ == "__main__":
+    convert_csv_dir(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data"))
\ No newline at end of file
@@ -4,13 +4,20 @@
 # һ
 # --------------------------
 import os
-import glob
 import json
-import ijson
-import pandas as pd
 from tqdm import tqdm
 from urllib.parse import urlparse
-import uuid  # Ψһevent_id
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+
+from interaction_table_writer import InteractionTableWriter, EVENT_ID_INDEX
+from instance_url import fast_url_host, format_cache_info
+from sid_index import SidRecipientIndex, chunk_fingerprint, hash64
+from json_reader import iter_json_items, describe_reader, PROJECTIONS
+from chunk_codecs import list_chunk_files, open_decompressed, chunk_data_size
+from chunk_splitter import ChunkRange, open_chunk_range, expand_chunk_tasks
+from chunk_checkpoint import ChunkCheckpoint, collect_chunk_partials
+from stage_profiler import PROFILER
 from datetime import datetime  # ʱ
 
 # --------------------------
@@ -32,6 +39,38 @@ class Config:
     WEIGHT_DEFAULT = 1  # ǿĬֵ
     INSTANCE_VALID_LEN = 3  # ʵIDСȣЧֵ"a.b"
     INSTANCE_REQUIRE_DOT = True  # ʵID"."ʽ
+    
+    # 4. д
+    WORKERS = 1  # ̳worker1Ϊ̴У>1ʱÿworkerһֿļ¼ΰֿ˳ϲ
+    SPLIT_CHUNK_BYTES = None  # WORKERS>1ʱѳֽδѹֿ鰴Ԫر߽гԼôСֽ䣬ָworkerļһ£NoneΪļ
+    
+    # 5. ʵIDȡ
+    INSTANCE_CACHE_SIZE = 262144  # ˺URLʵIDLRUNoneΪޣ
+    
+    # 6. SIDշ־û
+    SID_INDEX_DIR = None  # Ŀ¼ǿʱ״б棬livefeedsδ仯ĺֱmmapأضlivefeeds
+    
+    # 7. ¼д
+    WRITE_BATCH_SIZE = 100000  # ÿۼƶ¼дһΣֵڴ棩
+    COLUMNAR_FORMAT = None  # ͬʱʽʽ"parquet" / "arrow"Arrow IPCļ/ NoneCSVpyarrow
+    
+    # 8. ֿ鼶㣩
+    CHECKPOINT_DIR = None  # Ŀ¼ǿʱÿһֿ鼴䲿ֻֽ/仯ķֿ飬жϺܣ
+    
+    # 9. JSON
+    JSON_BACKEND = "auto"  # ijsonˣautoyajl2_c  yajl2_cffi  yajl2  pythonȼѡҲָƣʱ
+    FULL_PARSE_MAX_BYTES = None  # ֿ鲻ֽʱ벢orjson/jsonһν죬ڴԼΪļСNoneΪʼʽ
+    PROJECTED_PARSING = "auto"  # ʽʱֻűõֶΣsid˺id/acct/url/ʱǩ/ý/autoֻڴPythonȺͶӰyajl2_c죩True/Falseǿƿ
+    READ_BUFFER_SIZE = 1024 * 1024  # ̶ֽȡÿȡֿΪ.json.json.gz/.json.zst/.json.xzѹֿ߶߽ѹ.zst谲װzstandard
+    
+    # 10. ׶
+    PROFILE_REPORT = None  # JSONļOUTPUT_DIR"stage_profile.json"¼׶κʱ/Ŀ/ֵRSS/NoneΪ¼
+    PROFILE_MODE = None  # ȵPROFILE_REPORT"cprofile"üʱϴ/ "sample"ʱջС/ None
+    PROFILE_TOP_N = 30  # ÿ׶гȵ㺯
+
+# ֿ鲿ֽ㣩ĸʽ汾ֽĽṹ仯ʱɰ汾
+# 2ظevent_idظcreated_at/id
+PARTIAL_FORMAT_VERSION = 2
 
 # --------------------------
 # ߺǿ쳣
@@ -46,9 +85,8 @@ def create_dir(path):
 
 
 def get_chunk_files(json_dir, file_prefix):
-    """ȡֿļ"""
-    file_pattern = os.path.join(json_dir, f"{file_prefix}*.json")
-    chunk_files = glob.glob(file_pattern)
+    """ȡֿļ.json.json.gz/.json.zst/.json.xz"""
+    chunk_files = list_chunk_files(json_dir, file_prefix)
     if not chunk_files:
         print(f"Warning: No {file_prefix} files found in {json_dir}")
         return []
@@ -70,14 +108,39 @@ def get_chunk_files(json_dir, file_prefix):
     return sorted_chunk_files
 
 
+def chunk_projection(file):
+    """ֿļǰ׺ظֶֿͶӰ޷ʶֿʱΪNone"""
+    file_name = os.path.basename(file)
+    for prefix, chunk_type in (
+        (Config.LIVEFEEDS_PREFIX, "livefeeds"), (Config.REPLY_PREFIX, "reply"), (Config.BOOSTERS_PREFIX, "boostersfavourites")
+    ):
+        if file_name.startswith(prefix):
+            return PROJECTIONS[chunk_type]
+    return None
+
+
+def read_json_items(f, file, data_size=None):
+    """
+    ConfigѡĽȡֿ鶥飨ѹֿ߶߽ѹСֿʽʱֶֿͶӰ
+    data_sizeΪfеJSONֽȡֽֿʱ룩Ĭϰļ
+    """
+    if data_size is None:
+        data_size = chunk_data_size(file)
+    return iter_json_items(
+        open_decompressed(f, file, Config.READ_BUFFER_SIZE), Config.JSON_BACKEND, data_size,
+        Config.FULL_PARSE_MAX_BYTES, projection=chunk_projection(file), projection_mode=Config.PROJECTED_PARSING,
+        buf_size=Config.READ_BUFFER_SIZE
+    )
+
+
 def stream_chunk_data(chunk_files, desc):
     """ʽȡֿݣڴļȡ쳣"""
     with tqdm(desc=desc, unit="item") as pbar:
         for file in chunk_files:
             file_name = os.path.basename(file)
             try:
-                with open(file, 'rb') as f:
-                    parser = ijson.items(f, 'item')
+                with open(file, 'rb', buffering=Config.READ_BUFFER_SIZE) as f:
+                    parser = PROFILER.count_items(read_json_items(f, file))
                     for item in parser:
                         yield item
                         pbar.update(1)
@@ -86,6 +149,61 @@ def stream_chunk_data(chunk_files, desc):
                 continue
 
 
+def read_chunk_items(file):
+    """ȡֿļֿһֽ䣨ChunkRange̳workerʹãݴ߼ͬstream_chunk_data"""
+    file_name = os.path.basename(file.path if isinstance(file, ChunkRange) else file)
+    try:
+        if isinstance(file, ChunkRange):
+            for item in PROFILER.count_items(read_json_items(open_chunk_range(file), file.path, file.json_size)):
+                yield item
+            return
+        with open(file, 'rb', buffering=Config.READ_BUFFER_SIZE) as f:
+            for item in PROFILER.count_items(read_json_items(f, file)):
+                yield item
+    except Exception as e:
+        print(f"\nSkip corrupted file {file_name}: {str(e)[:50]}")
+
+
+def map_chunk_files(parse_fn, chunk_files, desc, initializer=None, initargs=()):
+    """
+    ̳ģʽÿworkerһֿļֿһֽ䣩Ϊֽֿ鼰˳
+    ÿ¼β󼴿дͷţڴ治ֿ
+    """
+    tasks = expand_chunk_tasks(chunk_files, Config.SPLIT_CHUNK_BYTES)
+    with ProcessPoolExecutor(max_workers=Config.WORKERS, initializer=initializer, initargs=initargs) as executor:
+        with tqdm(total=len(tasks), desc=f"{desc} [{Config.WORKERS} workers]", unit="task") as pbar:
+            for partial in executor.map(PROFILER.counted(parse_fn), tasks):
+                yield PROFILER.unpack_counted(partial)
+                pbar.update(1)
+
+
+def sid_index_settings():
+    """SIDշӳݵSIDУ飩"""
+    return {
+        "DEFAULT_TIMESTAMP": Config.DEFAULT_TIMESTAMP,
+        "INSTANCE_VALID_LEN": Config.INSTANCE_VALID_LEN,
+        "INSTANCE_REQUIRE_DOT": Config.INSTANCE_REQUIRE_DOT
+    }
+
+
+def collect_partials(stage, parse_fn, chunk_files, desc):
+    """/ģʽ°ֿ˳ֿĲֽCHECKPOINT_DIRʱδ仯ķֱֿӴӼأ"""
+    if Config.CHECKPOINT_DIR:
+        # Ӱ첿ֽݵ仯ʱ
+        settings = {
+            "DEFAULT_TIMESTAMP": Config.DEFAULT_TIMESTAMP,
+            "WEIGHT_DEFAULT": Config.WEIGHT_DEFAULT,
+            "INSTANCE_VALID_LEN": Config.INSTANCE_VALID_LEN,
+            "INSTANCE_REQUIRE_DOT": Config.INSTANCE_REQUIRE_DOT,
+            "PARTIAL_FORMAT_VERSION": PARTIAL_FORMAT_VERSION
+        }
+        checkpoint = ChunkCheckpoint(Config.CHECKPOINT_DIR, f"rq12_{stage}", settings=settings)
+        return collect_chunk_partials(
+            checkpoint, chunk_files, PROFILER.counted(parse_fn), desc, workers=Config.WORKERS, unpack=PROFILER.unpack_counted
+        )
+    return map_chunk_files(parse_fn, chunk_files, desc)
+
+
 def is_valid_instance(instance_id):
     """жʵIDǷЧǿ+ȴ+."""
     if not isinstance(instance_id, str):
@@ -99,24 +217,42 @@ def is_valid_instance(instance_id):
     )
 
 
+@lru_cache(maxsize=Config.INSTANCE_CACHE_SIZE)
+def parse_instance_url(url):
+    """URLʵIDУ飨LRU棺ͬһ˺URLظʱֱУ"""
+    # https://host/@userʽֱƬȡurlparse
+    instance = fast_url_host(url)
+    if instance is None:
+        try:
+            parsed = urlparse(url)
+            # netlocΪգ紿ֱַ·
+            instance = parsed.netloc if parsed.netloc else parsed.path.strip()
+        except Exception:
+            # ʧʱؿַΪЧʵ
+            return ""
+    return instance if is_valid_instance(instance) else ""
+
+
+def configure_instance_cache():
+    """
+    ǰConfig.INSTANCE_CACHE_SIZEؽparse_instance_urlLRU棨main()ʼʱã
+    װеڵʱȷ޸Config.INSTANCE_CACHE_SIZE辭Ч
+    """
+    global parse_instance_url
+    if parse_instance_url.cache_info().maxsize != Config.INSTANCE_CACHE_SIZE:
+        parse_instance_url = lru_cache(maxsize=Config.INSTANCE_CACHE_SIZE)(parse_instance_url.__wrapped__)
+
+
 def extract_instance_id(url_or_sid):
     """URLSIDȡʵIDǿ쳣ؿַЧ"""
     if not url_or_sid:
         return ""
     # תΪַNone
     url_or_sid_str = str(url_or_sid).strip()
-    # SIDʽ硰ʵID#ID
+    # SIDʽ硰ʵID#IDSIDÿΨһ뻺⼷ռ˺URL
     if '#' in url_or_sid_str:
-        url_or_sid_str = url_or_sid_str.split('#')[0]
-    # URLȡ
-    try:
-        parsed = urlparse(url_or_sid_str)
-        # netlocΪգ紿ֱַ·
-        instance = parsed.netloc if parsed.netloc else parsed.path.strip()
-        return instance if is_valid_instance(instance) else ""
-    except Exception:
-        # ʧʱؿַΪЧʵ
-        return ""
+        return parse_instance_url.__wrapped__(url_or_sid_str.split('#')[0])
+    return parse_instance_url(url_or_sid_str)
 
 
 def extract_user_info(account):
@@ -149,32 +285,34 @@ def extract_user_info(account):
     return user_id, user_instance, timestamp
 
 
-def generate_event_id(interaction_type, from_user_id, to_user_id, timestamp):
-    """Ψһevent_idַµĸʽ⣩"""
-    unique_suffix = str(uuid.uuid4())[:8]
-    # 滻ʱеַ:-ļݿ⣩
-    safe_timestamp = timestamp.replace(':', '-').replace('Z', '').replace('T', '-')
-    # ɻIDȷ޿ֵռλ
-    base_id = f"{interaction_type}_{from_user_id[:10]}_{to_user_id[:10]}_{safe_timestamp}"  # ȡûIDǰ10λ
-    return f"{base_id}_{unique_suffix}"
+def generate_event_id(interaction_type, from_user_id, to_user_id, sid, timestamp):
+    """
+    ȷevent_id(, û, û, SID, ʱ)64λݹϣ
+    - ͬһ¼صֿбظץȡʱIDֱͬȥ
+    - з64λдDataFrameΪint64
+    """
+    return hash64("\x1f".join((interaction_type, from_user_id, to_user_id, sid, timestamp)))
+
+
+def append_unseen_records(records, batch, seen_event_ids):
+    """鲢̳طصļ¼Σѳֹevent_idʽȥأ"""
+    for record in batch:
+        event_id = record[EVENT_ID_INDEX]
+        if event_id in seen_event_ids:
+            continue
+        seen_event_ids.add(event_id)
+        records.append(record)
 
 
 # --------------------------
 # ĲԤLivefeedsȡӡշӳ䣬Чշ
 # --------------------------
-def preprocess_livefeeds_for_interaction():
-    """livefeedsȡSIDЧշӳ䣨to_instanceЧ"""
-    livefeeds_chunks = get_chunk_files(Config.JSON_DIR, Config.LIVEFEEDS_PREFIX)
-    if not livefeeds_chunks:
-        return {}
-    
-    sid_to_recipient = {}
-    data_generator = stream_chunk_data(livefeeds_chunks, "Preprocessing livefeeds (get valid post recipients)")
-    
-    for item in data_generator:
+def accumulate_recipients(sid_index, items):
+    """livefeedsĿSIDշӳ׷ӵsid_indexбSidRecipientIndexظSIDfinalizeʱ"""
+    for item in items:
         # 1. ȡУSID
         sid = str(item.get("sid", "")).strip()
-        if not sid or sid in sid_to_recipient or sid == "None":
+        if not sid or sid == "None":
             continue
         
         # 2. ȡߣշϢ
@@ -185,26 +323,63 @@ def preprocess_livefeeds_for_interaction():
         if not (to_user_id and is_valid_instance(to_instance)):
             continue
         
-        # 4. ӳ䣨ȷ¼to_instanceЧ
-        sid_to_recipient[sid] = (to_user_id, to_instance, to_timestamp)
+        # 4. ӳ䣨ȷ¼to_instanceЧ
+        sid_index.add(sid, to_user_id, to_instance, to_timestamp)
+
+
+class RecipientBatch(list):
+    """̳workerصӳΣSidRecipientIndexͬaddӿڣ"""
+    def add(self, sid, to_user_id, to_instance, to_timestamp):
+        self.append((sid, to_user_id, to_instance, to_timestamp))
+
+
+def parse_recipient_chunk(file):
+    """̳workerlivefeedsֿSIDշӳ"""
+    batch = RecipientBatch()
+    accumulate_recipients(batch, read_chunk_items(file))
+    return batch
+
+
+@PROFILER.stage()
+def preprocess_livefeeds_for_interaction():
+    """livefeedsSIDЧշĽto_instanceЧ"""
+    livefeeds_chunks = get_chunk_files(Config.JSON_DIR, Config.LIVEFEEDS_PREFIX)
+    if not livefeeds_chunks:
+        return SidRecipientIndex().finalize()
     
-    print(f"Preprocessed {len(sid_to_recipient)} valid post SID  recipient mappings (filtered invalid to_instance)")
-    return sid_to_recipient
+    # 1. Ŀ¼livefeedsδ仯ֱmmapϴι
+    fingerprint = chunk_fingerprint(livefeeds_chunks)
+    if Config.SID_INDEX_DIR:
+        sid_index = SidRecipientIndex.load(Config.SID_INDEX_DIR, fingerprint=fingerprint, settings=sid_index_settings())
+        if sid_index is not None:
+            print(f"Loaded {len(sid_index)} post SID  recipient mappings from {Config.SID_INDEX_DIR} (livefeeds and settings unchanged)")
+            return sid_index
+    
+    # 2. ɨlivefeeds
+    sid_index = SidRecipientIndex()
+    desc = "Preprocessing livefeeds (get valid post recipients)"
+    if Config.WORKERS > 1 or Config.CHECKPOINT_DIR:
+        # ֿ˳׷ӣظSIDfinalizeʱȳֵӳ䣨봮һ£
+        for batch in collect_partials("livefeeds", parse_recipient_chunk, livefeeds_chunks, desc):
+            for sid, to_user_id, to_instance, to_timestamp in batch:
+                sid_index.add(sid, to_user_id, to_instance, to_timestamp)
+    else:
+        accumulate_recipients(sid_index, stream_chunk_data(livefeeds_chunks, desc))
+    sid_index.finalize()
+    
+    print(f"Preprocessed {len(sid_index)} valid post SID  recipient mappings (filtered invalid to_instance), index arrays {sid_index.nbytes() / 1024 / 1024:.1f} MB")
+    if Config.SID_INDEX_DIR:
+        sid_index.save(Config.SID_INDEX_DIR, fingerprint=fingerprint, settings=sid_index_settings())
+        print(f"SID index saved to: {Config.SID_INDEX_DIR}")
+    return sid_index
 
 
 # --------------------------
 # 岽ȡ໥¼ϸЧʵ
 # --------------------------
-def extract_reply_records():
-    """ȡظ¼to_instanceЧ"""
-    reply_chunks = get_chunk_files(Config.JSON_DIR, Config.REPLY_PREFIX)
-    if not reply_chunks:
-        return []
-    
-    reply_records = []
-    data_generator = stream_chunk_data(reply_chunks, "Extracting reply interactions (filter invalid to_instance)")
-    
-    for item in data_generator:
+def accumulate_reply_records(records, items, seen_event_ids):
+    """ظĿתΪ¼׷ӵrecordsбдseen_event_idsе¼Ϊظ"""
+    for item in items:
         # 1. ȡϢȷfrom_instanceЧ
         from_account = item.get("acct", {})
         from_user_id, from_instance, from_timestamp = extract_user_info(from_account)
@@ -218,155 +393,212 @@ def extract_reply_records():
         if not (to_user_id and is_valid_instance(to_instance)):
             continue
         
-        # 3. Ψһevent_id
-        event_id = generate_event_id("reply", from_user_id, to_user_id, from_timestamp)
+        # 3. ȷevent_idʽȥ
+        #    ظsidǱظӵsidͬһ߳ͬһûͬһûĶظֻܿظcreated_atid֣
+        #    ˺ʱ˺żգֻ߶ȱʧʱΪϣΪ˺ʱ
+        sid = str(item.get("sid", "")).strip()
+        event_key = str(item.get("created_at") or item.get("id") or from_timestamp).strip()
+        event_id = generate_event_id("reply", from_user_id, to_user_id, sid, event_key)
+        if event_id in seen_event_ids:
+            continue
+        seen_event_ids.add(event_id)
         
-        # 4. װظ¼
-        reply_records.append({
-            "event_id": event_id,
-            "timestamp": from_timestamp,
-            "from_user_id": from_user_id,
-            "from_instance": from_instance,
-            "to_user_id": to_user_id,
-            "to_instance": to_instance,
-            "interaction_type": Config.INTERACTION_TYPES["reply"],
-            "is_cross": from_instance != to_instance,
-            "weight": Config.WEIGHT_DEFAULT
-        })
-    
-    print(f"Extracted {len(reply_records)} valid reply interaction records (discarded invalid to_instance)")
+        # 4. װظ¼INTERACTION_FIELDS˳Ԫ飩
+        records.append((
+            event_id, from_timestamp, from_user_id, from_instance,
+            to_user_id, to_instance, Config.INTERACTION_TYPES["reply"],
+            from_instance != to_instance, Config.WEIGHT_DEFAULT
+        ))
+
+
+def parse_reply_chunk(file):
+    """̳workerreplyֿΪظ¼"""
+    reply_records = []
+    accumulate_reply_records(reply_records, read_chunk_items(file), set())
     return reply_records
 
 
-def extract_boost_fav_records(sid_to_recipient):
-    """ȡת/޼¼to_instanceЧԤЧӳ䣩"""
-    boosters_chunks = get_chunk_files(Config.JSON_DIR, Config.BOOSTERS_PREFIX)
-    if not boosters_chunks:
-        return []
+@PROFILER.stage()
+def extract_reply_records(writer):
+    """ȡظ¼ʽдwriterto_instanceЧȡ"""
+    reply_chunks = get_chunk_files(Config.JSON_DIR, Config.REPLY_PREFIX)
+    if not reply_chunks:
+        return 0
     
-    bf_records = []
-    data_generator = stream_chunk_data(boosters_chunks, "Extracting boost/favourite interactions (filter invalid to_instance)")
+    start_count = len(writer)
+    seen_event_ids = set()
+    desc = "Extracting reply interactions (filter invalid to_instance)"
+    if Config.WORKERS > 1 or Config.CHECKPOINT_DIR:
+        for batch in collect_partials("reply", parse_reply_chunk, reply_chunks, desc):
+            append_unseen_records(writer, batch, seen_event_ids)
+    else:
+        accumulate_reply_records(writer, stream_chunk_data(reply_chunks, desc), seen_event_ids)
     
-    for item in data_generator:
-        # 1. ȡУSIDԤЧӳ䣩
+    reply_count = len(writer) - start_count
+    print(f"Extracted {reply_count} valid reply interaction records (discarded invalid to_instance)")
+    return reply_count
+
+
+def iter_boost_fav_candidates(items, sid_index=None):
+    """
+    ת/ĿչΪѡ (sid, , from_user_id, from_instance, from_timestamp)
+    - ѡSIDɰֿ鱣浽㣬livefeedsֿ½
+    - sid_indexʱǰûЧշ
+    """
+    for item in items:
+        # 1. ȡУSIDԤЧӳ䣩
         sid = str(item.get("sid", "")).strip()
-        if not sid or sid not in sid_to_recipient or sid == "None":
+        if not sid or sid == "None":
             continue
-        # ӳȡշϢȷto_instanceЧ
-        to_user_id, to_instance, to_timestamp = sid_to_recipient[sid]
-        # Уto_instance˫رգ
-        if not (to_user_id and is_valid_instance(to_instance)):
+        if sid_index is not None and sid not in sid_index:
             continue
         
-        # 2. ȡ޼¼Ч𷽺ͽշ
+        # 2. ȡ޼¼Ч𷽣
         favourites = item.get("favourites", [])
         for fav in favourites:
             from_user_id, from_instance, from_timestamp = extract_user_info(fav)
-            # ЧշЧ
             if not (from_user_id and is_valid_instance(from_instance)):
                 continue
-            # event_id
-            event_id = generate_event_id("favourite", from_user_id, to_user_id, from_timestamp)
-            bf_records.append({
-                "event_id": event_id,
-                "timestamp": from_timestamp,
-                "from_user_id": from_user_id,
-                "from_instance": from_instance,
-                "to_user_id": to_user_id,
-                "to_instance": to_instance,
-                "interaction_type": Config.INTERACTION_TYPES["favourite"],
-                "is_cross": from_instance != to_instance,
-                "weight": Config.WEIGHT_DEFAULT
-            })
+            yield (sid, "favourite", from_user_id, from_instance, from_timestamp)
         
-        # 3. ȡת¼ͬϣЧ
+        # 3. ȡת¼ͬϣЧݣ
         reblogs = item.get("reblogs", [])
         for reblog in reblogs:
             from_user_id, from_instance, from_timestamp = extract_user_info(reblog)
             if not (from_user_id and is_valid_instance(from_instance)):
                 continue
-            event_id = generate_event_id("boost", from_user_id, to_user_id, from_timestamp)
-            bf_records.append({
-                "event_id": event_id,
-                "timestamp": from_timestamp,
-                "from_user_id": from_user_id,
-                "from_instance": from_instance,
-                "to_user_id": to_user_id,
-                "to_instance": to_instance,
-                "interaction_type": Config.INTERACTION_TYPES["boost"],
-                "is_cross": from_instance != to_instance,
-                "weight": Config.WEIGHT_DEFAULT
-            })
-    
-    print(f"Extracted {len(bf_records)} valid boost/favourite interaction records (discarded invalid to_instance)")
+            yield (sid, "boost", from_user_id, from_instance, from_timestamp)
+
+
+def accumulate_boost_fav_records(records, candidates, sid_index, seen_event_ids):
+    """ѡת/޻շ׷ӵrecordsбдseen_event_idsе¼Ϊظ"""
+    last_sid = None
+    recipient = None
+    for sid, interaction_type, from_user_id, from_instance, from_timestamp in candidates:
+        # 1. ȡշϢͬһӵĺѡڣֻһΣ
+        if sid != last_sid:
+            recipient = sid_index.get(sid)
+            last_sid = sid
+        if recipient is None:
+            continue
+        to_user_id, to_instance, to_timestamp = recipient
+        # Уto_instance˫رգ
+        if not (to_user_id and is_valid_instance(to_instance)):
+            continue
+        
+        # 2. ȷevent_idʽȥ
+        event_id = generate_event_id(interaction_type, from_user_id, to_user_id, sid, from_timestamp)
+        if event_id in seen_event_ids:
+            continue
+        seen_event_ids.add(event_id)
+        records.append((
+            event_id, from_timestamp, from_user_id, from_instance,
+            to_user_id, to_instance, Config.INTERACTION_TYPES[interaction_type],
+            from_instance != to_instance, Config.WEIGHT_DEFAULT
+        ))
+
+
+# ̳workerSIDշinitializerÿworkerһΣÿظл
+_worker_sid_index = None
+
+
+def init_boost_fav_worker(sid_index):
+    """̳initializerworkerбSIDշ"""
+    global _worker_sid_index
+    _worker_sid_index = sid_index
+
+
+def parse_boost_fav_chunk(file):
+    """̳workerboostersfavouritesֿΪת/޼¼"""
+    bf_records = []
+    candidates = iter_boost_fav_candidates(read_chunk_items(file), _worker_sid_index)
+    accumulate_boost_fav_records(bf_records, candidates, _worker_sid_index, set())
     return bf_records
 
 
+def parse_boost_fav_candidates(file):
+    """ģʽboostersfavouritesֿΪѡбSIDɳڸã"""
+    return list(iter_boost_fav_candidates(read_chunk_items(file)))
+
+
+@PROFILER.stage()
+def extract_boost_fav_records(sid_index, writer):
+    """ȡת/޼¼ʽдwriterto_instanceЧԤЧӳ䣩ȡ"""
+    boosters_chunks = get_chunk_files(Config.JSON_DIR, Config.BOOSTERS_PREFIX)
+    if not boosters_chunks:
+        return 0
+    
+    start_count = len(writer)
+    seen_event_ids = set()
+    desc = "Extracting boost/favourite interactions (filter invalid to_instance)"
+    if Config.CHECKPOINT_DIR:
+        # 㱣livefeeds޹صĺѡշ̰ǰ
+        for candidates in collect_partials("boosters", parse_boost_fav_candidates, boosters_chunks, desc):
+            accumulate_boost_fav_records(writer, candidates, sid_index, seen_event_ids)
+    elif Config.WORKERS > 1:
+        batches = map_chunk_files(
+            parse_boost_fav_chunk, boosters_chunks, desc,
+            initializer=init_boost_fav_worker, initargs=(sid_index,)
+        )
+        for batch in batches:
+            append_unseen_records(writer, batch, seen_event_ids)
+    else:
+        candidates = iter_boost_fav_candidates(stream_chunk_data(boosters_chunks, desc), sid_index)
+        accumulate_boost_fav_records(writer, candidates, sid_index, seen_event_ids)
+    
+    bf_count = len(writer) - start_count
+    print(f"Extracted {bf_count} valid boost/favourite interaction records (discarded invalid to_instance)")
+    return bf_count
+
+
 # --------------------------
-# ϲϴ¼չˣ
+# ʽд¼ʽд̣
 # --------------------------
+@PROFILER.stage()
 def generate_interaction_table():
-    """ջ¼عȷ"""
+    """ջ¼ȡ׶ɹȥأ¼ֱд̣"""
     print("\n" + "="*60)
-    print("Starting to generate interaction table (final data cleaning)")
+    print("Starting to generate interaction table (streaming batched writer)")
     print("="*60)
     
-    # 1. ԤlivefeedsȡЧӡշӳ䣩
-    sid_to_recipient = preprocess_livefeeds_for_interaction()
-    
-    # 2. ȡ໥¼ѹЧto_instance
-    reply_records = extract_reply_records()
-    bf_records = extract_boost_fav_records(sid_to_recipient)
-    all_records = reply_records + bf_records
-    
-    if not all_records:
-        raise ValueError("No valid interaction records found! All records were discarded due to invalid data.")
+    # 1. ԤlivefeedsȡЧӡշ
+    sid_index = preprocess_livefeeds_for_interaction()
     
-    # 3. תΪDataFrameϴ
-    df = pd.DataFrame(all_records)
-    initial_count = len(df)
-    print(f"\nInitial total valid records before final cleaning: {initial_count}")
+    # 2. ȡ໥¼ѹЧʵ/ûevent_idȥأȡд
+    #    CSVʼConfig.COLUMNAR_FORMATǿʱͬʱֵParquet/Arrowļ
+    with InteractionTableWriter(
+        Config.OUTPUT_DIR,
+        batch_size=Config.WRITE_BATCH_SIZE,
+        columnar_format=Config.COLUMNAR_FORMAT
+    ) as writer:
+        extract_reply_records(writer)
+        extract_boost_fav_records(sid_index, writer)
     
-    # 4. չˣ˫رգų©Чݣ
-    # ʵIDЧļ¼
-    df = df[
-        df["from_instance"].apply(is_valid_instance) & 
-        df["to_instance"].apply(is_valid_instance)
-    ]
-    # ûIDΪջ"None"ļ¼
-    df = df[
-        (df["from_user_id"] != "") & (df["from_user_id"] != "None") & 
-        (df["to_user_id"] != "") & (df["to_user_id"] != "None")
-    ]
-    # ȥأevent_idΨһʶ
-    df = df.drop_duplicates(subset=["event_id"], keep="first")
-    
-    # 5. ϴ
-    final_count = len(df)
-    print(f"Final valid records after cleaning: {final_count} (discarded {initial_count - final_count} invalid records)")
+    return report_interaction_table(writer)
+
+
+def report_interaction_table(writer):
+    """ѹرյдӡժҪCSV·ɨˮ߹ã"""
+    # 3. д
+    final_count = writer.total
     if final_count == 0:
-        raise ValueError("All records were discarded during final cleaning. Check your JSON data format.")
-    
-    # 6. ֶ˳򣨰ȼ
-    field_order = [
-        "event_id", "timestamp", "from_user_id", "from_instance",
-        "to_user_id", "to_instance", "interaction_type", "is_cross", "weight"
-    ]
-    df = df[field_order]
+        raise ValueError("No valid interaction records found! All records were discarded due to invalid data.")
     
-    # 7. ΪCSVutf-8-sig룬Excel
-    output_path = os.path.join(Config.OUTPUT_DIR, "interaction_table.csv")
-    df.to_csv(output_path, index=False, encoding="utf-8-sig")
+    output_path = writer.csv_path
     print(f"\nInteraction table saved to: {output_path}")
+    if writer.columnar_path:
+        print(f"Columnar copy ({writer.columnar_format}) saved to: {writer.columnar_path}")
     
-    # 8. ժҪڿ֤
+    # 4. ժҪдۼƣض
+    type_distribution = "\n".join(f"{interaction_type}    {count}" for interaction_type, count in writer.type_counts.most_common())
     print("\n" + "-"*40)
     print("Interaction Table Quality Summary:")
     print(f"Total valid records: {final_count}")
-    print(f"Interaction type distribution:\n{df['interaction_type'].value_counts().to_string()}")
-    print(f"Cross-instance interaction ratio: {df['is_cross'].sum()}/{final_count} ({df['is_cross'].mean()*100:.1f}%)")
-    print(f"Unique from_instances: {df['from_instance'].nunique()}")
-    print(f"Unique to_instances: {df['to_instance'].nunique()}")
+    print(f"Interaction type distribution:\n{type_distribution}")
+    print(f"Cross-instance interaction ratio: {writer.cross_count}/{final_count} ({writer.cross_count/final_count*100:.1f}%)")
+    print(f"Unique from_instances: {len(writer.from_instances)}")
+    print(f"Unique to_instances: {len(writer.to_instances)}")
+    print(format_cache_info("Instance-ID (main process)", parse_instance_url.cache_info()))
     print("-"*40)
     
     return output_path
@@ -379,10 +611,16 @@ def main():
     print("="*60)
     print("        Mastodon Interaction Table Generator (v2.0)")
     print("="*60)
+    print(describe_reader(Config.JSON_BACKEND, Config.FULL_PARSE_MAX_BYTES, Config.PROJECTED_PARSING))
     
     try:
-        # 1. ʼĿ¼
+        # 1. ʼĿ¼PROFILE_REPORTʱʼ¼׶ܣ
         create_dir(Config.OUTPUT_DIR)
+        configure_instance_cache()
+        PROFILER.configure(
+            Config.PROFILE_REPORT and os.path.join(Config.OUTPUT_DIR, Config.PROFILE_REPORT),
+            mode=Config.PROFILE_MODE, top_n=Config.PROFILE_TOP_N
+        )
         
         # 2. ɻ¼Ĳ裩
         generate_interaction_table()
@@ -402,6 +640,11 @@ def main():
         print("1. Confirm Config.JSON_DIR has your JSON chunks (livefeeds_, reply_, boostersfavourites_)")
         print("2. Check if JSON files are not corrupted (try opening with a text editor)")
         print("3. Ensure Python has read permissions for the JSON directory")
+    
+    # ʧܵͬдɽ׶ε
+    report_path = PROFILER.write_report(settings={k: v for k, v in vars(Config).items() if k.isupper()})
+    if report_path:
+        print(f"Stage profile report saved: {report_path}")
 
 
 # --------------------------
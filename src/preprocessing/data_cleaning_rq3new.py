@@ -4,12 +4,25 @@
 # һ
 # --------------------------
 import os
-import glob
 import json
-import ijson
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 from collections import Counter
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+
+from instance_url import fast_url_host, format_cache_info
+from tag_counter import new_tag_counter, merge_tag_counter, SpaceSavingCounter
+from user_registry import UserRegistry
+from json_reader import iter_json_items, describe_reader, PROJECTIONS
+from chunk_codecs import list_chunk_files, open_decompressed, chunk_data_size
+from chunk_splitter import ChunkRange, open_chunk_range, expand_chunk_tasks
+from chunk_checkpoint import ChunkCheckpoint, collect_chunk_partials
+from interaction_graph_store import InteractionGraphStore
+from columnar_tables import write_columnar_table
+from stage_profiler import PROFILER
+from time_window_cube import WindowSpec, TimeWindowCube, parse_timestamp, account_timestamp
 from urllib.parse import urlparse
 
 # --------------------------
@@ -28,6 +41,45 @@ class Config:
     # 3. Ծû¹ȷ
     ACTIVE_POST_REQUIRE = 1    # ٷ1
     ACTIVE_INTERACTION_REQUIRE = 3  # +ת+ظ3
+    
+    # 4. д
+    WORKERS = 1  # ̳worker1Ϊ̴У>1ʱÿworkerһֿļֿ˳鲢
+    SPLIT_CHUNK_BYTES = None  # WORKERS>1ʱѳֽδѹֿ鰴Ԫر߽гԼôСֽ䣬ָworkerļһ£NoneΪļ
+    
+    # 5. ʵIDȡ
+    INSTANCE_CACHE_SIZE = 262144  # ˺URLʵIDLRUNoneΪޣ
+    
+    # 6. ʵǩͳ
+    TAG_TOP_K = 5  # ÿʵűǩ
+    TAG_SKETCH_CAPACITY = None  # NoneΪȷΪmʱÿʵౣmǩSpace-Savingƣ߹ܱǩ/m
+    
+    # 7. ֿ鼶㣩
+    CHECKPOINT_DIR = None  # Ŀ¼ǿʱÿһֿ鼴䲿ֻֽ/仯ķֿ飬жϺܣ
+    
+    # 8. ϡ軥ͼ洢
+    GRAPH_STORE_DIR = None  # Ŀ¼µĿ¼"interaction_graph"ʵֵ+4CSR/CSC.npymmapأNoneΪ
+    
+    # 9. ʱ䴰ۺ
+    TIME_WINDOW = None  # NoneΪʱۺϣ"hour" / "day" / "week"򴰿ظcreated_atת/ްӵcreated_atȱʧʱ˺ʱף
+    TIME_CUBE_DIR = "time_cube"  # Ŀ¼µĿ¼ڡʵԼ壬CIIR/Giniʱ켣
+    
+    # 10. JSON
+    JSON_BACKEND = "auto"  # ijsonˣautoyajl2_c  yajl2_cffi  yajl2  pythonȼѡҲָƣʱ
+    FULL_PARSE_MAX_BYTES = None  # ֿ鲻ֽʱ벢orjson/jsonһν죬ڴԼΪļСNoneΪʼʽ
+    PROJECTED_PARSING = "auto"  # ʽʱֻűõֶΣsid˺id/acct/url/ʱǩ/ý/autoֻڴPythonȺͶӰyajl2_c죩True/Falseǿƿ
+    READ_BUFFER_SIZE = 1024 * 1024  # ̶ֽȡÿȡֿΪ.json.json.gz/.json.zst/.json.xzѹֿ߶߽ѹ.zst谲װzstandard
+    
+    # 11. ʽʵԱ4󡢻ͳƱ
+    COLUMNAR_FORMAT = None  # CSVͬʱʽschemaʽļ"parquet" / "arrow"Arrow IPCļ/ NoneCSVpyarrow
+    
+    # 12. ׶
+    PROFILE_REPORT = None  # JSONļOUTPUT_DIR"stage_profile.json"¼׶κʱ/Ŀ/ֵRSS/NoneΪ¼
+    PROFILE_MODE = None  # ȵPROFILE_REPORT"cprofile"üʱϴ/ "sample"ʱջС/ None
+    PROFILE_TOP_N = 30  # ÿ׶гȵ㺯
+
+# ֿ鲿ֽ㣩ĸʽ汾ֽĽṹ仯ʱɰ汾
+# 2ʱ䴰лظcreated_atת/ްӵcreated_atʱ
+PARTIAL_FORMAT_VERSION = 2
 
 # --------------------------
 # ߺɾʱ߼Ϊͳƣ
@@ -42,9 +94,8 @@ def create_dir(path):
 
 
 def get_chunk_files(json_dir, file_prefix):
-    """ȡֿļ"""
-    file_pattern = os.path.join(json_dir, f"{file_prefix}*.json")
-    chunk_files = glob.glob(file_pattern)
+    """ȡֿļ.json.json.gz/.json.zst/.json.xz"""
+    chunk_files = list_chunk_files(json_dir, file_prefix)
     
     def extract_number(file_path):
         file_name = os.path.basename(file_path)
@@ -57,28 +108,46 @@ def get_chunk_files(json_dir, file_prefix):
     return sorted_chunk_files
 
 
-def count_total_items(chunk_files):
-    """ԤͳƷֿļڽ"""
-    total = 0
-    print("\nPre-counting total data items (for progress bar)...")
-    for file in chunk_files:
-        file_name = os.path.basename(file)
-        with open(file, 'rb') as f:
-            parser = ijson.items(f, 'item')
-            chunk_count = sum(1 for _ in tqdm(parser, desc=f"Counting {file_name}"))
-            total += chunk_count
-    print(f"Pre-count completed: Total items = {total}")
-    return total
+class ProgressReader:
+    """ļװÿread()ʵʶȡֽƽ"""
+    def __init__(self, f, pbar):
+        self.f = f
+        self.pbar = pbar
+    
+    def read(self, size=-1):
+        data = self.f.read(size)
+        self.pbar.update(len(data))
+        return data
+
+
+@lru_cache(maxsize=Config.INSTANCE_CACHE_SIZE)
+def parse_instance_url(url):
+    """˺URLȡʵLRU棻https://host/@userʽurlparseֱƬ"""
+    host = fast_url_host(url)
+    if host is not None:
+        return host
+    parsed = urlparse(url)
+    return parsed.netloc if parsed.netloc else ""
+
+
+def configure_instance_cache():
+    """
+    ǰConfig.INSTANCE_CACHE_SIZEؽparse_instance_urlLRU棨main()ʼʱã
+    װеڵʱȷ޸Config.INSTANCE_CACHE_SIZE辭Ч
+    """
+    global parse_instance_url
+    if parse_instance_url.cache_info().maxsize != Config.INSTANCE_CACHE_SIZE:
+        parse_instance_url = lru_cache(maxsize=Config.INSTANCE_CACHE_SIZE)(parse_instance_url.__wrapped__)
 
 
 def extract_instance_id(url_or_sid):
     """URLSIDȡͳһʽʵID"""
     url_or_sid_str = str(url_or_sid).strip()
     if '#' in url_or_sid_str:
+        # SIDÿΨһֱзҲ뻺棨⼷ռظֵ˺URL
         return url_or_sid_str.split('#')[0]
     else:
-        parsed = urlparse(url_or_sid_str)
-        return parsed.netloc if parsed.netloc else ""
+        return parse_instance_url(url_or_sid_str)
 
 
 def extract_user_instance(account):
@@ -87,66 +156,114 @@ def extract_user_instance(account):
     return extract_instance_id(user_url)  # ʵȡ߼
 
 
-def stream_chunk_data(chunk_files, total_items, desc):
-    """ʽȡֿݣڴ"""
-    with tqdm(total=total_items, desc=desc) as pbar:
+def chunk_projection(file):
+    """ֿļǰ׺ظֶֿͶӰ޷ʶֿʱΪNone"""
+    file_name = os.path.basename(file)
+    for prefix, chunk_type in (
+        (Config.LIVEFEEDS_PREFIX, "livefeeds"), (Config.REPLY_PREFIX, "reply"), (Config.BOOSTERS_PREFIX, "boostersfavourites")
+    ):
+        if file_name.startswith(prefix):
+            return PROJECTIONS[chunk_type]
+    return None
+
+
+def read_json_items(f, file, data_size=None):
+    """
+    ConfigѡĽȡֿ鶥飨ѹֿ߶߽ѹСֿʽʱֶֿͶӰ
+    data_sizeΪfеJSONֽȡֽֿʱ룩Ĭϰļ
+    """
+    if data_size is None:
+        data_size = chunk_data_size(file)
+    return iter_json_items(
+        open_decompressed(f, file, Config.READ_BUFFER_SIZE), Config.JSON_BACKEND, data_size,
+        Config.FULL_PARSE_MAX_BYTES, projection=chunk_projection(file), projection_mode=Config.PROJECTED_PARSING,
+        buf_size=Config.READ_BUFFER_SIZE
+    )
+
+
+def stream_chunk_data(chunk_files, desc):
+    """ʽȡֿݣڴѶֽʾȣÿֻֿһΣ"""
+    total_bytes = sum(os.path.getsize(file) for file in chunk_files)
+    with tqdm(total=total_bytes, desc=desc, unit="B", unit_scale=True, unit_divisor=1024) as pbar:
         for file in chunk_files:
             file_name = os.path.basename(file)
             print(f"\nReading chunk file: {file_name}")
-            with open(file, 'rb') as f:
-                parser = ijson.items(f, 'item')
+            with open(file, 'rb', buffering=Config.READ_BUFFER_SIZE) as f:
+                parser = PROFILER.count_items(read_json_items(ProgressReader(f, pbar), file))
                 for item in parser:
                     yield item
-                    pbar.update(1)
 
 
-def update_user_behavior(user_behavior, user_id, behavior_type):
-    """
-    ûΪ¼Ϊͣ
-    behavior_type: "post" / "interaction"/ת/ظ
-    """
-    # ʼûΪĬϷ0Ρ0Σ
-    if user_id not in user_behavior:
-        user_behavior[user_id] = {
-            "post_count": 0,          # 
-            "interaction_count": 0    # +ת+ظ
+def read_chunk_items(file):
+    """ȡֿļֿһֽ䣨ChunkRange̳workerʹãʾ"""
+    if isinstance(file, ChunkRange):
+        for item in PROFILER.count_items(read_json_items(open_chunk_range(file), file.path, file.json_size)):
+            yield item
+        return
+    with open(file, 'rb', buffering=Config.READ_BUFFER_SIZE) as f:
+        for item in PROFILER.count_items(read_json_items(f, file)):
+            yield item
+
+
+def map_chunk_files(parse_fn, chunk_files, desc):
+    """̳ģʽÿworkerһֿļֿһֽ䣩Ϊֽֿ鼰˳򷵻"""
+    tasks = expand_chunk_tasks(chunk_files, Config.SPLIT_CHUNK_BYTES)
+    partials = []
+    with ProcessPoolExecutor(max_workers=Config.WORKERS) as executor:
+        with tqdm(total=len(tasks), desc=f"{desc} [{Config.WORKERS} workers]", unit="task") as pbar:
+            for partial in executor.map(PROFILER.counted(parse_fn), tasks):
+                partials.append(PROFILER.unpack_counted(partial))
+                pbar.update(1)
+    return partials
+
+
+def collect_partials(stage, parse_fn, chunk_files, desc):
+    """/ģʽռֿĲֽCHECKPOINT_DIRʱδ仯ķֱֿӴӼأ"""
+    if Config.CHECKPOINT_DIR:
+        # Ӱ첿ֽݵ仯ʱ
+        settings = {
+            "TAG_SKETCH_CAPACITY": Config.TAG_SKETCH_CAPACITY, "TIME_WINDOW": Config.TIME_WINDOW,
+            "PARTIAL_FORMAT_VERSION": PARTIAL_FORMAT_VERSION
         }
-    
-    # ΪۼӼ
-    if behavior_type == "post":
-        user_behavior[user_id]["post_count"] += 1
-    elif behavior_type == "interaction":
-        user_behavior[user_id]["interaction_count"] += 1
+        checkpoint = ChunkCheckpoint(Config.CHECKPOINT_DIR, f"rq3_{stage}", settings=settings)
+        return list(collect_chunk_partials(
+            checkpoint, chunk_files, PROFILER.counted(parse_fn), desc, workers=Config.WORKERS, unpack=PROFILER.unpack_counted
+        ))
+    return map_chunk_files(parse_fn, chunk_files, desc)
+
+
+def new_time_cube():
+    """TIME_WINDOWʱؿյʱ䴰ۺ򷵻None"""
+    return TimeWindowCube(WindowSpec(Config.TIME_WINDOW)) if Config.TIME_WINDOW else None
+
+
+def merge_time_cubes(target, partials):
+    """Ѹֽʱ䴰ۺ˳鲢targettargetΪNoneʱ"""
+    if target is None:
+        return
+    for partial in partials:
+        if partial["time_cube"] is not None and partial["time_cube"] is not target:
+            target.merge(partial["time_cube"])
 
 # --------------------------
 # ĲlivefeedsݣͳƷΪ
 # --------------------------
-def process_livefeeds():
-    """
-    livefeeds
-    - ׷ûΪpost_count
-    - ¼û-ʵӳ䣨account.urlȡ
-    - ͳʵǩ
-    أuser_behaviorûΪuser_to_instanceû-ʵӳ䣩instance_tagsʵǩ
-    """
-    livefeeds_chunks = get_chunk_files(Config.JSON_DIR, Config.LIVEFEEDS_PREFIX)
-    if not livefeeds_chunks:
-        raise FileNotFoundError("No livefeeds chunk files found! Check path and prefix.")
-    
-    livefeeds_total = count_total_items(livefeeds_chunks)
-    
-    # ʼݽṹ
-    user_behavior = {}  # {user_id: {post_count, interaction_count}}
-    user_to_instance = {}  # {user_id: instance_id}
-    instance_tags = {}  # {instance_id: [tag1, tag2,...]}
-    
-    livefeeds_generator = stream_chunk_data(
-        chunk_files=livefeeds_chunks,
-        total_items=livefeeds_total,
-        desc="Processing livefeeds (tracking posts & tags)"
-    )
+def new_livefeeds_partial():
+    """livefeedsֽʱȫֿ飬ʱӦֿ飩"""
+    return {
+        "users": UserRegistry(),  # ûΪ + û-ʵӳ䣨룩
+        "instance_tags": {},  # {instance_id: Counter({tag: count})}нSpaceSavingCounter
+        "time_cube": new_time_cube()  # ʱ䴰ķ/δTIME_WINDOWʱΪNone
+    }
+
+
+def accumulate_livefeeds(partial, items):
+    """livefeedsĿۼӵֽ"""
+    users = partial["users"]
+    instance_tags = partial["instance_tags"]
+    time_cube = partial["time_cube"]
     
-    for item in livefeeds_generator:
+    for item in items:
         # 1. ȡϢûID + ʵ
         account = item.get("account", {})
         user_id = account.get("id", "").strip()
@@ -155,8 +272,8 @@ def process_livefeeds():
         
         # 2. ȡûʵ¼ӳ䣨ظ
         user_instance = extract_user_instance(account)
-        if user_instance and user_id not in user_to_instance:
-            user_to_instance[user_id] = user_instance
+        if user_instance:
+            users.set_instance(user_id, user_instance)
         
         # 3. ȡʵڱǩͳƣ
         post_instance = extract_instance_id(item.get("sid", ""))
@@ -164,37 +281,236 @@ def process_livefeeds():
             continue
         
         # 4. ûΪΪ"post"ͣ
-        update_user_behavior(user_behavior, user_id, behavior_type="post")
+        users.add_post(user_id)
+        if time_cube is not None:
+            time_cube.add_post(
+                post_instance, parse_timestamp(item.get("created_at") or ""),
+                sid=item.get("sid"), fallback=account_timestamp(account)
+            )
         
         # 5. ͳʵǩ
+        #    ߶߼Ϊÿʵǩб
+        tag_counter = instance_tags.get(post_instance)
+        if tag_counter is None:
+            tag_counter = instance_tags[post_instance] = new_tag_counter(Config.TAG_SKETCH_CAPACITY)
         post_tags = [tag.get("name", "").strip() for tag in item.get("tags", [])]
-        if post_instance not in instance_tags:
-            instance_tags[post_instance] = []
-        if post_tags:
-            instance_tags[post_instance].extend([tag for tag in post_tags if tag])
+        tag_counter.update(tag for tag in post_tags if tag)
+
+
+def parse_livefeeds_chunk(file):
+    """̳workerlivefeedsֿΪֽ"""
+    partial = new_livefeeds_partial()
+    accumulate_livefeeds(partial, read_chunk_items(file))
+    return partial
+
+
+def merge_livefeeds_partials(partials):
+    """ֿ˳鲢livefeedsֽ봮бĲ˳һ£"""
+    if len(partials) == 1:
+        return partials[0]
+    merged = new_livefeeds_partial()
+    merge_time_cubes(merged["time_cube"], partials)
+    for partial in partials:
+        merged["users"].merge(partial["users"])
+        for instance_id, tag_counter in partial["instance_tags"].items():
+            if instance_id not in merged["instance_tags"]:
+                merged["instance_tags"][instance_id] = new_tag_counter(Config.TAG_SKETCH_CAPACITY)
+            merge_tag_counter(merged["instance_tags"][instance_id], tag_counter)
+    return merged
+
+
+@PROFILER.stage()
+def process_livefeeds():
+    """
+    livefeeds
+    - ׷ûΪpost_count
+    - ¼û-ʵӳ䣨account.urlȡ
+    - ͳʵǩ
+    أusersûǼǱΪ+û-ʵӳ䣩instance_tagsʵǩtime_cubeʱ䴰ۺNone
+    """
+    livefeeds_chunks = get_chunk_files(Config.JSON_DIR, Config.LIVEFEEDS_PREFIX)
+    if not livefeeds_chunks:
+        raise FileNotFoundError("No livefeeds chunk files found! Check path and prefix.")
     
-    print(f"Livefeeds processed: Tracked {len(user_behavior)} users (with post records), {len(user_to_instance)} user-instance mappings")
-    return user_behavior, user_to_instance, instance_tags
+    desc = "Processing livefeeds (tracking posts & tags)"
+    if Config.WORKERS > 1 or Config.CHECKPOINT_DIR:
+        partials = collect_partials("livefeeds", parse_livefeeds_chunk, livefeeds_chunks, desc)
+    else:
+        partial = new_livefeeds_partial()
+        accumulate_livefeeds(partial, stream_chunk_data(chunk_files=livefeeds_chunks, desc=desc))
+        partials = [partial]
+    
+    merged = merge_livefeeds_partials(partials)
+    if merged["time_cube"] is not None:
+        merged["time_cube"].finalize_posts()  # ת/ްӵķʱʱ䴰
+    users = merged["users"]
+    instance_tags = merged["instance_tags"]
+    
+    print(f"Livefeeds processed: Tracked {users.behavior_count} users (with post records), {users.instance_mapping_count} user-instance mappings")
+    if Config.TAG_SKETCH_CAPACITY is not None:
+        max_error = max((c.error_bound() for c in instance_tags.values() if isinstance(c, SpaceSavingCounter)), default=0)
+        print(f"Tag sketch: capacity {Config.TAG_SKETCH_CAPACITY} per instance, max count overestimate  {max_error}")
+    return users, instance_tags, merged["time_cube"]
 
 # --------------------------
 # 岽ݣͳƵ/ת/ظ»
 # --------------------------
-def process_interactions(user_behavior, user_to_instance):
+def new_interaction_partial(users=None, time_cube=None):
+    """ֽ3໥ + ûǼǱʱֱӴȫֵǼǱʱ䴰ۺԭظ£"""
+    return {
+        "reply_counter": Counter(),    # ظ(from_inst, to_inst)  count
+        "boost_counter": Counter(),    # ת(from_inst, to_inst)  count
+        "fav_counter": Counter(),      # ޣ(from_inst, to_inst)  count
+        "users": users if users is not None else UserRegistry(),
+        "time_cube": time_cube if time_cube is not None else new_time_cube()
+    }
+
+
+def accumulate_replies(partial, items):
+    """ظĿۼӵֽУ"interaction"ͣ"""
+    reply_counter = partial["reply_counter"]
+    users = partial["users"]
+    time_cube = partial["time_cube"]
+    
+    for item in items:
+        # ظϢ
+        from_account = item.get("acct", {})
+        from_user_id = from_account.get("id", "").strip()
+        if not from_user_id:
+            continue
+        
+        # ȡ䷢𷽵ʵӳ
+        from_instance = extract_user_instance(from_account)
+        if from_instance:
+            users.set_instance(from_user_id, from_instance)
+        if not from_instance:
+            continue  # ʵĻظ
+        
+        # ظʵȷĿʵ
+        to_account = item.get("reply_to_acct", {})
+        to_instance = extract_user_instance(to_account)
+        if not to_instance:
+            continue  # ĿʵĻظ
+        
+        # ûΪΪ"interaction"ͣ
+        users.add_interaction(from_user_id)
+        # ۼӻظ
+        reply_counter[(from_instance, to_instance)] += 1
+        if time_cube is not None:
+            time_cube.add_interaction(
+                "reply", from_instance, to_instance,
+                parse_timestamp(item.get("created_at") or ""), fallback=account_timestamp(from_account)
+            )
+
+
+def accumulate_boosters(partial, items):
+    """ת+ĿۼӵֽУ"interaction"ͣ"""
+    boost_counter = partial["boost_counter"]
+    fav_counter = partial["fav_counter"]
+    users = partial["users"]
+    time_cube = partial["time_cube"]
+    
+    for item in items:
+        # ӵĿʵsidȡ
+        sid = item.get("sid", "")
+        to_instance = extract_instance_id(sid)
+        if not to_instance:
+            continue
+        
+        # ޻
+        favourites = item.get("favourites", [])
+        for fav in favourites:
+            try:
+                if not isinstance(fav, dict):
+                    continue  # ֵֻʽû
+                
+                fav_user_id = fav.get("id", "").strip()
+                if not fav_user_id:
+                    continue
+                
+                # ߵʵӳ
+                fav_instance = extract_user_instance(fav)
+                if fav_instance:
+                    users.set_instance(fav_user_id, fav_instance)
+                if not fav_instance:
+                    continue
+                
+                # »Ϊ+ۼӼ
+                users.add_interaction(fav_user_id)
+                fav_counter[(fav_instance, to_instance)] += 1
+                if time_cube is not None:
+                    time_cube.add_post_interaction("fav", fav_instance, to_instance, sid, fallback=account_timestamp(fav))
+            except Exception as e:
+                print(f"\n?? Skip invalid favourite: {str(e)[:30]}, Data: {str(fav)[:50]}...")
+                continue
+        
+        # ת
+        reblogs = item.get("reblogs", [])
+        for reblog in reblogs:
+            try:
+                if not isinstance(reblog, dict):
+                    continue  # ֵֻʽû
+                
+                reblog_user_id = reblog.get("id", "").strip()
+                if not reblog_user_id:
+                    continue
+                
+                # תߵʵӳ
+                reblog_instance = extract_user_instance(reblog)
+                if reblog_instance:
+                    users.set_instance(reblog_user_id, reblog_instance)
+                if not reblog_instance:
+                    continue
+                
+                # »Ϊ+ۼӼ
+                users.add_interaction(reblog_user_id)
+                boost_counter[(reblog_instance, to_instance)] += 1
+                if time_cube is not None:
+                    time_cube.add_post_interaction("boost", reblog_instance, to_instance, sid, fallback=account_timestamp(reblog))
+            except Exception as e:
+                print(f"\n?? Skip invalid boost: {str(e)[:30]}, Data: {str(reblog)[:50]}...")
+                continue
+
+
+def parse_reply_chunk(file):
+    """̳workerreplyֿΪֽ"""
+    partial = new_interaction_partial()
+    accumulate_replies(partial, read_chunk_items(file))
+    return partial
+
+
+def parse_boosters_chunk(file):
+    """̳workerboostersfavouritesֿΪֽ"""
+    partial = new_interaction_partial()
+    accumulate_boosters(partial, read_chunk_items(file))
+    return partial
+
+
+def collect_interaction_partials(stage, chunk_files, parse_fn, accumulate_fn, desc, users, time_cube):
+    """Config.WORKERS/CHECKPOINT_DIRѡС̳ػģʽذֿ˳еĲֽʱֱӸusers/time_cube"""
+    if Config.WORKERS > 1 or Config.CHECKPOINT_DIR:
+        return collect_partials(stage, parse_fn, chunk_files, desc)
+    partial = new_interaction_partial(users, time_cube)
+    accumulate_fn(partial, stream_chunk_data(chunk_files, desc))
+    return [partial]
+
+
+@PROFILER.stage()
+def process_interactions(users, time_cube=None):
     """
     ݣ
     - ׷ٵ/ת/ظͳһΪ"interaction"ͣinteraction_count
     - 以ûʵӳ
     - 3໥
-    أ3 + ºuser_behavior + ºuser_to_instance
+    userslivefeeds׶εûǼǱtime_cubeʱ䴰ۺԭظ£
+    أ3
     """
     # ʼͣ
     reply_counter = Counter()    # ظ(from_inst, to_inst)  count
     boost_counter = Counter()    # ת(from_inst, to_inst)  count
     fav_counter = Counter()      # ޣ(from_inst, to_inst)  count
     
-    # ޸ԭݣlivefeedsеķ¼
-    updated_user_behavior = {k: v.copy() for k, v in user_behavior.items()}
-    updated_user_to_instance = user_to_instance.copy()
+    partials = []
     
     # --------------------------
     # Ӳ1ظ"interaction"ͣ
@@ -203,34 +519,9 @@ def process_interactions(user_behavior, user_to_instance):
     print("Processing reply interactions (counted as 'interaction')...")
     reply_chunks = get_chunk_files(Config.JSON_DIR, Config.REPLY_PREFIX)
     if reply_chunks:
-        reply_total = count_total_items(reply_chunks)
-        reply_generator = stream_chunk_data(reply_chunks, reply_total, "Processing reply data")
-        
-        for item in reply_generator:
-            # ظϢ
-            from_account = item.get("acct", {})
-            from_user_id = from_account.get("id", "").strip()
-            if not from_user_id:
-                continue
-            
-            # ȡ䷢𷽵ʵӳ
-            from_instance = extract_user_instance(from_account)
-            if from_instance and from_user_id not in updated_user_to_instance:
-                updated_user_to_instance[from_user_id] = from_instance
-            if not from_instance:
-                continue  # ʵĻظ
-            
-            # ظʵȷĿʵ
-            to_account = item.get("reply_to_acct", {})
-            to_instance = extract_user_instance(to_account)
-            if not to_instance:
-                continue  # ĿʵĻظ
-            
-            # ûΪΪ"interaction"ͣ
-            update_user_behavior(updated_user_behavior, from_user_id, behavior_type="interaction")
-            # ۼӻظ
-            reply_counter[(from_instance, to_instance)] += 1
-    
+        partials.extend(collect_interaction_partials(
+            "reply", reply_chunks, parse_reply_chunk, accumulate_replies, "Processing reply data", users, time_cube
+        ))
     else:
         print("No reply chunk files found, skipping reply processing")
     
@@ -241,124 +532,80 @@ def process_interactions(user_behavior, user_to_instance):
     print("Processing boost & favourite interactions (counted as 'interaction')...")
     boosters_chunks = get_chunk_files(Config.JSON_DIR, Config.BOOSTERS_PREFIX)
     if boosters_chunks:
-        boosters_total = count_total_items(boosters_chunks)
-        boosters_generator = stream_chunk_data(boosters_chunks, boosters_total, "Processing boosters data")
-        
-        for item in boosters_generator:
-            # ӵĿʵsidȡ
-            to_instance = extract_instance_id(item.get("sid", ""))
-            if not to_instance:
-                continue
-            
-            # ޻
-            favourites = item.get("favourites", [])
-            for fav in favourites:
-                try:
-                    if not isinstance(fav, dict):
-                        continue  # ֵֻʽû
-                    
-                    fav_user_id = fav.get("id", "").strip()
-                    if not fav_user_id:
-                        continue
-                    
-                    # ߵʵӳ
-                    fav_instance = extract_user_instance(fav)
-                    if fav_instance and fav_user_id not in updated_user_to_instance:
-                        updated_user_to_instance[fav_user_id] = fav_instance
-                    if not fav_instance:
-                        continue
-                    
-                    # »Ϊ+ۼӼ
-                    update_user_behavior(updated_user_behavior, fav_user_id, behavior_type="interaction")
-                    fav_counter[(fav_instance, to_instance)] += 1
-                except Exception as e:
-                    print(f"\n?? Skip invalid favourite: {str(e)[:30]}, Data: {str(fav)[:50]}...")
-                    continue
-            
-            # ת
-            reblogs = item.get("reblogs", [])
-            for reblog in reblogs:
-                try:
-                    if not isinstance(reblog, dict):
-                        continue  # ֵֻʽû
-                    
-                    reblog_user_id = reblog.get("id", "").strip()
-                    if not reblog_user_id:
-                        continue
-                    
-                    # תߵʵӳ
-                    reblog_instance = extract_user_instance(reblog)
-                    if reblog_instance and reblog_user_id not in updated_user_to_instance:
-                        updated_user_to_instance[reblog_user_id] = reblog_instance
-                    if not reblog_instance:
-                        continue
-                    
-                    # »Ϊ+ۼӼ
-                    update_user_behavior(updated_user_behavior, reblog_user_id, behavior_type="interaction")
-                    boost_counter[(reblog_instance, to_instance)] += 1
-                except Exception as e:
-                    print(f"\n?? Skip invalid boost: {str(e)[:30]}, Data: {str(reblog)[:50]}...")
-                    continue
-    
+        partials.extend(collect_interaction_partials(
+            "boosters", boosters_chunks, parse_boosters_chunk, accumulate_boosters, "Processing boosters data", users, time_cube
+        ))
     else:
         print("No boostersfavourites chunk files found, skipping boost/fav processing")
     
+    # --------------------------
+    # Ӳ3ֿ˳鲢ֽreplyǰboostersں봮һ£
+    # --------------------------
+    for partial in partials:
+        reply_counter.update(partial["reply_counter"])
+        boost_counter.update(partial["boost_counter"])
+        fav_counter.update(partial["fav_counter"])
+        if partial["users"] is not users:
+            users.merge(partial["users"])
+    merge_time_cubes(time_cube, partials)
+    
     # ͳƻûδû
-    interaction_user_count = len([uid for uid, data in updated_user_behavior.items() if data["interaction_count"] > 0])
-    print(f"\nInteraction processing completed: {interaction_user_count} users with interaction records, {len(updated_user_to_instance)} total user-instance mappings")
-    return reply_counter, boost_counter, fav_counter, updated_user_behavior, updated_user_to_instance
+    interaction_user_count = int(np.count_nonzero(users.arrays()["interaction"] > 0))
+    print(f"\nInteraction processing completed: {interaction_user_count} users with interaction records, {users.instance_mapping_count} total user-instance mappings")
+    print(format_cache_info("Instance-ID (main process)", parse_instance_url.cache_info()))
+    return reply_counter, boost_counter, fav_counter
 
 # --------------------------
 # ʵԱ¹ͳƻԾû
 # --------------------------
-def generate_instance_attributes(user_behavior, user_to_instance, instance_tags):
+@PROFILER.stage()
+def generate_instance_attributes(users, instance_tags):
     """
     ʵԱ
     - ûʵΪ/ȥû
     - Ծû㡰1 + 3Ρû
+    - ûǼǱаʵbincountʵ׸Ϊûĳ˳
     """
     print("\n" + "="*50)
     print("Generating instance_attributes.csv...")
     print(f"Active user rule: Post {Config.ACTIVE_POST_REQUIRE} time + Interaction {Config.ACTIVE_INTERACTION_REQUIRE} times")
     
-    # ʵͳû
-    instance_stats = {}
-    for user_id, user_data in user_behavior.items():
-        # ӳлȡûʵʵû
-        instance_id = user_to_instance.get(user_id)
-        if not instance_id:
-            continue
-        
-        # ʼʵͳƣû+ԾûΪȥؼϣ
-        if instance_id not in instance_stats:
-            instance_stats[instance_id] = {
-                "total_users": set(),    # ûκΪ/û
-                "active_users": set()    # Ծû¹û
-            }
-        
-        # 1. ûϣֻҪΪͳƣ
-        instance_stats[instance_id]["total_users"].add(user_id)
-        
-        # 2. жǷΪԾûϸ¹
-        is_active = (
-            user_data["post_count"] >= Config.ACTIVE_POST_REQUIRE
-            and user_data["interaction_count"] >= Config.ACTIVE_INTERACTION_REQUIRE
-        )
-        if is_active:
-            instance_stats[instance_id]["active_users"].add(user_id)
+    # ״Ϊ˳ȡΪûʵû
+    columns = users.arrays()
+    behavior_users = columns["behavior_sequence"]
+    instance_codes = columns["instance"][behavior_users]
+    has_instance = instance_codes != UserRegistry.NO_INSTANCE
+    behavior_users = behavior_users[has_instance]
+    instance_codes = instance_codes[has_instance]
+    
+    # 1. жǷΪԾûϸ¹
+    is_active = (
+        (columns["post"][behavior_users] >= Config.ACTIVE_POST_REQUIRE)
+        & (columns["interaction"][behavior_users] >= Config.ACTIVE_INTERACTION_REQUIRE)
+    )
+    
+    # 2. ʵͳûԾûǼǱÿûֻһΣȥأ
+    n_instances = len(users.instances)
+    total_users = np.bincount(instance_codes, minlength=n_instances)
+    active_users = np.bincount(instance_codes[is_active], minlength=n_instances)
+    
+    # 3. ʵ˳򣺰׸Ϊûֵλ
+    present_codes, first_pos = np.unique(instance_codes, return_index=True)
+    ordered_codes = present_codes[np.argsort(first_pos, kind="stable")]
     
     # װ
     attr_list = []
-    for instance_id, stats in instance_stats.items():
-        # ͳTop5ǩlivefeedsıǩȡ
-        tag_list = instance_tags.get(instance_id, [])
-        top5_tags = [tag for tag, _ in Counter(tag_list).most_common(5)]
+    for code in ordered_codes:
+        instance_id = users.instances[code]
+        # ͳTop5ǩlivefeeds׶ʵͬƵΰ״γ˳
+        tag_counter = instance_tags.get(instance_id)
+        top5_tags = [tag for tag, _ in tag_counter.most_common(Config.TAG_TOP_K)] if tag_counter else []
         top5_tags_str = ",".join(top5_tags) if top5_tags else ""
         
         attr_list.append({
             "ʵID": instance_id,
-            "û": len(stats["total_users"]),
-            "Ծû": len(stats["active_users"]),
+            "û": int(total_users[code]),
+            "Ծû": int(active_users[code]),
             "ǩ": top5_tags_str
         })
     
@@ -371,26 +618,32 @@ def generate_instance_attributes(user_behavior, user_to_instance, instance_tags)
     output_path = os.path.join(Config.OUTPUT_DIR, "instance_attributes.csv")
     df.to_csv(output_path, index=False, encoding="utf-8-sig")
     print(f"Instance attributes saved: {output_path} (Total {len(df)} instances)")
+    PROFILER.add_items(len(df))
+    columnar_path = write_columnar_table(df, output_path, Config.COLUMNAR_FORMAT)
+    if columnar_path:
+        print(f"Columnar copy saved: {columnar_path} (tags as list column)")
     # ӡԾûͳƸ
-    total_active = sum([len(stats["active_users"]) for stats in instance_stats.values()])
-    total_user = sum([len(stats["total_users"]) for stats in instance_stats.values()])
+    total_active = int(active_users.sum())
+    total_user = int(total_users.sum())
     print(f"Overall active user ratio: {total_active}/{total_user} ({total_active/total_user*100:.1f}%)")
     return output_path
 
 # --------------------------
 # ߲4ļ߼䣬ַ
 # --------------------------
+@PROFILER.stage()
 def generate_interaction_matrices(reply_counter, boost_counter, fav_counter):
-    """ɻظ/ת//ܻ4ļ"""
+    """ɻظ/ת//ܻ4ļѡϡ軥ͼ洢"""
     print("\n" + "="*50)
     print("Generating interaction matrix files...")
     
     # ãļ
+    total_counter = reply_counter + boost_counter + fav_counter
     matrix_configs = [
         ("interaction_matrix_reply.csv", reply_counter, "Reply"),
         ("interaction_matrix_boost.csv", boost_counter, "Boost"),
         ("interaction_matrix_fav.csv", fav_counter, "Favourite"),
-        ("interaction_matrix_total.csv", reply_counter + boost_counter + fav_counter, "Total")
+        ("interaction_matrix_total.csv", total_counter, "Total")
     ]
     
     output_paths = {}
@@ -414,114 +667,115 @@ def generate_interaction_matrices(reply_counter, boost_counter, fav_counter):
         output_path = os.path.join(Config.OUTPUT_DIR, file_name)
         df.to_csv(output_path, index=False, encoding="utf-8-sig")
         
+        write_columnar_table(df, output_path, Config.COLUMNAR_FORMAT)
+        
         output_paths[desc] = output_path
         print(f"{desc} matrix saved: {output_path} (Total {len(df)} pairs)")
+        PROFILER.add_items(len(df))
+    
+    # ϡ軥ͼ洢ηֱmmapأضCSVٽͼ
+    if Config.GRAPH_STORE_DIR:
+        store = InteractionGraphStore.from_counters({
+            "reply": reply_counter, "boost": boost_counter, "fav": fav_counter, "total": total_counter
+        })
+        store_dir = os.path.join(Config.OUTPUT_DIR, Config.GRAPH_STORE_DIR)
+        store.save(store_dir)
+        print(f"Sparse graph store saved: {store_dir} ({len(store)} instances, {store.csr('total').nnz} total edges)")
     
     return output_paths
 
 # --------------------------
-# ڰ˲ɶάʵͳƱ߼䣬άȣ
+# ڰ˲ɶάʵͳƱα+ɢۼӣ
 # --------------------------
-def generate_instance_interaction_stats(reply_counter, boost_counter, fav_counter):
-    """ɶάȻͳƱڲ/ʵ/"""
-    print("\n" + "="*50)
-    print("Generating instance_interaction_stats.csv...")
-    
-    # ռʵ+Ŀ꣩
+def build_instance_interaction_stats(reply_counter, boost_counter, fav_counter):
+    """
+    αάȻͳDataFrame
+    - ʵȱΪ±ٰ꣬(, Ŀ)±bincountɢۼ
+    - ˳þɰ棺set˳УPYTHONHASHSEED仯ֽ֤ͬ
+    """
+    # ռʵ+Ŀ꣩ɰͬsetȥأ˳ȡַϣ
     all_instances = set()
     for counter in [reply_counter, boost_counter, fav_counter]:
         for (from_inst, to_inst) in counter.keys():
             all_instances.add(from_inst)
             all_instances.add(to_inst)
     all_instances = [inst for inst in all_instances if inst]  # ˿ʵ
-    
-    # ʼͳֵ
-    stats_dict = {}
-    for inst in all_instances:
-        stats_dict[inst] = {
-            # ڲfrom=to
-            "ڲظ": 0,
-            "ڲת": 0,
-            "ڲ": 0,
-            "ڲ": 0,
-            
-            # ʵfrom=ǰʵtoٵǰʵ
-            "ʵظ": 0,
-            "ʵת": 0,
-            "ʵ": 0,
-            "ʵ": 0,
-            
-            # ʵto=ǰʵfromٵǰʵ
-            "ʵظ": 0,
-            "ʵת": 0,
-            "ʵ": 0,
-            "ʵ": 0,
-            
-            # 
-            "ʵܻ": 0
-        }
-    
-    # ͳ
-    for inst in all_instances:
-        # 1. ظ
-        for (from_inst, to_inst), count in reply_counter.items():
-            if from_inst == to_inst == inst:
-                stats_dict[inst]["ڲظ"] += count
-            elif from_inst == inst and to_inst != inst:
-                stats_dict[inst]["ʵظ"] += count
-            elif to_inst == inst and from_inst != inst:
-                stats_dict[inst]["ʵظ"] += count
+    inst_index = {inst: idx for idx, inst in enumerate(all_instances)}
+    n_inst = len(all_instances)
+    
+    def scatter_counts(counter):
+        """Եһα(ڲ, , )м"""
+        n_pairs = len(counter)
+        from_codes = np.empty(n_pairs, dtype=np.int64)
+        to_codes = np.empty(n_pairs, dtype=np.int64)
+        counts = np.empty(n_pairs, dtype=np.int64)
+        for i, ((from_inst, to_inst), count) in enumerate(counter.items()):
+            from_codes[i] = inst_index.get(from_inst, -1)  # ʵΪ-1
+            to_codes[i] = inst_index.get(to_inst, -1)
+            counts[i] = count
         
-        # 2. ת
-        for (from_inst, to_inst), count in boost_counter.items():
-            if from_inst == to_inst == inst:
-                stats_dict[inst]["ڲת"] += count
-            elif from_inst == inst and to_inst != inst:
-                stats_dict[inst]["ʵת"] += count
-            elif to_inst == inst and from_inst != inst:
-                stats_dict[inst]["ʵת"] += count
+        is_internal = (from_codes == to_codes) & (from_codes >= 0)
+        is_cross = from_codes != to_codes
+        out_mask = is_cross & (from_codes >= 0)
+        in_mask = is_cross & (to_codes >= 0)
         
-        # 3. ޻
-        for (from_inst, to_inst), count in fav_counter.items():
-            if from_inst == to_inst == inst:
-                stats_dict[inst]["ڲ"] += count
-            elif from_inst == inst and to_inst != inst:
-                stats_dict[inst]["ʵ"] += count
-            elif to_inst == inst and from_inst != inst:
-                stats_dict[inst]["ʵ"] += count
+        def bincount(codes, mask):
+            # Ϊfloat64ۼ2^53޾ʧ
+            return np.bincount(codes[mask], weights=counts[mask], minlength=n_inst).astype(np.int64)
         
-        # 4. ֶ
-        stats_dict[inst]["ڲ"] = (
-            stats_dict[inst]["ڲظ"] + stats_dict[inst]["ڲת"] + stats_dict[inst]["ڲ"]
-        )
-        stats_dict[inst]["ʵ"] = (
-            stats_dict[inst]["ʵظ"] + stats_dict[inst]["ʵת"] + stats_dict[inst]["ʵ"]
-        )
-        stats_dict[inst]["ʵ"] = (
-            stats_dict[inst]["ʵظ"] + stats_dict[inst]["ʵת"] + stats_dict[inst]["ʵ"]
-        )
-        stats_dict[inst]["ʵܻ"] = (
-            stats_dict[inst]["ʵ"] + stats_dict[inst]["ʵ"]
-        )
-    
-    # װϴ
-    stats_list = []
-    for inst, stats in stats_dict.items():
-        stats["ʵID"] = inst
-        stats_list.append(stats)
-    
-    df = pd.DataFrame(stats_list)
-    # ˳ʵIDǰ
-    col_order = ["ʵID"] + [col for col in df.columns if col != "ʵID"]
-    df = df[col_order]
+        return bincount(from_codes, is_internal), bincount(from_codes, out_mask), bincount(to_codes, in_mask)
+    
+    reply_internal, reply_out, reply_in = scatter_counts(reply_counter)
+    boost_internal, boost_out, boost_in = scatter_counts(boost_counter)
+    fav_internal, fav_out, fav_in = scatter_counts(fav_counter)
+    
+    # ֶ
+    internal_total = reply_internal + boost_internal + fav_internal
+    out_total = reply_out + boost_out + fav_out
+    in_total = reply_in + boost_in + fav_in
+    
+    df = pd.DataFrame({
+        "ʵID": all_instances,
+        # ڲfrom=to
+        "ڲظ": reply_internal,
+        "ڲת": boost_internal,
+        "ڲ": fav_internal,
+        "ڲ": internal_total,
+        # ʵfrom=ǰʵtoٵǰʵ
+        "ʵظ": reply_out,
+        "ʵת": boost_out,
+        "ʵ": fav_out,
+        "ʵ": out_total,
+        # ʵto=ǰʵfromٵǰʵ
+        "ʵظ": reply_in,
+        "ʵת": boost_in,
+        "ʵ": fav_in,
+        "ʵ": in_total,
+        # 
+        "ʵܻ": out_total + in_total
+    })
     # ϴ
     df = df.drop_duplicates(subset=["ʵID"])
     df = df.dropna(subset=["ʵID"])
+    return df
+
+
+@PROFILER.stage()
+def generate_instance_interaction_stats(reply_counter, boost_counter, fav_counter):
+    """ɶάȻͳƱڲ/ʵ/"""
+    print("\n" + "="*50)
+    print("Generating instance_interaction_stats.csv...")
+    
+    df = build_instance_interaction_stats(reply_counter, boost_counter, fav_counter)
     
     # ļ
     output_path = os.path.join(Config.OUTPUT_DIR, "instance_interaction_stats.csv")
     df.to_csv(output_path, index=False, encoding="utf-8-sig")
     print(f"Interaction stats saved: {output_path} (Total {len(df)} instances)")
+    PROFILER.add_items(len(df))
+    columnar_path = write_columnar_table(df, output_path, Config.COLUMNAR_FORMAT)
+    if columnar_path:
+        print(f"Columnar copy saved: {columnar_path}")
     
     # ӡʾݣ֤߼
     if len(df) > 0:
@@ -532,6 +786,21 @@ def generate_instance_interaction_stats(reply_counter, boost_counter, fav_counte
     
     return output_path
 
+
+@PROFILER.stage()
+def generate_time_cube(time_cube):
+    """水ʱ䴰ۺϵķ/壨δTIME_WINDOWʱ"""
+    if time_cube is None:
+        return None
+    cube = time_cube.finalize()
+    cube_dir = os.path.join(Config.OUTPUT_DIR, Config.TIME_CUBE_DIR)
+    cube.save(cube_dir)
+    PROFILER.add_items(len(cube.pairs['count']), unit="window-pair cells")
+    print(f"Time-window cube saved: {cube_dir} ({len(cube.windows)} windows of {cube.spec.seconds}s, "
+          f"{len(cube.pairs['count'])} window-pair cells, "
+          f"{cube.account_timed} records timed by account timestamp, {cube.untimed} untimed records skipped)")
+    return cube_dir
+
 # --------------------------
 # ھŲ̣ɾʱشӡ
 # --------------------------
@@ -539,28 +808,30 @@ def main():
     print("="*60)
     print("        RQ3 Data Generation Script (Active User Rule Updated)")
     print("="*60)
-    print(f"Active User Rule: Post {Config.ACTIVE_POST_REQUIRE} time + Interaction (Like/Boost/Reply) {Config.ACTIVE_INTERACTION_REQUIRE} times\n")
+    print(f"Active User Rule: Post {Config.ACTIVE_POST_REQUIRE} time + Interaction (Like/Boost/Reply) {Config.ACTIVE_INTERACTION_REQUIRE} times")
+    print(describe_reader(Config.JSON_BACKEND, Config.FULL_PARSE_MAX_BYTES, Config.PROJECTED_PARSING) + "\n")
     
     try:
-        # 1. ʼĿ¼
+        # 1. ʼĿ¼PROFILE_REPORTʱʼ¼׶ܣ
         create_dir(Config.OUTPUT_DIR)
+        configure_instance_cache()
+        PROFILER.configure(
+            Config.PROFILE_REPORT and os.path.join(Config.OUTPUT_DIR, Config.PROFILE_REPORT),
+            mode=Config.PROFILE_MODE, top_n=Config.PROFILE_TOP_N
+        )
         
         # 2. livefeedsΪ+û-ʵӳ+ǩ
         print("Step 1/5: Processing livefeeds data (track posts)")
-        user_behavior, user_to_instance, instance_tags = process_livefeeds()
+        users, instance_tags, time_cube = process_livefeeds()
         
         # 3. ݣΪ+ӳ+ּ
         print("\nStep 2/5: Processing interaction data (track likes/boosts/replies)")
-        reply_counter, boost_counter, fav_counter, updated_user_behavior, updated_user_to_instance = process_interactions(
-            user_behavior=user_behavior,
-            user_to_instance=user_to_instance
-        )
+        reply_counter, boost_counter, fav_counter = process_interactions(users=users, time_cube=time_cube)
         
         # 4. ʵԱ¹ͳƻԾû
         print("\nStep 3/5: Generating instance attributes (active user rule applied)")
         attr_path = generate_instance_attributes(
-            user_behavior=updated_user_behavior,
-            user_to_instance=updated_user_to_instance,
+            users=users,
             instance_tags=instance_tags
         )
         
@@ -571,6 +842,7 @@ def main():
         # 6. ɶάȻͳƱ
         print("\nStep 5/5: Generating instance interaction stats")
         stats_path = generate_instance_interaction_stats(reply_counter, boost_counter, fav_counter)
+        cube_path = generate_time_cube(time_cube)
         
         # սʾ
         print("\n" + "="*60)
@@ -580,6 +852,8 @@ def main():
         for desc, path in matrix_paths.items():
             print(f"2. {desc} Matrix: {path}")
         print(f"3. Interaction Stats: {stats_path}")
+        if cube_path:
+            print(f"4. Time-Window Cube: {cube_path}")
     
     except Exception as e:
         print(f"\n? Script Error: {str(e)}")
@@ -587,6 +861,11 @@ def main():
         print("1. Confirm JSON_DIR/OUTPUT_DIR in Config is correct")
         print("2. Ensure chunk file prefixes (e.g., 'livefeeds_') match your files")
         print("3. Check if user data in JSON is dict format (not string)")
+    
+    # ʧܵͬдɽ׶ε
+    report_path = PROFILER.write_report(settings={k: v for k, v in vars(Config).items() if k.isupper()})
+    if report_path:
+        print(f"Stage profile report saved: {report_path}")
 
 # --------------------------
 # ʮнű
@@ -0,0 +1,33 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# ˺URL  ʵĿ·Ԥűã
+# --------------------------
+HTTPS_PREFIX = "https://"
+HTTPS_PREFIX_LEN = len(HTTPS_PREFIX)
+
+
+def fast_url_host(url):
+    """
+     https://host/@user ʽֱƬȡurlparse
+    - urlparse(url).netlocһ
+    - httpsǰ׺ΪջҪurlparse⴦ַѯIPv6š
+      Ʊ/еȲɴӡַʱNoneɵ÷˵urlparse
+    """
+    if not url.startswith(HTTPS_PREFIX):
+        return None
+    end = url.find("/", HTTPS_PREFIX_LEN)
+    host = url[HTTPS_PREFIX_LEN:] if end == -1 else url[HTTPS_PREFIX_LEN:end]
+    if not host or "?" in host or "[" in host or "]" in host or not url.isprintable():
+        return None
+    return host
+
+
+def format_cache_info(name, cache_info):
+    """ʽfunctools.lru_cacheͳ"""
+    lookups = cache_info.hits + cache_info.misses
+    hit_rate = cache_info.hits / lookups * 100 if lookups else 0.0
+    return (
+        f"{name} cache: {cache_info.hits} hits / {cache_info.misses} misses "
+        f"({hit_rate:.1f}% hit rate, {cache_info.currsize}/{cache_info.maxsize} entries)"
+    )
\ No newline at end of file
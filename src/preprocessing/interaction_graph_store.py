@@ -0,0 +1,224 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import json
+import numpy as np
+import pandas as pd
+
+# --------------------------
+# ڶ
+# --------------------------
+#   ӦĳCSVʵ,Ŀʵ,
+MATRIX_FILES = {
+    "reply": "interaction_matrix_reply.csv",
+    "boost": "interaction_matrix_boost.csv",
+    "fav": "interaction_matrix_fav.csv",
+    "total": "interaction_matrix_total.csv"
+}
+INTERACTION_TYPES = tuple(MATRIX_FILES)
+LAYOUTS = ("csr", "csc")  # csrʵУߣcscĿʵУߣ
+PARTS = ("indptr", "indices", "data")
+
+# --------------------------
+# ѹϡо󣨴numpyscipy
+# --------------------------
+def coo_to_csr(rows, cols, weights, n, index_dtype=np.int64):
+    """ʽ  CSR (indptr, indices, weights)ظ(, )Ȩӣڰк"""
+    keys = rows.astype(np.int64) * n + cols
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    summed = np.bincount(inverse, weights=weights, minlength=len(unique_keys))
+    unique_rows = unique_keys // n
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(unique_rows, minlength=n), out=indptr[1:])
+    return indptr, (unique_keys % n).astype(index_dtype), summed
+
+
+class CompressedMatrix:
+    """
+    ѹϡ󣺵iекΪ indices[indptr[i]:indptr[i+1]]ӦȨΪdataͬһ
+    - CSRʱ=ʵ=ĿʵCSCͬṹ洢תã=Ŀʵ
+    - Ϊnp.load(mmap_mode="r")صڴӳ䣬ֻ
+    """
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = shape
+
+    @classmethod
+    def from_coo(cls, rows, cols, data, n):
+        """ʽڰк(, )ظ"""
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return cls(indptr, cols[order].astype(np.int32), data[order].astype(np.int64), (n, n))
+
+    @property
+    def nnz(self):
+        return len(self.indices)
+
+    def degrees(self):
+        """ÿзԪCSRΪȣCSCΪȣ"""
+        return np.diff(self.indptr)
+
+    def row_sums(self):
+        """ÿȨ֮ͣCSRΪ򻥶CSCΪ򻥶"""
+        cumsum = np.concatenate(([0], np.cumsum(self.data, dtype=np.int64)))
+        return cumsum[self.indptr[1:]] - cumsum[self.indptr[:-1]]
+
+    def row(self, i):
+        """صiе (к, Ȩ)"""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def row_ids(self):
+        """ÿԪڵкţչΪʽʱʹã"""
+        return np.repeat(np.arange(self.shape[0], dtype=np.int32), self.degrees())
+
+    def to_coo(self):
+        """չΪʽ (к, к, Ȩ)к/кΪint64"""
+        return self.row_ids().astype(np.int64), np.asarray(self.indices, dtype=np.int64), np.asarray(self.data)
+
+    def to_scipy(self):
+        """תΪscipy.sparse.csr_matrix谲װscipy"""
+        from scipy.sparse import csr_matrix
+        return csr_matrix((self.data, self.indices, self.indptr), shape=self.shape)
+
+# --------------------------
+# Ĳʵͼ洢
+# --------------------------
+class InteractionGraphStore:
+    """
+    ʵͼϡ洢ʵIDֵ + ظ/ת//ܻ4CSRCSC
+    - ʵIDֵ루instances[code] = ʵID;ͬһ
+    - ΪĿ¼instances.json + meta.json + ÿ3.npy飬ʱmmapضCSV
+    - //򻥶ֱindptrdata
+    """
+    def __init__(self, instances, matrices):
+        self.instances = instances
+        self.matrices = matrices  # {(interaction_type, layout): CompressedMatrix}
+        self._index = None
+
+    def __len__(self):
+        return len(self.instances)
+
+    # --------------------------
+    # 
+    # --------------------------
+    @classmethod
+    def from_edges(cls, edges):
+        """
+        ɸ͵ıб
+        edges: {interaction_type: (from_instances, to_instances, counts)}
+               from/toΪʵIDУͬһ(, Ŀ)ظ
+        """
+        instances = sorted({instance_id for src, dst, _ in edges.values() for ids in (src, dst) for instance_id in ids})
+        index = {instance_id: code for code, instance_id in enumerate(instances)}
+        n = len(instances)
+
+        matrices = {}
+        for interaction_type, (src, dst, counts) in edges.items():
+            rows = np.fromiter((index[i] for i in src), dtype=np.int32, count=len(src))
+            cols = np.fromiter((index[i] for i in dst), dtype=np.int32, count=len(dst))
+            data = np.asarray(counts, dtype=np.int64)
+            matrices[(interaction_type, "csr")] = CompressedMatrix.from_coo(rows, cols, data, n)
+            matrices[(interaction_type, "csc")] = CompressedMatrix.from_coo(cols, rows, data, n)
+        return cls(instances, matrices)
+
+    @classmethod
+    def from_counters(cls, counters):
+        """Ԥ׶εļcounters = {interaction_type: Counter{(from_inst, to_inst): count}}ʵ"""
+        edges = {}
+        for interaction_type, counter in counters.items():
+            pairs = [(src, dst, count) for (src, dst), count in counter.items() if src and dst]
+            src, dst, counts = zip(*pairs) if pairs else ((), (), ())
+            edges[interaction_type] = (src, dst, counts)
+        return cls.from_edges(edges)
+
+    @classmethod
+    def from_csv_files(cls, data_dir):
+        """ѷ4CSVʵ,Ŀʵ,"""
+        edges = {}
+        for interaction_type, file_name in MATRIX_FILES.items():
+            df = pd.read_csv(
+                os.path.join(data_dir, file_name), encoding="utf-8-sig",
+                dtype={"ʵ": str, "Ŀʵ": str}, keep_default_na=False
+            )
+            edges[interaction_type] = (df["ʵ"].to_numpy(), df["Ŀʵ"].to_numpy(), df[""].to_numpy())
+        return cls.from_edges(edges)
+
+    # --------------------------
+    # д.npy + JSONʱmmap
+    # --------------------------
+    def save(self, store_dir):
+        os.makedirs(store_dir, exist_ok=True)
+        for (interaction_type, layout), matrix in self.matrices.items():
+            for part in PARTS:
+                np.save(os.path.join(store_dir, f"{interaction_type}_{layout}_{part}.npy"), getattr(matrix, part))
+        with open(os.path.join(store_dir, "instances.json"), "w", encoding="utf-8") as f:
+            json.dump(self.instances, f, ensure_ascii=False)
+        meta = {
+            "n_instances": len(self.instances),
+            "types": sorted({interaction_type for interaction_type, _ in self.matrices}),
+            "nnz": {interaction_type: self.matrices[(interaction_type, "csr")].nnz for interaction_type, _ in self.matrices}
+        }
+        with open(os.path.join(store_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+    @classmethod
+    def load(cls, store_dir, mmap=True):
+        mmap_mode = "r" if mmap else None
+        with open(os.path.join(store_dir, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(store_dir, "instances.json"), "r", encoding="utf-8") as f:
+            instances = json.load(f)
+
+        n = meta["n_instances"]
+        matrices = {}
+        for interaction_type in meta["types"]:
+            for layout in LAYOUTS:
+                parts = [
+                    np.load(os.path.join(store_dir, f"{interaction_type}_{layout}_{part}.npy"), mmap_mode=mmap_mode)
+                    for part in PARTS
+                ]
+                matrices[(interaction_type, layout)] = CompressedMatrix(*parts, shape=(n, n))
+        return cls(instances, matrices)
+
+    # --------------------------
+    # ѯ
+    # --------------------------
+    def csr(self, interaction_type="total"):
+        return self.matrices[(interaction_type, "csr")]
+
+    def csc(self, interaction_type="total"):
+        return self.matrices[(interaction_type, "csc")]
+
+    def code(self, instance_id):
+        """ʵID  루ʱNone"""
+        if self._index is None:
+            self._index = {instance_id: code for code, instance_id in enumerate(self.instances)}
+        return self._index.get(instance_id)
+
+    def out_degree(self, interaction_type="total"):
+        return self.csr(interaction_type).degrees()
+
+    def in_degree(self, interaction_type="total"):
+        return self.csc(interaction_type).degrees()
+
+    def out_strength(self, interaction_type="total"):
+        """ÿʵĻ"""
+        return self.csr(interaction_type).row_sums()
+
+    def in_strength(self, interaction_type="total"):
+        """ÿʵյĻ"""
+        return self.csc(interaction_type).row_sums()
+
+    def self_loops(self, interaction_type="total"):
+        """ÿʵʵڻԽԪأ"""
+        matrix = self.csr(interaction_type)
+        rows = matrix.row_ids()
+        is_diag = matrix.indices == rows
+        return np.bincount(rows[is_diag], weights=matrix.data[is_diag], minlength=len(self)).astype(np.int64)
\ No newline at end of file
@@ -0,0 +1,173 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import numpy as np
+import pandas as pd
+from collections import Counter
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrowΪѡȱʧʱCSV
+    pa = None
+    pq = None
+
+# --------------------------
+# ڶ¼ֶζ
+# --------------------------
+# ¼ͳһΪ˳еԪ飨Ϊÿ9ֵ䣩
+INTERACTION_FIELDS = [
+    "event_id", "timestamp", "from_user_id", "from_instance",
+    "to_user_id", "to_instance", "interaction_type", "is_cross", "weight"
+]
+EVENT_ID_INDEX = INTERACTION_FIELDS.index("event_id")
+
+# ҪֵУȡֵСظȸߣ
+DICTIONARY_FIELDS = ["from_instance", "to_instance", "interaction_type"]
+
+COLUMNAR_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}  # columnar_tablesһ£read_output_tableֱӶȡ
+
+# --------------------------
+# ʽд
+# --------------------------
+class InteractionTableWriter:
+    """
+    ¼ʽд
+    - ¼Ȼڰ֯ĻУbatch_size׷д̲գֵڴģ޹
+    - ʼCSVutf-8-sigԭʽһ£ѡͬʱParquetArrow IPCļ
+    - ʽʵͻΪֵ루ȫͳһ룬αһ£
+    - ͬۼժҪͳض
+    - д.tmpʱļclose()ʱм¼滻Ϊʽļûм¼ʱʱļеֲ
+    """
+    def __init__(self, output_dir, batch_size=100000, columnar_format=None):
+        self.batch_size = batch_size
+        self.csv_path = os.path.join(output_dir, "interaction_table.csv")
+        self.columns = {field: [] for field in INTERACTION_FIELDS}
+
+        # ʽãpyarrowȱʧʱԶΪCSV
+        if columnar_format and pa is None:
+            print(f"Warning: pyarrow not installed, skipping {columnar_format} output (CSV only)")
+            columnar_format = None
+        if columnar_format and columnar_format not in COLUMNAR_EXTENSIONS:
+            raise ValueError(f"Unsupported columnar format: {columnar_format} (expected 'parquet' or 'arrow')")
+        self.columnar_format = columnar_format
+        self.columnar_path = (
+            os.path.join(output_dir, "interaction_table" + COLUMNAR_EXTENSIONS[columnar_format])
+            if columnar_format else None
+        )
+        self.columnar_writer = None
+        self.dictionaries = {field: {} for field in DICTIONARY_FIELDS}  # ȡֵ  ȫ
+
+        # ժҪͳ
+        self.total = 0
+        self.type_counts = Counter()
+        self.cross_count = 0
+        self.from_instances = set()
+        self.to_instances = set()
+
+        self.csv_file = open(self.csv_path + ".tmp", "w", encoding="utf-8-sig", newline="")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(discard=exc_type is not None)
+
+    def __len__(self):
+        """׷ӵļ¼δд̵Ļ壩"""
+        return self.total + len(self.columns["event_id"])
+
+    def append(self, record):
+        """׷һ¼INTERACTION_FIELDS˳Ԫ飩"""
+        for field, value in zip(INTERACTION_FIELDS, record):
+            self.columns[field].append(value)
+        if len(self.columns["event_id"]) >= self.batch_size:
+            self.flush()
+
+    def extend(self, records):
+        """׷һ¼̳workerصļ¼Σ"""
+        for record in records:
+            self.append(record)
+
+    def flush(self):
+        """ǰдCSVʽļ"""
+        batch_len = len(self.columns["event_id"])
+        if batch_len == 0:
+            return
+
+        # 1. ׷CSVдͷ
+        df = pd.DataFrame(self.columns, columns=INTERACTION_FIELDS)
+        df.to_csv(self.csv_file, index=False, header=(self.total == 0))
+
+        # 2. ׷ʽļ
+        if self.columnar_format:
+            self._write_columnar_batch()
+
+        # 3. ۼժҪ
+        self.total += batch_len
+        self.type_counts.update(self.columns["interaction_type"])
+        self.cross_count += sum(self.columns["is_cross"])
+        self.from_instances.update(self.columns["from_instance"])
+        self.to_instances.update(self.columns["to_instance"])
+
+        self.columns = {field: [] for field in INTERACTION_FIELDS}
+
+    def _encode(self, field):
+        """ֵתΪDictionaryArrayֵȡֵб벻䣩"""
+        mapping = self.dictionaries[field]
+        indices = np.fromiter(
+            (mapping.setdefault(value, len(mapping)) for value in self.columns[field]),
+            dtype=np.int32, count=len(self.columns[field])
+        )
+        dictionary = pa.array(list(mapping), type=pa.string())
+        return pa.DictionaryArray.from_arrays(pa.array(indices, type=pa.int32()), dictionary)
+
+    def _write_columnar_batch(self):
+        arrays = {
+            "event_id": pa.array(self.columns["event_id"], type=pa.int64()),
+            "timestamp": pa.array(self.columns["timestamp"], type=pa.string()),
+            "from_user_id": pa.array(self.columns["from_user_id"], type=pa.string()),
+            "from_instance": self._encode("from_instance"),
+            "to_user_id": pa.array(self.columns["to_user_id"], type=pa.string()),
+            "to_instance": self._encode("to_instance"),
+            "interaction_type": self._encode("interaction_type"),
+            "is_cross": pa.array(self.columns["is_cross"], type=pa.bool_()),
+            "weight": pa.array(self.columns["weight"], type=pa.int32())
+        }
+        table = pa.table([arrays[field] for field in INTERACTION_FIELDS], names=INTERACTION_FIELDS)
+
+        if self.columnar_writer is None:
+            if self.columnar_format == "parquet":
+                self.columnar_writer = pq.ParquetWriter(self.columnar_path + ".tmp", table.schema)
+            else:
+                # ֵȫֵֻ׷ȡֵдб
+                options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+                self.columnar_writer = pa.ipc.new_file(self.columnar_path + ".tmp", table.schema, options=options)
+        self.columnar_writer.write_table(table)
+
+    def close(self, discard=False):
+        """
+        дʣ໺岢رļм¼ʱʱļ滻Ϊʽͬchunk_checkpoint.atomic_write
+        discard=Trueûκμ¼ʱɾʱļе
+        """
+        if self.csv_file.closed:
+            return
+        try:
+            if not discard:
+                self.flush()
+        finally:
+            self.csv_file.close()
+            if self.columnar_writer is not None:
+                self.columnar_writer.close()
+                self.columnar_writer = None
+        paths = [self.csv_path] + ([self.columnar_path] if self.columnar_path else [])
+        for path in paths:
+            if not os.path.exists(path + ".tmp"):
+                continue
+            if discard or self.total == 0:
+                os.remove(path + ".tmp")
+            else:
+                os.replace(path + ".tmp", path)
\ No newline at end of file
@@ -0,0 +1,200 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import json
+import ijson
+
+try:
+    import orjson  # ѡģʽµĿJSON
+except ImportError:
+    orjson = None
+
+# --------------------------
+# ڶijsonѡ
+# --------------------------
+# ٶȴӿ쵽ĺѡˣpythonΪPythonʵ֣yajl2_cһ
+BACKEND_PREFERENCE = ("yajl2_c", "yajl2_cffi", "yajl2", "yajl", "python")
+# items()Cչֱӹĺˣ¼PythonֶͶӰautoģʽ²ͶӰ
+NATIVE_ITEM_BUILDERS = ("yajl2_c",)
+_backend_cache = {}
+
+
+def select_backend(name="auto"):
+    """
+     (, ijsonģ)
+    - "auto"BACKEND_PREFERENCEѡһõĺˣCչyajl2_c
+    - ָʱֻԸúˣʱ⾲Ĭ˻شPython
+    """
+    if name in _backend_cache:
+        return _backend_cache[name]
+    candidates = BACKEND_PREFERENCE if name == "auto" else (name,)
+    errors = []
+    for candidate in candidates:
+        try:
+            backend = ijson.get_backend(candidate)
+        except Exception as e:
+            errors.append(f"{candidate}: {e}")
+            continue
+        _backend_cache[name] = (candidate, backend)
+        return _backend_cache[name]
+    raise ImportError(f"No usable ijson backend ({'; '.join(errors)})")
+
+
+def full_document_parser():
+    """ʹõĽ(, )orjsonδװʱʹñ׼json"""
+    if orjson is not None:
+        return "orjson", orjson.loads
+    return "json", json.loads
+
+
+def should_project(backend_name, projection_mode="auto"):
+    """ǷʽֶͶӰTrue/Falseǿƿأautoֻitems()PythonĺͶӰ"""
+    if projection_mode == "auto":
+        return backend_name not in NATIVE_ITEM_BUILDERS
+    return bool(projection_mode)
+
+
+def describe_reader(backend="auto", full_parse_max_bytes=None, projection_mode="auto"):
+    """صǰȡõ˵֣־"""
+    backend_name, _ = select_backend(backend)
+    description = f"ijson backend: {backend_name}"
+    if backend_name == "python":
+        description += " (pure-Python, install ijson with the yajl2_c extension for native speed)"
+    description += f"; field projection {'on' if should_project(backend_name, projection_mode) else 'off'}"
+    if full_parse_max_bytes:
+        parser_name, _ = full_document_parser()
+        description += f"; whole-chunk parsing with {parser_name} for chunks <= {full_parse_max_bytes / 1024 ** 2:.0f} MB"
+    return description
+
+# --------------------------
+# ֶͶӰֻűõֶΣ
+# --------------------------
+# ˺ŶԤűõֶΣûIDacctˡʵURLʱ
+ACCOUNT_FIELDS = {"id": True, "acct": True, "url": True, "last_status_at": True, "created_at": True}
+
+# ÿֿͶӰdictʾֻгļ[ͶӰ]ʾÿԪذͶӰTrueʾ
+# ͶӰ״ֵfavouritesлַԭ
+PROJECTIONS = {
+    "livefeeds": {"sid": True, "created_at": True, "account": ACCOUNT_FIELDS, "tags": [{"name": True}]},
+    "reply": {"sid": True, "id": True, "created_at": True, "acct": ACCOUNT_FIELDS, "reply_to_acct": ACCOUNT_FIELDS},
+    "boostersfavourites": {"sid": True, "favourites": [ACCOUNT_FIELDS], "reblogs": [ACCOUNT_FIELDS]}
+}
+
+CONTAINER_STARTS = ("start_map", "start_array")
+CONTAINER_ENDS = ("end_map", "end_array")
+
+
+def _skip_value(events, event):
+    """һֵ账ȼĵӦĽ¼κζ"""
+    if event not in CONTAINER_STARTS:
+        return
+    depth = 1
+    for event, _ in events:
+        if event in CONTAINER_STARTS:
+            depth += 1
+        elif event in CONTAINER_ENDS:
+            depth -= 1
+            if not depth:
+                return
+
+
+def _build_value(events, event, value, projection):
+    if event == "start_map":
+        return _build_map(events, projection if isinstance(projection, dict) else True)
+    if event == "start_array":
+        return _build_array(events, projection[0] if isinstance(projection, list) else True)
+    return value
+
+
+def _build_map(events, projection):
+    result = {}
+    for event, key in events:
+        if event == "end_map":
+            return result
+        event, value = next(events)
+        sub_projection = True if projection is True else projection.get(key)
+        if sub_projection is None:
+            _skip_value(events, event)
+        else:
+            result[key] = _build_value(events, event, value, sub_projection)
+    return result
+
+
+def _build_array(events, projection):
+    result = []
+    for event, value in events:
+        if event == "end_array":
+            return result
+        result.append(_build_value(events, event, value, projection))
+    return result
+
+
+def iter_projected_items(events, projection):
+    """basic_parse¼ԪأֻͶӰֶ"""
+    events = iter(events)
+    for event, _ in events:
+        if event != "start_array":
+            return  # 㲻ʱijson.items(f, 'item')һ£κԪ
+        break
+    for event, value in events:
+        if event == "end_array":
+            return
+        yield _build_value(events, event, value, projection)
+
+# --------------------------
+# Ĳȡ
+# --------------------------
+IJSON_BUF_SIZE = 64 * 1024  # ijsonĬÿread()ֽ
+
+
+class PrefixedReader:
+    """ѶĿͷֽ + ļʣಿ֣ƴΪһֻСδ֪ķֿ̽ʽ"""
+    def __init__(self, head, f):
+        self.head = head
+        self.f = f
+
+    def read(self, size=-1):
+        if not self.head:
+            return self.f.read(size)
+        if size is None or size < 0:
+            data, self.head = self.head + self.f.read(), b""
+            return data
+        data, self.head = self.head[:size], self.head[size:]
+        return data
+
+
+def iter_json_items(f, backend="auto", file_size=None, full_parse_max_bytes=None, projection=None,
+                    projection_mode="auto", buf_size=IJSON_BUF_SIZE):
+    """
+    ֿļеԪأijson.items(f, 'item')һ£
+    - ֿСfull_parse_max_bytesʱһζֿ鲢ÿٽ
+      ĶԼռļСڴ棬ֵֿڴԤ㣩
+      file_sizeΪNoneѹֿ飩ʱȶfull_parse_max_bytes+1ֽڣδֵʽ
+    - ʹѡijsonʽÿδfȡbuf_sizeֽ
+    - ʽʱprojectionPROJECTIONSҰprojection_modeҪͶӰshould_project
+      ֶֻΣ¼ֱ
+    ģʽСΪfloatDecimalֿʱģʽλ֮ǰԪ
+    """
+    if full_parse_max_bytes:
+        document = None
+        if file_size is None:
+            head = f.read(full_parse_max_bytes + 1)
+            if len(head) <= full_parse_max_bytes:
+                document = head
+            else:
+                f = PrefixedReader(head, f)
+        elif file_size <= full_parse_max_bytes:
+            document = f.read()
+        if document is not None:
+            _, loads = full_document_parser()
+            document = loads(document)
+            if isinstance(document, list):
+                yield from document
+            return
+    backend_name, ijson_backend = select_backend(backend)
+    if projection is not None and should_project(backend_name, projection_mode):
+        yield from iter_projected_items(ijson_backend.basic_parse(f, buf_size=buf_size), projection)
+    else:
+        yield from ijson_backend.items(f, 'item', buf_size=buf_size)
\ No newline at end of file
@@ -0,0 +1,147 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import json
+import hashlib
+import numpy as np
+from array import array
+
+# --------------------------
+# ڶߺ
+# --------------------------
+def hash64(text):
+    """ַȷ64λϣзţֱӴint64飩"""
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def chunk_fingerprint(chunk_files):
+    """ֿļָƣļ+С+޸ʱ䣩жϳ־ûǷlivefeedsһ"""
+    return [
+        [os.path.basename(file), os.path.getsize(file), os.stat(file).st_mtime_ns]
+        for file in chunk_files
+    ]
+
+# --------------------------
+# յSID  շ
+# --------------------------
+class SidRecipientIndex:
+    """
+     {sid: (to_user_id, to_instance, to_timestamp)} ֵĽ
+    - SIDֻ64λϣint64飬ֲң
+    - ûIDʵIDʱֱפΪ룬ÿӽռ 8+4+4+4 ֽ
+    - ׶ΰ˳׷ӣfinalize()ʱ򲢶ظSIDȳֵӳ
+    - ɱΪ.npyĿ¼mmapʽأضlivefeeds
+    ע64λϣڰSIDµײԼΪ1e-7ɺ
+    """
+    FIELDS = ("user", "instance", "timestamp")
+
+    def __init__(self):
+        # ׶λ壨arraylistյöࣩ
+        self.sid_hashes = array("q")
+        self.codes = {field: array("i") for field in self.FIELDS}
+        # פַ  ַ׶ζά ַ  
+        self.strings = {field: [] for field in self.FIELDS}
+        self._lookup = {field: {} for field in self.FIELDS}
+        self.finalized = False
+
+    def __len__(self):
+        return len(self.sid_hashes)
+
+    def _intern(self, field, value):
+        lookup = self._lookup[field]
+        code = lookup.get(value)
+        if code is None:
+            code = len(self.strings[field])
+            lookup[value] = code
+            self.strings[field].append(value)
+        return code
+
+    def add(self, sid, to_user_id, to_instance, to_timestamp):
+        """׷һӳ䣨׶Σ"""
+        self.sid_hashes.append(hash64(sid))
+        self.codes["user"].append(self._intern("user", to_user_id))
+        self.codes["instance"].append(self._intern("instance", to_instance))
+        self.codes["timestamp"].append(self._intern("timestamp", to_timestamp))
+
+    def finalize(self):
+        """ȥأظSIDȲӳ䣩ֻ֮"""
+        if self.finalized:
+            return self
+        sid_hashes = np.frombuffer(self.sid_hashes, dtype=np.int64)
+        # ȶnp.uniqueÿϣ׸λãȲһ
+        order = np.argsort(sid_hashes, kind="stable")
+        sorted_hashes = sid_hashes[order]
+        _, first = np.unique(sorted_hashes, return_index=True)
+        keep = order[first]
+        self.sid_hashes = sid_hashes[keep]
+        self.codes = {field: np.frombuffer(self.codes[field], dtype=np.int32)[keep] for field in self.FIELDS}
+        self._lookup = None
+        self.finalized = True
+        return self
+
+    def get(self, sid):
+        """SIDӦ (to_user_id, to_instance, to_timestamp)򷵻None"""
+        key = hash64(sid)
+        pos = int(np.searchsorted(self.sid_hashes, key))
+        if pos >= len(self.sid_hashes) or self.sid_hashes[pos] != key:
+            return None
+        return (
+            self.strings["user"][self.codes["user"][pos]],
+            self.strings["instance"][self.codes["instance"][pos]],
+            self.strings["timestamp"][self.codes["timestamp"][pos]]
+        )
+
+    def __contains__(self, sid):
+        return self.get(sid) is not None
+
+    def nbytes(self):
+        """ֵռֽפַ"""
+        return self.sid_hashes.nbytes + sum(self.codes[field].nbytes for field in self.FIELDS)
+
+    # --------------------------
+    # ־û.npy + JSONʱmmap
+    # --------------------------
+    def save(self, index_dir, fingerprint=None, settings=None):
+        """
+        浽Ŀ¼fingerprint´μʱУԴֿǷ仯
+        settings¼ӳݵЩշĬʱȣ仯ʱ
+        """
+        self.finalize()
+        os.makedirs(index_dir, exist_ok=True)
+        np.save(os.path.join(index_dir, "sid_hashes.npy"), self.sid_hashes)
+        for field in self.FIELDS:
+            np.save(os.path.join(index_dir, f"{field}_codes.npy"), self.codes[field])
+        with open(os.path.join(index_dir, "strings.json"), "w", encoding="utf-8") as f:
+            json.dump(self.strings, f, ensure_ascii=False)
+        with open(os.path.join(index_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"size": len(self), "fingerprint": fingerprint, "settings": settings}, f)
+
+    @classmethod
+    def load(cls, index_dir, fingerprint=None, mmap=True, settings=None):
+        """Ŀ¼أĿ¼ڡָƻһʱNone"""
+        meta_path = os.path.join(index_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if fingerprint is not None and meta.get("fingerprint") != fingerprint:
+            return None
+        if settings is not None and meta.get("settings") != settings:
+            return None
+
+        mmap_mode = "r" if mmap else None
+        index = cls()
+        index.sid_hashes = np.load(os.path.join(index_dir, "sid_hashes.npy"), mmap_mode=mmap_mode)
+        index.codes = {
+            field: np.load(os.path.join(index_dir, f"{field}_codes.npy"), mmap_mode=mmap_mode)
+            for field in cls.FIELDS
+        }
+        with open(os.path.join(index_dir, "strings.json"), "r", encoding="utf-8") as f:
+            index.strings = json.load(f)
+        index._lookup = None
+        index.finalized = True
+        return index
\ No newline at end of file
@@ -0,0 +1,262 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import time
+import importlib.util
+from abc import ABC, abstractmethod
+from tqdm import tqdm
+
+import data_cleaning_rq3new as rq3
+from json_reader import iter_json_items, describe_reader, PROJECTIONS
+from chunk_codecs import open_decompressed, chunk_data_size
+
+
+def load_script(file_name, module_name):
+    """·Ԥűdata_cleaning_rq1&2.pyļ޷ֱimport"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+rq12 = load_script("data_cleaning_rq1&2.py", "data_cleaning_rq12")
+
+# --------------------------
+# ڶȫֲ
+# --------------------------
+class Config:
+    # 1. ļ·ãűConfigеJSON_DIR/OUTPUT_DIRԶȡűConfig
+    JSON_DIR = r""  # ֿJSONĿ¼
+    RQ12_OUTPUT_DIR = r""  # RQ1/2¼Ŀ¼
+    RQ3_OUTPUT_DIR = r""  # RQ3ʵ//ͳƱĿ¼
+
+    # 2. ֿļǰ׺ļƥ䣩
+    LIVEFEEDS_PREFIX = "livefeeds_"
+    REPLY_PREFIX = "reply_"
+    BOOSTERS_PREFIX = "boostersfavourites_"
+
+    # 3. õĽSINK_TYPESֻһʱҪķֿȡ
+    SINKS = ["interaction_table", "rq3_aggregates"]
+
+    # 4. ȳСÿĿȫһΣĿֻһΣڴԼΪСС
+    FANOUT_BATCH = 1024
+
+    # 5. JSON壨ͬԤű
+    JSON_BACKEND = "auto"
+    FULL_PARSE_MAX_BYTES = None
+    PROJECTED_PARSING = "auto"
+    READ_BUFFER_SIZE = 1024 * 1024
+
+# ɨ˳RQ1/2ת/޼¼livefeedsSIDűȴظٴת/
+CHUNK_TYPES = ("livefeeds", "reply", "boostersfavourites")
+
+# --------------------------
+# ÿֿĿȳȫ
+# --------------------------
+class ChunkSink(ABC):
+    """
+    ӿڣ࣬δʵconsumeʵʱɨ赽һʧܣ
+    - stagesҪķֿͣȫҪķֿͲȡ
+    - begin(chunk_type) / consume(chunk_type, items) / end(chunk_type)ÿֿ鿪ʼÿĿΡʱ
+    - finish()ȫֿɨɺд·
+    - close()쳣˳ʱͷԴĬ޲
+    """
+    stages = CHUNK_TYPES
+
+    def begin(self, chunk_type):
+        pass
+
+    @abstractmethod
+    def consume(self, chunk_type, items):
+        pass
+
+    def end(self, chunk_type):
+        pass
+
+    def finish(self):
+        return None
+
+    def close(self):
+        pass
+
+
+class InteractionTableSink(ChunkSink):
+    """
+    RQ1/2¼
+    - livefeeds  SIDշlivefeedsʱfinalizeɰSID_INDEX_DIR棩
+    - reply / boostersfavourites  ȥغĻ¼ʽдInteractionTableWriter
+    """
+    def __init__(self):
+        self.sid_index = rq12.SidRecipientIndex()
+        self.writer = rq12.InteractionTableWriter(
+            rq12.Config.OUTPUT_DIR,
+            batch_size=rq12.Config.WRITE_BATCH_SIZE,
+            columnar_format=rq12.Config.COLUMNAR_FORMAT
+        )
+        self.seen_event_ids = set()
+
+    def begin(self, chunk_type):
+        # ظת/޸ȥأgenerate_interaction_tableһ£
+        self.seen_event_ids = set()
+
+    def consume(self, chunk_type, items):
+        if chunk_type == "livefeeds":
+            rq12.accumulate_recipients(self.sid_index, items)
+        elif chunk_type == "reply":
+            rq12.accumulate_reply_records(self.writer, items, self.seen_event_ids)
+        else:
+            candidates = rq12.iter_boost_fav_candidates(items, self.sid_index)
+            rq12.accumulate_boost_fav_records(self.writer, candidates, self.sid_index, self.seen_event_ids)
+
+    def end(self, chunk_type):
+        if chunk_type != "livefeeds":
+            return
+        self.sid_index.finalize()
+        print(f"Preprocessed {len(self.sid_index)} valid post SID  recipient mappings")
+        if rq12.Config.SID_INDEX_DIR:
+            livefeeds_chunks = rq12.get_chunk_files(Config.JSON_DIR, Config.LIVEFEEDS_PREFIX)
+            self.sid_index.save(
+                rq12.Config.SID_INDEX_DIR, fingerprint=rq12.chunk_fingerprint(livefeeds_chunks), settings=rq12.sid_index_settings()
+            )
+
+    def finish(self):
+        self.writer.close()
+        return rq12.report_interaction_table(self.writer)
+
+    def close(self):
+        self.writer.close(discard=True)
+
+
+class InstanceAggregateSink(ChunkSink):
+    """
+    RQ3ʵۺϣ
+    - livefeeds  ûΪû-ʵӳ䡢ʵǩʱ䴰
+    - reply / boostersfavourites  ʵԻûΪʱ䴰
+    finishʱдʵԱ󣨺ϡͼͳƱʱ䴰
+    """
+    def __init__(self):
+        self.livefeeds = rq3.new_livefeeds_partial()
+        self.interactions = rq3.new_interaction_partial(self.livefeeds["users"], self.livefeeds["time_cube"])
+
+    def consume(self, chunk_type, items):
+        if chunk_type == "livefeeds":
+            rq3.accumulate_livefeeds(self.livefeeds, items)
+        elif chunk_type == "reply":
+            rq3.accumulate_replies(self.interactions, items)
+        else:
+            rq3.accumulate_boosters(self.interactions, items)
+
+    def end(self, chunk_type):
+        if chunk_type == "livefeeds" and self.livefeeds["time_cube"] is not None:
+            self.livefeeds["time_cube"].finalize_posts()
+
+    def finish(self):
+        users, partial = self.livefeeds["users"], self.interactions
+        print(f"Tracked {users.behavior_count} users, {users.instance_mapping_count} user-instance mappings")
+        attr_path = rq3.generate_instance_attributes(users=users, instance_tags=self.livefeeds["instance_tags"])
+        counters = (partial["reply_counter"], partial["boost_counter"], partial["fav_counter"])
+        matrix_paths = rq3.generate_interaction_matrices(*counters)
+        stats_path = rq3.generate_instance_interaction_stats(*counters)
+        rq3.generate_time_cube(self.livefeeds["time_cube"])
+        return [attr_path, *matrix_paths.values(), stats_path]
+
+
+SINK_TYPES = {
+    "interaction_table": InteractionTableSink,
+    "rq3_aggregates": InstanceAggregateSink
+}
+
+# --------------------------
+# Ĳɨ棨ÿֻֿȡһΣ
+# --------------------------
+def iter_item_batches(chunk_files, chunk_type, desc):
+    """ֿʽFANOUT_BATCHгĿΣ𻵵ķֿѲĿ"""
+    projection = PROJECTIONS[chunk_type]
+    total_bytes = sum(os.path.getsize(file) for file in chunk_files)
+    with tqdm(total=total_bytes, desc=desc, unit="B", unit_scale=True, unit_divisor=1024) as pbar:
+        for file in chunk_files:
+            batch = []
+            try:
+                with open(file, 'rb', buffering=Config.READ_BUFFER_SIZE) as f:
+                    stream = open_decompressed(rq3.ProgressReader(f, pbar), file, Config.READ_BUFFER_SIZE)
+                    items = iter_json_items(
+                        stream, Config.JSON_BACKEND, chunk_data_size(file), Config.FULL_PARSE_MAX_BYTES,
+                        projection=projection, projection_mode=Config.PROJECTED_PARSING, buf_size=Config.READ_BUFFER_SIZE
+                    )
+                    for item in items:
+                        batch.append(item)
+                        if len(batch) >= Config.FANOUT_BATCH:
+                            yield batch
+                            batch = []
+            except Exception as e:
+                print(f"\nSkip corrupted file {os.path.basename(file)}: {str(e)[:50]}")
+            if batch:
+                yield batch
+
+
+def run_single_scan(sinks):
+    """CHUNK_TYPES˳ɨȫֿ飬ÿĿνҪ÷ֿ͵Ľظ"""
+    prefixes = {
+        "livefeeds": Config.LIVEFEEDS_PREFIX,
+        "reply": Config.REPLY_PREFIX,
+        "boostersfavourites": Config.BOOSTERS_PREFIX
+    }
+    try:
+        for chunk_type in CHUNK_TYPES:
+            targets = [sink for sink in sinks if chunk_type in sink.stages]
+            if not targets:
+                continue
+            chunk_files = rq3.get_chunk_files(Config.JSON_DIR, prefixes[chunk_type])
+            start = time.perf_counter()
+            count = 0
+            for sink in targets:
+                sink.begin(chunk_type)
+            for batch in iter_item_batches(chunk_files, chunk_type, f"Scanning {chunk_type} ({len(targets)} sinks)"):
+                count += len(batch)
+                for sink in targets:
+                    sink.consume(chunk_type, batch)
+            for sink in targets:
+                sink.end(chunk_type)
+            print(f"{chunk_type}: {count} items from {len(chunk_files)} chunks in {time.perf_counter() - start:.1f}s")
+        return [sink.finish() for sink in sinks]
+    except BaseException:
+        for sink in sinks:
+            sink.close()
+        raise
+
+
+def main():
+    print("="*60)
+    print("        Single-Scan Preprocessing Pipeline (RQ1/2 + RQ3)")
+    print("="*60)
+    print(describe_reader(Config.JSON_BACKEND, Config.FULL_PARSE_MAX_BYTES, Config.PROJECTED_PARSING))
+    print(f"Sinks: {', '.join(Config.SINKS)}\n")
+
+    # 1. ·ǰ׺ͬűConfigڸýűۼд
+    for module, output_dir in ((rq12, Config.RQ12_OUTPUT_DIR), (rq3, Config.RQ3_OUTPUT_DIR)):
+        module.Config.JSON_DIR = Config.JSON_DIR
+        module.Config.OUTPUT_DIR = output_dir
+        module.Config.LIVEFEEDS_PREFIX = Config.LIVEFEEDS_PREFIX
+        module.Config.REPLY_PREFIX = Config.REPLY_PREFIX
+        module.Config.BOOSTERS_PREFIX = Config.BOOSTERS_PREFIX
+        module.configure_instance_cache()
+    if "interaction_table" in Config.SINKS:
+        rq12.create_dir(Config.RQ12_OUTPUT_DIR)
+    if "rq3_aggregates" in Config.SINKS:
+        rq3.create_dir(Config.RQ3_OUTPUT_DIR)
+
+    # 2. ɨ貢ɸд
+    start = time.perf_counter()
+    outputs = run_single_scan([SINK_TYPES[name]() for name in Config.SINKS])
+    print("\n" + "="*60)
+    print(f"        All outputs generated in {time.perf_counter() - start:.1f}s")
+    print("="*60)
+    return dict(zip(Config.SINKS, outputs))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
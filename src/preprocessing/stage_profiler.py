@@ -0,0 +1,379 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import gc
+import sys
+import json
+import time
+import pstats
+import cProfile
+import platform
+import threading
+from datetime import datetime
+from functools import wraps, partial
+from collections import Counter
+
+try:
+    import resource  # UnixgetrusageȡֵRSS
+except ImportError:
+    resource = None
+
+try:
+    import psutil  # ѡWindowsresourceģƽ̨ȡڴ
+except ImportError:
+    psutil = None
+
+PROFILE_MODES = ("cprofile", "sample")
+
+# --------------------------
+# ڶڴ
+# --------------------------
+def peak_rss_mb(children=False):
+    """
+    ̷ֵפڴ棨MBֵchildren=TrueʱΪѽӽ̣̳workerеֵ
+    ޷ȡʱNone
+    """
+    if not children:
+        # Linuxȶȡ/procеVmHWMgetrusageru_maxrssexecɴڴ游ʱΪ̵ķֵ
+        try:
+            with open("/proc/self/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        return round(int(line.split()[1]) / 1024, 1)
+        except OSError:
+            pass
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+        unit = 1 if sys.platform == "darwin" else 1024  # macOSΪֽڣLinuxΪKB
+        return round(usage.ru_maxrss * unit / 1024 ** 2, 1)
+    if psutil is not None and not children:
+        info = psutil.Process().memory_info()
+        return round(getattr(info, "peak_wset", info.rss) / 1024 ** 2, 1)
+    return None
+
+
+def current_rss_mb():
+    """ǰפڴ棨MB޷ȡʱNone"""
+    if psutil is not None:
+        return round(psutil.Process().memory_info().rss / 1024 ** 2, 1)
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return round(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2, 1)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def object_counts():
+    """(gcٵ, pymallocѷڴ)ǰһȫ"""
+    return len(gc.get_objects()), sys.getallocatedblocks()
+
+
+def object_types(top_n):
+    """gcٶͼǰtop_nģʽڶλڴжѻĶ"""
+    counts = Counter(type(obj).__name__ for obj in gc.get_objects())
+    return dict(counts.most_common(top_n))
+
+# --------------------------
+# ȵcProfile / ջ
+# --------------------------
+def function_label(filename, lineno, name):
+    """pstatsһµĺʶļ:к()"""
+    return f"{os.path.basename(filename)}:{lineno}({name})"
+
+
+def cprofile_hot_spots(profile, top_n):
+    """ʱǰtop_nôʱӵõۼƺʱ"""
+    stats = pstats.Stats(profile).stats
+    ranked = sorted(stats.items(), key=lambda entry: entry[1][2], reverse=True)[:top_n]
+    return [
+        {"function": function_label(*key), "calls": nc, "self_s": round(tt, 4), "cumulative_s": round(ct, 4)}
+        for key, (cc, nc, tt, ct, callers) in ranked
+    ]
+
+
+class StackSampler:
+    """
+    ػ߳ÿintervalһ̵߳ջǵʱڲĽ׶£
+    - λջۼջУͬһֻһΣ
+    ô޹أcProfileÿκöʱʺȫ϶λȵ㣻CչеĺʱڵPython
+    """
+    def __init__(self, current_stage, interval=0.005):
+        self.current_stage = current_stage
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.self_samples = {}  # ׶  Counter(  )
+        self.total_samples = {}
+        self.sample_counts = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stage-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            stage = self.current_stage()
+            frame = sys._current_frames().get(self.thread_id)
+            if stage is None or frame is None:
+                continue
+            self.sample_counts[stage] += 1
+            self_counter = self.self_samples.setdefault(stage, Counter())
+            total_counter = self.total_samples.setdefault(stage, Counter())
+            self_counter[self._label(frame.f_code)] += 1
+            seen = set()
+            while frame is not None:
+                label = self._label(frame.f_code)
+                if label not in seen:
+                    seen.add(label)
+                    total_counter[label] += 1
+                frame = frame.f_back
+
+    @staticmethod
+    def _label(code):
+        return function_label(code.co_filename, code.co_firstlineno, code.co_name)
+
+    def hot_spots(self, stage, top_n):
+        """ý׶ΰǰtop_n"""
+        n_samples = self.sample_counts.get(stage, 0)
+        if not n_samples:
+            return []
+        total_counter = self.total_samples[stage]
+        return [
+            {"function": label, "self_samples": count, "self_pct": round(count / n_samples * 100, 1),
+             "total_pct": round(total_counter[label] / n_samples * 100, 1)}
+            for label, count in self.self_samples[stage].most_common(top_n)
+        ]
+
+# --------------------------
+# Ĳ׶
+# --------------------------
+class StageProfiler:
+    """
+    ¼Ԥű׶εĺʱĿ¡ֵRSSдJSON棺
+    - @PROFILER.stage()װν׶κδʱװֱӵԭɺ
+    - Ŀ׶ڽJSONĿ̾count_items̳workerļrun_countedأ
+      мصķֿδJSONĽ׶Σgenerate_*add_items¼д
+    - ׶οǶףgenerate_interaction_tablelivefeedsԤextract_*_recordsʱĿӽ׶
+    - mode="cprofile" / "sample"ʱ¼׶εĺȵ㣻Ƕʱȵֻڲ׶Σ
+      cProfileģʽÿ׶εԭʼͳΪ.profļsnakevizȹ߲鿴
+    """
+    def __init__(self):
+        self.enabled = False
+        self.report_path = None
+        self.mode = None
+        self.top_n = 30
+        self.records = []
+        self.active = []  # еĽ׶Σǰ
+        self.counting = False  # ǷԽĿ
+        self.items_read = 0
+        self.sampler = None
+        self.started = None
+        self._fork_hook = False
+
+    def configure(self, report_path, mode=None, top_n=30, sample_interval=0.005):
+        """report_pathΪNoneʱֹرգmodeΪNone / "cprofile" / "sample" """
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"Unsupported profile mode: {mode} (expected one of {PROFILE_MODES} or None)")
+        self.enabled = bool(report_path)
+        self.report_path = report_path
+        self.mode = mode if self.enabled else None
+        self.top_n = top_n
+        self.records = []
+        self.counting = self.enabled
+        self.items_read = 0
+        self.started = time.perf_counter()
+        if self.enabled and os.path.dirname(report_path):
+            os.makedirs(os.path.dirname(report_path), exist_ok=True)
+        if self.mode == "sample":
+            self.sampler = StackSampler(self.current_stage, sample_interval)
+            self.sampler.start()
+        if self.enabled and not self._fork_hook and hasattr(os, "register_at_fork"):
+            # forkĽ̳worker̵̳߳״̬ӽйرգworkerĿrun_countedͳƣ
+            os.register_at_fork(after_in_child=self._disable_in_child)
+            self._fork_hook = True
+
+    def _disable_in_child(self):
+        for entry in self.active:
+            if entry.get("profile") is not None:
+                entry["profile"].disable()
+        self.enabled = False
+        self.mode = None
+        self.counting = False
+        self.active = []
+        self.sampler = None
+
+    def current_stage(self):
+        return self.active[-1]["stage"] if self.active else None
+
+    # --------------------------
+    # Ŀ
+    # --------------------------
+    def count_items(self, items):
+        """ԽĿԭδʱֱӷԭ"""
+        if not self.counting:
+            return items
+        return self._count(items)
+
+    def _count(self, items):
+        for item in items:
+            self.items_read += 1
+            yield item
+
+    def add_items(self, n, unit="rows"):
+        """ΪJSONĵǰ׶μ¼Ŀд"""
+        if self.enabled and self.active:
+            self.active[-1]["extra_items"] += n
+            self.active[-1]["unit"] = unit
+
+    def counted(self, parse_fn):
+        """̳ʱװΪ (ֽ, Ŀ) run_counted÷unpack_counted"""
+        return partial(run_counted, parse_fn) if self.enabled else parse_fn
+
+    def unpack_counted(self, result):
+        if not self.enabled:
+            return result
+        partial_result, n_items = result
+        self.items_read += n_items
+        return partial_result
+
+    # --------------------------
+    # ׶μʱ
+    # --------------------------
+    def stage(self, name=None):
+        """׶κװnameĬΪ"""
+        def decorator(fn):
+            stage_name = name or fn.__name__
+
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                self._enter(stage_name)
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self._exit()
+            return wrapper
+        return decorator
+
+    def _enter(self, stage_name):
+        gc_objects, blocks = object_counts()
+        entry = {
+            "stage": stage_name, "unit": "json items", "extra_items": 0, "items_start": self.items_read,
+            "gc_objects": gc_objects, "blocks": blocks, "peak_rss": peak_rss_mb(), "profile": None
+        }
+        if self.mode == "cprofile":
+            # ͬһʱֻһcProfile״̬ͣ׶Σӽ׶νָ
+            if self.active and self.active[-1]["profile"] is not None:
+                self.active[-1]["profile"].disable()
+            entry["profile"] = cProfile.Profile()
+        self.active.append(entry)
+        entry["wall"] = time.perf_counter()
+        entry["cpu"] = time.process_time()
+        if entry["profile"] is not None:
+            entry["profile"].enable()
+
+    def _exit(self):
+        entry = self.active[-1]
+        if entry["profile"] is not None:
+            entry["profile"].disable()
+        wall = time.perf_counter() - entry["wall"]
+        cpu = time.process_time() - entry["cpu"]
+        self.active.pop()
+        if self.active and self.active[-1]["profile"] is not None:
+            self.active[-1]["profile"].enable()
+
+        items = entry["extra_items"] or self.items_read - entry["items_start"]
+        unit = entry["unit"]
+        peak = peak_rss_mb()
+        rss = current_rss_mb()
+        gc_objects, blocks = object_counts()
+        record = {
+            "stage": entry["stage"],
+            "parent": self.current_stage(),
+            "wall_s": round(wall, 3),
+            "cpu_s": round(cpu, 3),
+            "items": items,
+            "item_unit": unit,
+            "items_per_s": round(items / wall, 1) if wall > 0 else None,
+            "peak_rss_mb": peak,
+            "peak_rss_growth_mb": round(peak - entry["peak_rss"], 1) if peak is not None else None,
+            "rss_mb": rss,
+            "worker_peak_rss_mb": peak_rss_mb(children=True),
+            "gc_objects": gc_objects,
+            "gc_objects_delta": gc_objects - entry["gc_objects"],
+            "allocated_blocks": blocks,
+            "allocated_blocks_delta": blocks - entry["blocks"]
+        }
+        if entry["profile"] is not None:
+            record["hot_spots"] = cprofile_hot_spots(entry["profile"], self.top_n)
+            record["profile_file"] = self._dump_profile(entry["profile"], entry["stage"])
+        if self.mode is not None:
+            record["object_types"] = object_types(self.top_n)
+        self.records.append(record)
+        print(f"[profile] {record['stage']}: {record['wall_s']:.2f}s, {items} {unit} "
+              f"({record['items_per_s'] or 0:,.0f}/s), peak RSS {peak} MB")
+
+    def _dump_profile(self, profile, stage_name):
+        """cProfileԭʼͳΪ <>_<׶>.profļ"""
+        path = f"{os.path.splitext(self.report_path)[0]}_{stage_name}.prof"
+        profile.dump_stats(path)
+        return os.path.basename(path)
+
+    # --------------------------
+    # 
+    # --------------------------
+    def write_report(self, settings=None):
+        """дJSON棨׶ΰ˳Уӽ׶ڸ׶֮ǰ·δʱNone"""
+        if not self.enabled:
+            return None
+        if self.sampler is not None:
+            self.sampler.stop()
+            for record in self.records:
+                record["hot_spots"] = self.sampler.hot_spots(record["stage"], self.top_n)
+                record["samples"] = self.sampler.sample_counts.get(record["stage"], 0)
+        # ȶȡڴʱplatformѯϢʱӽ̣ӽ̷ֵ
+        total_wall = round(time.perf_counter() - self.started, 3)
+        peak, worker_peak = peak_rss_mb(), peak_rss_mb(children=True)
+        report = {
+            "script": os.path.basename(sys.argv[0]),
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "mode": self.mode,
+            "total_wall_s": total_wall,
+            "peak_rss_mb": peak,
+            "worker_peak_rss_mb": worker_peak,
+            "settings": settings or {},
+            "stages": self.records
+        }
+        with open(self.report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+        return self.report_path
+
+
+def run_counted(parse_fn, task):
+    """
+    ִparse_fn(task) (ֽ, Ŀ)ڽ̳workerδ
+    ̼ģʽҲеãָԭֵunpack_countedͳһۼ
+    """
+    counting, items_read = PROFILER.counting, PROFILER.items_read
+    PROFILER.counting = True
+    try:
+        result = parse_fn(task)
+        return result, PROFILER.items_read - items_read
+    finally:
+        PROFILER.counting, PROFILER.items_read = counting, items_read
+
+
+# ȫԤűmain()аConfig
+PROFILER = StageProfiler()
\ No newline at end of file
@@ -0,0 +1,399 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import json
+import time
+import numpy as np
+import pandas as pd
+from collections import Counter
+
+# --------------------------
+# ڶȫֲ
+# --------------------------
+class Config:
+    # 1. ݣֿⷢľۺCSV
+    DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data")
+    SIZE_XMIN = 1  # ʵû/ʵԻϵ
+
+    # 2. 1ģSCALEʱŴ
+    BASE_USERS = 20000  # ˺ϵʵģֲ䵽ʵΪ˺ŲУ
+    BASE_POSTS = 8000  # livefeeds
+    BASE_INTERACTIONS = 30000  # ظ+ת+еռȲ֣
+    BASE_BOOSTER_ITEMS = 4000  # boostersfavouritesĿÿΪһӵĵ/ת˺б
+    SCALE = 1
+
+    # 3. δܴӾۺCSVϵ״
+    USER_ACTIVITY_ALPHA = 2.0  # ˺ŻԾȣѡΪ/ߵȨأָ
+    POST_POPULARITY_ALPHA = 2.0  # ȶȣ/תбȵȨأָ
+    OWN_TAG_SHARE = 0.5  # ʵʵӱǩȡԸʵűǩıఴȫǩƵγȡ
+    START_DATE = "2024-12-01"  # ɼʼգFediLiveɼ13죩
+    DAYS = 13
+
+    # 4. ֿ
+    OUTPUT_DIR = r""  # ֿĿ¼
+    CHUNK_ITEMS = 5000  # ÿֿļĿļΪ ǰ׺N.jsonN1ʼ
+    RANDOM_SEED = 42
+
+# ߼汾ıͬݵ޸benchmark_scaleݴжɵķֿܷã
+GENERATOR_VERSION = 3
+
+# --------------------------
+# ӾۺCSVϷֲ
+# --------------------------
+INTERACTION_TYPES = ("reply", "boost", "fav")
+
+
+def fit_power_law(values, xmin=1):
+    """ɢָļȻƣalpha = 1 + n / ln(x / (xmin - 0.5))ֻxxminֵ"""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[values >= xmin]
+    if len(values) == 0:
+        return None
+    return float(1 + len(values) / np.log(values / (xmin - 0.5)).sum())
+
+
+def fit_log_slope(x, y):
+    """log(y)log(x)СбʣֻxyΪĵ㣩"""
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    keep = (x > 0) & (y > 0)
+    return float(np.polyfit(np.log(x[keep]), np.log(y[keep]), 1)[0])
+
+
+def read_csv(data_dir, file_name):
+    return pd.read_csv(os.path.join(data_dir, file_name), encoding="utf-8-sig", keep_default_na=False, dtype={
+        "ʵID": str, "ʵ": str, "Ŀʵ": str, "ǩ": str
+    })
+
+
+def fit_profile(data_dir=None):
+    """
+    instance_attributes.csvinteraction_matrix_*.csvϺϳݵķֲ
+    - ʵģûָʵûռȣضޣģʵʵűǩ
+    - ʵԣָܻУ飩ʵ/ûݴΣ/ĿʵĳȨأ
+    - ͵ռʵڻռ
+    """
+    data_dir = data_dir or Config.DATA_DIR
+    attrs = read_csv(data_dir, "instance_attributes.csv").sort_values("û", ascending=False, kind="stable")
+    total = read_csv(data_dir, "interaction_matrix_total.csv")
+    sizes = attrs["û"].to_numpy()
+
+    out_strength = total.groupby("ʵ")[""].sum()
+    in_strength = total.groupby("Ŀʵ")[""].sum()
+    users = attrs.set_index("ʵID")["û"]
+    type_totals = {}
+    type_self = {}
+    for interaction_type in INTERACTION_TYPES:
+        matrix = read_csv(data_dir, f"interaction_matrix_{interaction_type}.csv")
+        type_totals[interaction_type] = int(matrix[""].sum())
+        type_self[interaction_type] = float(matrix.loc[matrix["ʵ"] == matrix["Ŀʵ"], ""].sum() / max(type_totals[interaction_type], 1))
+    volume = sum(type_totals.values())
+
+    tag_lists = [[tag for tag in tags.split(",") if tag] if tags != "" else [] for tags in attrs["ǩ"]]
+    tag_counts = Counter(tag for tags in tag_lists for tag in tags)
+    return {
+        "instance_alpha": fit_power_law(sizes, Config.SIZE_XMIN),
+        "max_instance_share": float(sizes.max() / sizes.sum()),
+        "active_user_ratio": float(attrs["Ծû"].sum() / sizes.sum()),
+        "pair_alpha": fit_power_law(total[""], Config.SIZE_XMIN),
+        "out_exponent": fit_log_slope(users.reindex(out_strength.index), out_strength),
+        "in_exponent": fit_log_slope(users.reindex(in_strength.index), in_strength),
+        "type_share": {t: type_totals[t] / volume for t in INTERACTION_TYPES},
+        "self_share": type_self,
+        "instance_names": attrs["ʵID"].tolist(),
+        "instance_tags": tag_lists,
+        "tag_pool": [tag for tag, _ in tag_counts.most_common()],
+        "tag_weights": [count for _, count in tag_counts.most_common()]
+    }
+
+# --------------------------
+# Ĳϳʵ˺
+# --------------------------
+def sample_power_law(rng, alpha, size, xmin=1, cap=None):
+    """ɢɳParetoȡƣѡضcap"""
+    values = np.floor((xmin - 0.5) * (1 - rng.random(size)) ** (-1 / (alpha - 1)) + 0.5).astype(np.int64)
+    values = np.maximum(values, xmin)
+    return np.minimum(values, cap) if cap is not None else values
+
+
+class SyntheticPopulation:
+    """
+    ϳɵʵ˺ţ
+    - ʵûϵɳֱ˺ﵽĿ꣨ʵʵռȣģУ
+      ǰɸʹͬʵʵΪ nodeN.fedi.example
+    - ˺ŰʵţԾȨطɣʵڰȨس˺ţȫۼȨ϶ֲң
+    - /Ŀʵֱ û^ݴ / û^ݴ 
+    """
+    def __init__(self, profile, n_users, rng):
+        self.profile = profile
+        self.rng = rng
+        cap = max(1, int(profile["max_instance_share"] * n_users))
+        sizes = []
+        remaining = n_users
+        while remaining > 0:
+            batch = sample_power_law(rng, profile["instance_alpha"], max(64, remaining // 16), Config.SIZE_XMIN, cap)
+            batch = batch[np.cumsum(batch) <= remaining] if batch.sum() > remaining else batch
+            if len(batch) == 0:
+                batch = np.array([remaining])
+            sizes.append(batch)
+            remaining -= int(batch.sum())
+        self.sizes = np.sort(np.concatenate(sizes))[::-1]
+        self.n_instances = len(self.sizes)
+        real_names = profile["instance_names"]
+        self.names = [real_names[i] if i < len(real_names) else f"node{i}.fedi.example" for i in range(self.n_instances)]
+
+        # ˺ţʵУinstance_start[i]Ϊʵiĵһ˺
+        self.user_instance = np.repeat(np.arange(self.n_instances), self.sizes)
+        self.n_users = len(self.user_instance)
+        self.instance_start = np.concatenate([[0], np.cumsum(self.sizes)[:-1]])
+        weights = (1 - rng.random(self.n_users)) ** (-1 / (Config.USER_ACTIVITY_ALPHA - 1))
+        self.cum_weights = np.cumsum(weights)
+        instance_end = self.instance_start + self.sizes
+        self.weight_low = np.where(self.instance_start > 0, self.cum_weights[self.instance_start - 1], 0.0)
+        self.weight_high = self.cum_weights[instance_end - 1]
+
+        sizes_float = self.sizes.astype(np.float64)
+        self.out_p = sizes_float ** profile["out_exponent"]
+        self.out_p /= self.out_p.sum()
+        self.in_p = sizes_float ** profile["in_exponent"]
+        self.in_p /= self.in_p.sum()
+
+    def source_instances(self, n):
+        return self.rng.choice(self.n_instances, size=n, p=self.out_p)
+
+    def other_instances(self, exclude, p):
+        """pexcludeͬʵexcludeĿ³ȥʵ¹һķֲϳ"""
+        instances = self.rng.choice(self.n_instances, size=len(exclude), p=p)
+        if self.n_instances < 2:
+            return instances
+        same = instances == exclude
+        while same.any():
+            instances[same] = self.rng.choice(self.n_instances, size=int(same.sum()), p=p)
+            same = instances == exclude
+        return instances
+
+    def target_instances(self, sources, self_share):
+        """self_shareĸڷʵڣȨسһĿʵ"""
+        targets = self.other_instances(sources, self.in_p)
+        return np.where(self.rng.random(len(sources)) < self_share, sources, targets)
+
+    def users_in(self, instances):
+        """ڸʵڰԾȨس˺"""
+        low, high = self.weight_low[instances], self.weight_high[instances]
+        users = np.searchsorted(self.cum_weights, low + self.rng.random(len(instances)) * (high - low), side="right")
+        return np.minimum(users, self.instance_start[instances] + self.sizes[instances] - 1)
+
+    def distinct_users_in(self, instances, segments, rounds=8):
+        """
+        instances˺ţ֤ͬһsegmentͬһӵĵ/תб˺Żظ
+        ظĿԭʵ³ֺظʵ˺㣩Ŀɾ
+        segmentsΪǽ򣻷 (˺, Ŀsegment)
+        """
+        users = self.users_in(instances)
+        for _ in range(rounds):
+            repeated = repeated_in_segment(segments, users, self.n_users)
+            if not repeated.any():
+                break
+            users[repeated] = self.users_in(instances[repeated])
+        keep = ~repeated_in_segment(segments, users, self.n_users)
+        return users[keep], segments[keep]
+
+
+def repeated_in_segment(segments, users, n_users):
+    """ͬһsegmentڵڶμԺֵ˺"""
+    _, first = np.unique(segments * n_users + users, return_index=True)
+    repeated = np.ones(len(users), dtype=bool)
+    repeated[first] = False
+    return repeated
+
+# --------------------------
+# 岽FediLive״JSONĿֱƴJSONı
+# --------------------------
+class ItemWriter:
+    """Mastodon APIֶƴ˺//ĿJSONı˺ֶ˺űȷͬһ˺ڸֿȫһ"""
+    def __init__(self, population, start_timestamp):
+        self.population = population
+        self.names = population.names
+        self.start = start_timestamp
+        self.span = Config.DAYS * 86400
+
+    def timestamp(self, seconds, with_millis=True):
+        text = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(self.start + int(seconds)))
+        return text + (".000Z" if with_millis else "Z")
+
+    def account(self, user):
+        user = int(user)
+        instance = self.names[self.population.user_instance[user]]
+        # ˺ʹ/users/ʽURLMisskeyʵ֣ΪMastodon/@ûʽ
+        path = f"users/user{user}" if user % 25 == 0 else f"@user{user}"
+        last_status = time.strftime("%Y-%m-%d", time.gmtime(self.start + (user * 7919) % self.span))
+        return (
+            f'{{"id": "{100000000 + user}", "username": "user{user}", "acct": "user{user}@{instance}", '
+            f'"display_name": "User {user}", "locked": false, "bot": {"true" if user % 20 == 0 else "false"}, '
+            f'"created_at": "{self.timestamp(-((user * 104729) % (900 * 86400)) - 86400)}", '
+            f'"note": "<p>about user{user} \\"on {instance}\\"</p>", "url": "https://{instance}/{path}", '
+            f'"avatar": "https://{instance}/avatars/{user}.png", "followers_count": {(user * 31) % 5000}, '
+            f'"following_count": {(user * 17) % 2000}, "statuses_count": {(user * 13) % 20000}, '
+            f'"last_status_at": "{last_status}", "emojis": [], '
+            f'"fields": [{{"name": "site", "value": "<a href=\\"https://{instance}\\">{instance}</a>"}}]}}'
+        )
+
+    def status(self, sid, user, seconds, tags, words):
+        tag_json = ", ".join(f'{{"name": {tag}, "url": "https://{self.names[self.population.user_instance[user]]}/tags"}}' for tag in tags)
+        return (
+            f'{{"sid": "{sid}", "created_at": "{self.timestamp(seconds)}", "language": "en", '
+            f'"content": "<p>{"lorem ipsum dolor sit amet " * words}</p>", "account": {self.account(user)}, '
+            f'"media_attachments": [], "tags": [{tag_json}], "emojis": [], "card": null, '
+            f'"replies_count": {words % 7}, "reblogs_count": {words % 11}, "favourites_count": {words % 23}}}'
+        )
+
+    def reply(self, sid, from_user, to_user, seconds):
+        return (
+            f'{{"sid": "{sid}", "created_at": "{self.timestamp(seconds)}", '
+            f'"content": "<p>re: thanks \\\\o/</p>", "acct": {self.account(from_user)}, "reply_to_acct": {self.account(to_user)}}}'
+        )
+
+    def boosters(self, sid, favourite_users, reblog_users):
+        favourites = ", ".join(self.account(user) for user in favourite_users)
+        reblogs = ", ".join(self.account(user) for user in reblog_users)
+        return f'{{"sid": "{sid}", "favourites": [{favourites}], "reblogs": [{reblogs}]}}'
+
+
+def write_chunk_files(out_dir, prefix, items):
+    """ĿıCHUNK_ITEMSһдΪ ǰ׺N.jsonļֽ"""
+    n_files, n_bytes, batch = 0, 0, []
+
+    def flush():
+        nonlocal n_files, n_bytes
+        n_files += 1
+        data = ("[\n" + ",\n".join(batch) + "\n]").encode("utf-8")
+        with open(os.path.join(out_dir, f"{prefix}{n_files}.json"), "wb") as f:
+            f.write(data)
+        n_bytes += len(data)
+        batch.clear()
+
+    for item in items:
+        batch.append(item)
+        if len(batch) >= Config.CHUNK_ITEMS:
+            flush()
+    if batch:
+        flush()
+    return n_files, n_bytes
+
+# --------------------------
+# ֿ
+# --------------------------
+def generate_chunks(out_dir, scale=None, profile=None, seed=None):
+    """
+    out_dir livefeeds_N.json / reply_N.json / boostersfavourites_N.jsonعģļͳ
+    ͬһscaleseedɵȫһ
+    """
+    scale = Config.SCALE if scale is None else scale
+    profile = profile or fit_profile()
+    rng = np.random.default_rng(Config.RANDOM_SEED if seed is None else seed)
+    os.makedirs(out_dir, exist_ok=True)
+    population = SyntheticPopulation(profile, int(Config.BASE_USERS * scale), rng)
+    writer = ItemWriter(population, pd.Timestamp(Config.START_DATE, tz="UTC").timestamp())
+    span = Config.DAYS * 86400
+    stats = {"scale": scale, "instances": population.n_instances, "users": population.n_users}
+
+    # 1. ӣ߰ȨسʵʵڰԾȳ˺ţsidΪ ʵ#Ӻ
+    n_posts = int(Config.BASE_POSTS * scale)
+    post_instance = population.source_instances(n_posts)
+    post_user = population.users_in(post_instance)
+    post_sid = [f"{population.names[i]}#{113000000000 + index}" for index, i in enumerate(post_instance)]
+    post_seconds = rng.integers(0, span, n_posts)
+    tag_pool = [json.dumps(tag, ensure_ascii=False) for tag in profile["tag_pool"]]
+    tag_p = np.asarray(profile["tag_weights"], dtype=np.float64)
+    tag_p /= tag_p.sum()
+    n_tags = rng.choice(4, size=n_posts, p=[0.4, 0.3, 0.2, 0.1])
+    global_tags = rng.choice(len(tag_pool), size=int(n_tags.sum()), p=tag_p)
+    own_tag = rng.random(len(global_tags)) < Config.OWN_TAG_SHARE
+    instance_tags = profile["instance_tags"]
+
+    def post_items():
+        cursor = 0
+        for index in range(n_posts):
+            instance = post_instance[index]
+            tags = []
+            for k in range(cursor, cursor + n_tags[index]):
+                own = instance_tags[instance] if instance < len(instance_tags) else []
+                tags.append(json.dumps(own[k % len(own)], ensure_ascii=False) if own and own_tag[k] else tag_pool[global_tags[k]])
+            cursor += n_tags[index]
+            yield writer.status(post_sid[index], post_user[index], post_seconds[index], tags, 2 + index % 29)
+
+    stats["livefeeds"] = (n_posts,) + write_chunk_files(out_dir, "livefeeds_", post_items())
+
+    # Ӱʵ飬ΪظѡĿʵϵ
+    post_order = np.argsort(post_instance, kind="stable")
+    posts_per_instance = np.bincount(post_instance, minlength=population.n_instances)
+    first_post = np.concatenate([[0], np.cumsum(posts_per_instance)[:-1]])
+
+    # 2. ظ/ĿʵϵĳȨʵڻռȳ
+    share, self_share = profile["type_share"], profile["self_share"]
+    n_replies = int(Config.BASE_INTERACTIONS * scale * share["reply"])
+    reply_from_instance = population.source_instances(n_replies)
+    reply_to_instance = population.target_instances(reply_from_instance, self_share["reply"])
+    reply_from = population.users_in(reply_from_instance)
+    reply_to = population.users_in(reply_to_instance)
+    has_post = posts_per_instance[reply_to_instance] > 0
+    pick = (rng.random(n_replies) * np.maximum(posts_per_instance[reply_to_instance], 1)).astype(np.int64)
+    reply_post = np.where(has_post, post_order[np.minimum(first_post[reply_to_instance] + pick, n_posts - 1)], rng.integers(0, n_posts, n_replies))
+    reply_seconds = rng.integers(0, span, n_replies)
+    stats["reply"] = (n_replies,) + write_chunk_files(out_dir, "reply_", (
+        writer.reply(post_sid[reply_post[index]], reply_from[index], reply_to[index], reply_seconds[index])
+        for index in range(n_replies)
+    ))
+
+    # 3. /תʵȨѡӣбȰȶȣȨأ
+    n_items = min(int(Config.BASE_BOOSTER_ITEMS * scale), n_posts)
+    item_p = population.in_p[post_instance]
+    item_posts = rng.choice(n_posts, size=n_items, replace=False, p=item_p / item_p.sum())
+    popularity = sample_power_law(rng, Config.POST_POPULARITY_ALPHA, n_items).astype(np.float64)
+    popularity /= popularity.sum()
+    interactors = {}
+    for interaction_type in ("fav", "boost"):
+        counts = rng.multinomial(int(Config.BASE_INTERACTIONS * scale * share[interaction_type]), popularity)
+        target = np.repeat(post_instance[item_posts], counts)
+        # /תߣʵڻռʵ򰴳Ȩسʵͬһӵб˺Ųظ
+        source = np.where(rng.random(len(target)) < self_share[interaction_type], target, population.other_instances(target, population.out_p))
+        users, segments = population.distinct_users_in(source, np.repeat(np.arange(n_items), counts))
+        counts = np.bincount(segments, minlength=n_items)
+        interactors[interaction_type] = np.split(users, np.cumsum(counts)[:-1])
+    stats["boostersfavourites"] = (n_items,) + write_chunk_files(out_dir, "boostersfavourites_", (
+        writer.boosters(post_sid[item_posts[index]], interactors["fav"][index], interactors["boost"][index])
+        for index in range(n_items)
+    ))
+    stats["interactions"] = {
+        "reply": n_replies, "boost": int(sum(len(u) for u in interactors["boost"])), "fav": int(sum(len(u) for u in interactors["fav"]))
+    }
+    return stats
+
+
+def main():
+    print("="*60)
+    print("        Synthetic FediLive Chunk Generator")
+    print("="*60)
+    if not Config.OUTPUT_DIR:
+        raise ValueError("Config.OUTPUT_DIR is not set")
+    profile = fit_profile()
+    print(f"Fitted on {Config.DATA_DIR}: instance size alpha {profile['instance_alpha']:.3f} "
+          f"(max share {profile['max_instance_share']:.3f}), pair weight alpha {profile['pair_alpha']:.3f}, "
+          f"out/in exponents {profile['out_exponent']:.3f}/{profile['in_exponent']:.3f}")
+    print("Type share / intra-instance share: " + ", ".join(
+        f"{t} {profile['type_share'][t]:.3f}/{profile['self_share'][t]:.3f}" for t in INTERACTION_TYPES
+    ))
+    start = time.perf_counter()
+    stats = generate_chunks(Config.OUTPUT_DIR, Config.SCALE, profile)
+    print(f"\nScale {stats['scale']}x: {stats['instances']} instances, {stats['users']} accounts")
+    for chunk_type in ("livefeeds", "reply", "boostersfavourites"):
+        n_items, n_files, n_bytes = stats[chunk_type]
+        print(f"  {chunk_type}: {n_items} items in {n_files} files ({n_bytes / 1024 ** 2:.1f} MB)")
+    print(f"  interactions: {stats['interactions']}")
+    print(f"Generated in {time.perf_counter() - start:.1f}s  {Config.OUTPUT_DIR}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
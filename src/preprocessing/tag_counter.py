@@ -0,0 +1,118 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import heapq
+from collections import Counter
+
+# --------------------------
+# ڶнűǩͳƣSpace-Saving㷨
+# --------------------------
+class SpaceSavingCounter:
+    """
+    Space-Savingͳƣౣcapacityǩڴǩ޹
+    - ÿǩ¼ [ƴ, ߹]ʵ  [ƴ-߹, ƴ]
+    - ߹ϽΪ Ѵǩ / capacitycapacity  k ʱǰk׼ȷ
+    - ӿCounterһ£update / most_commonֶֽ֧鲢
+    """
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("SpaceSavingCounter capacity must be >= 1")
+        self.capacity = capacity
+        self.counts = {}  # tag  [count, error]˳ͬƵʱȶ
+        self.total = 0
+        self._heap = []  # (count, seq, tag) ɾСѣڶλС
+        self._seq = 0
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __bool__(self):
+        return bool(self.counts)
+
+    def _push(self, tag, count):
+        self._seq += 1
+        heapq.heappush(self._heap, (count, self._seq, tag))
+        # ĿʱؽѣƶѴС
+        if len(self._heap) > 4 * self.capacity + 16:
+            self._heap = [(entry[0], seq, tag) for seq, (tag, entry) in enumerate(self.counts.items())]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self):
+        """ǰСıǩڶĿ"""
+        while True:
+            count, _, tag = heapq.heappop(self._heap)
+            entry = self.counts.get(tag)
+            if entry is not None and entry[0] == count:
+                return tag, count
+
+    def add(self, tag, count=1):
+        self.total += count
+        entry = self.counts.get(tag)
+        if entry is not None:
+            entry[0] += count
+        elif len(self.counts) < self.capacity:
+            entry = self.counts[tag] = [count, 0]
+        else:
+            # 滻Сıǩ±ǩ̳Ϊ߹
+            evicted, min_count = self._pop_min()
+            del self.counts[evicted]
+            entry = self.counts[tag] = [min_count + count, min_count]
+        self._push(tag, entry[0])
+
+    def update(self, tags):
+        for tag in tags:
+            self.add(tag)
+
+    def min_count(self):
+        """ʱСδֱǩļϽ磩δʱΪ0"""
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(entry[0] for entry in self.counts.values())
+
+    def error_bound(self):
+        """һǩƴ߹Ͻ"""
+        return self.total // self.capacity
+
+    def most_common(self, n=None):
+        """ƴ򷵻 [(tag, count)]ͬƵΰ״β˳Counterһ£"""
+        items = sorted(((tag, entry[0]) for tag, entry in self.counts.items()), key=lambda x: x[1], reverse=True)
+        return items if n is None else items[:n]
+
+    def merge(self, other):
+        """鲢һֽɺϲժҪȱʧǩԶԷС㣬ٽضΪcapacity"""
+        self_min = self.min_count()
+        other_min = other.min_count()
+        combined = {}
+        for tag, (count, error) in self.counts.items():
+            other_count, other_error = other.counts.get(tag, (other_min, other_min))
+            combined[tag] = [count + other_count, error + other_error]
+        for tag, (count, error) in other.counts.items():
+            if tag not in combined:
+                combined[tag] = [count + self_min, error + self_min]
+
+        kept = sorted(combined.items(), key=lambda x: x[1][0], reverse=True)[:self.capacity]
+        kept_tags = {tag for tag, _ in kept}
+        self.counts = {tag: entry for tag, entry in combined.items() if tag in kept_tags}
+        self.total += other.total
+        self._heap = [(entry[0], seq, tag) for seq, (tag, entry) in enumerate(self.counts.items())]
+        heapq.heapify(self._heap)
+        self._seq = len(self._heap)
+
+# --------------------------
+# 鲢
+# --------------------------
+def new_tag_counter(sketch_capacity=None):
+    """sketch_capacityΪNoneʱȷCounterʹнSpaceSavingCounter"""
+    if sketch_capacity is None:
+        return Counter()
+    return SpaceSavingCounter(sketch_capacity)
+
+
+def merge_tag_counter(target, source):
+    """sourceıǩ鲢targetһ£"""
+    if isinstance(target, SpaceSavingCounter):
+        target.merge(source)
+    else:
+        target.update(source)
\ No newline at end of file
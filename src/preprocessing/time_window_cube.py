@@ -0,0 +1,334 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import json
+import numpy as np
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from sid_index import hash64
+
+# --------------------------
+# ڶʱʱ䴰
+# --------------------------
+WINDOW_SECONDS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+INTERACTION_TYPES = ("reply", "boost", "fav")  # interaction_matrix_{type}.csvһ
+
+
+@lru_cache(maxsize=65536)
+def parse_timestamp(value):
+    """
+    Mastodonʱַ  UTC뼶ʱʧܻΪʱNone
+    - ֧"2024-12-05T10:11:12Z"/ʱƫƵISOʽ봿"2024-12-05"
+    - ͬһ˺ŵlast_status_atз֣ʹLRU
+    """
+    if not value or value == "None":
+        return None
+    text = value.strip()
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def account_timestamp(account):
+    """
+    ˺ŵʱRQ1/2һ£last_status_atcreated_at
+    ע˺żնǻʱ䣬ʱ䴰ۺֻڻӶûʱʱΪ
+    """
+    return parse_timestamp(account.get("last_status_at") or "") or parse_timestamp(account.get("created_at") or "")
+
+
+class WindowSpec:
+    """
+    ʱ䴰壺ں = (ʱ - ) // 
+    sizeΪ"hour" / "day" / "week"originĬΪUTC 1970-01-01ȻСʱ/ն룩
+    """
+    def __init__(self, size, origin=0):
+        self.seconds = WINDOW_SECONDS[size] if isinstance(size, str) else int(size)
+        if self.seconds <= 0:
+            raise ValueError(f"Invalid time window: {size}")
+        self.origin = int(origin)
+
+    def window_of(self, timestamp):
+        return (timestamp - self.origin) // self.seconds
+
+    def window_start(self, windows):
+        """ں  ʼʱΪ飩"""
+        return np.asarray(windows, dtype=np.int64) * self.seconds + self.origin
+
+    def to_dict(self):
+        return {"seconds": self.seconds, "origin": self.origin}
+
+# --------------------------
+# SID  ʱת/ްӵķʱʱ䴰
+# --------------------------
+class PostTimeIndex:
+    """
+    SID  ʱĽ
+    - SIDֻ64λϣsid_index.SidRecipientIndexһ£ÿռ 8+8 ֽ
+    - ׶ΰ˳׷ӣɰֿ˳mergefinalize()ʱ򲢶ظSIDȳֵʱ
+    """
+    def __init__(self):
+        self.sid_hashes = array("q")
+        self.timestamps = array("q")
+        self.finalized = False
+
+    def __len__(self):
+        return len(self.sid_hashes)
+
+    def add(self, sid, timestamp):
+        self.sid_hashes.append(hash64(sid))
+        self.timestamps.append(timestamp)
+
+    def merge(self, other):
+        self.sid_hashes.extend(other.sid_hashes)
+        self.timestamps.extend(other.timestamps)
+
+    def finalize(self):
+        if self.finalized:
+            return self
+        sid_hashes = np.frombuffer(self.sid_hashes, dtype=np.int64)
+        order = np.argsort(sid_hashes, kind="stable")
+        _, first = np.unique(sid_hashes[order], return_index=True)
+        keep = order[first]
+        self.sid_hashes = sid_hashes[keep]
+        self.timestamps = np.frombuffer(self.timestamps, dtype=np.int64)[keep]
+        self.finalized = True
+        return self
+
+    def get(self, sid):
+        """SIDӦķʱ򷵻None"""
+        key = hash64(sid)
+        pos = int(np.searchsorted(self.sid_hashes, key))
+        if pos >= len(self.sid_hashes) or self.sid_hashes[pos] != key:
+            return None
+        return int(self.timestamps[pos])
+
+# --------------------------
+# Ĳʱ䴰ۺϣʽۼӣɹ鲢
+# --------------------------
+class TimeWindowCube:
+    """
+    ʱ䴰ʽۺϻ뷢
+    - pair_countsCounter{(ں, , ʵ, Ŀʵ): }
+    - post_countsCounter{(ں, ʵ): }
+    - post_timesSID  ʱ䣨livefeeds׶νfinalize_posts()ת/޲ң
+    - ʱȱʧ˺ʱ׵ļ¼account_timedʱļ¼untimedʱ䴰
+    ֽÿֿһmergeֿ˳鲢finalizeõĽ
+    ̳workerеĲֽûзʱת/ݴpendingУ鲢ۺʱٲ
+    """
+    def __init__(self, spec):
+        self.spec = spec
+        self.pair_counts = Counter()
+        self.post_counts = Counter()
+        self.post_times = PostTimeIndex()
+        self.pending = Counter()  # {(sid, , ʵ, Ŀʵ, ʱ): }
+        self.untimed = 0
+        self.account_timed = 0
+
+    def add_interaction(self, interaction_type, from_instance, to_instance, timestamp, fallback=None, count=1):
+        """timestampΪʱ䣻ȱʧʱfallback˺ʱaccount_timed"""
+        if timestamp is None:
+            timestamp = fallback
+            if timestamp is not None:
+                self.account_timed += count
+        if timestamp is None:
+            self.untimed += count
+            return
+        self.pair_counts[(self.spec.window_of(timestamp), interaction_type, from_instance, to_instance)] += count
+
+    def add_post_interaction(self, interaction_type, from_instance, to_instance, sid, fallback=None):
+        """ת/ޣӣsidķʱʱ䴰ʱδʱݴ"""
+        if self.post_times.finalized:
+            self.add_interaction(interaction_type, from_instance, to_instance, self.post_times.get(sid), fallback)
+        else:
+            self.pending[(sid, interaction_type, from_instance, to_instance, fallback)] += 1
+
+    def add_post(self, instance, timestamp, sid=None, fallback=None):
+        """timestampΪcreated_atͬʱ뷢ʱȱʧʱfallback˺ʱaccount_timed"""
+        if timestamp is not None:
+            if sid:
+                self.post_times.add(sid, timestamp)
+        elif fallback is not None:
+            timestamp = fallback
+            self.account_timed += 1
+        else:
+            self.untimed += 1
+            return
+        self.post_counts[(self.spec.window_of(timestamp), instance)] += 1
+
+    def finalize_posts(self):
+        """livefeedsɺãʱǰݴת/"""
+        self.post_times.finalize()
+        pending, self.pending = self.pending, Counter()
+        self._resolve(pending)
+
+    def _resolve(self, pending):
+        for (sid, interaction_type, from_instance, to_instance, fallback), count in pending.items():
+            self.add_interaction(interaction_type, from_instance, to_instance, self.post_times.get(sid), fallback, count)
+
+    def merge(self, other):
+        self.pair_counts.update(other.pair_counts)
+        self.post_counts.update(other.post_counts)
+        self.untimed += other.untimed
+        self.account_timed += other.account_timed
+        if len(other.post_times):
+            self.post_times.merge(other.post_times)
+        if self.post_times.finalized:
+            self._resolve(other.pending)
+        else:
+            self.pending.update(other.pending)
+
+    def finalize(self):
+        """תΪ洢CubeArraysʵIDֵ룩"""
+        if self.pending or not self.post_times.finalized:
+            self.finalize_posts()
+        instances = sorted(
+            {key[2] for key in self.pair_counts} | {key[3] for key in self.pair_counts} |
+            {key[1] for key in self.post_counts}
+        )
+        index = {instance_id: code for code, instance_id in enumerate(instances)}
+        type_index = {interaction_type: code for code, interaction_type in enumerate(INTERACTION_TYPES)}
+
+        n_pairs = len(self.pair_counts)
+        pairs = {
+            "window": np.fromiter((key[0] for key in self.pair_counts), dtype=np.int64, count=n_pairs),
+            "type": np.fromiter((type_index[key[1]] for key in self.pair_counts), dtype=np.int8, count=n_pairs),
+            "from": np.fromiter((index[key[2]] for key in self.pair_counts), dtype=np.int32, count=n_pairs),
+            "to": np.fromiter((index[key[3]] for key in self.pair_counts), dtype=np.int32, count=n_pairs),
+            "count": np.fromiter(self.pair_counts.values(), dtype=np.int64, count=n_pairs)
+        }
+        n_posts = len(self.post_counts)
+        posts = {
+            "window": np.fromiter((key[0] for key in self.post_counts), dtype=np.int64, count=n_posts),
+            "instance": np.fromiter((index[key[1]] for key in self.post_counts), dtype=np.int32, count=n_posts),
+            "count": np.fromiter(self.post_counts.values(), dtype=np.int64, count=n_posts)
+        }
+        return CubeArrays(self.spec, instances, pairs, posts, self.untimed, self.account_timed)
+
+# --------------------------
+# 岽յʱ壨//켣㣩
+# --------------------------
+class CubeArrays:
+    """
+    ʱ壺
+    - pairs(ں, , ʵ, Ŀʵ, ) У(, , , Ŀ)
+    - posts(ں, ʵ, ) У(, ʵ)
+    - ΪĿ¼cube.npz + instances.json + meta.jsonCIIR/Giniʱ켣ֱ㣬ضԭʼJSON
+    """
+    def __init__(self, spec, instances, pairs, posts, untimed=0, account_timed=0):
+        self.spec = spec
+        self.instances = instances
+        order = np.lexsort((pairs["to"], pairs["from"], pairs["type"], pairs["window"]))
+        self.pairs = {name: values[order] for name, values in pairs.items()}
+        order = np.lexsort((posts["instance"], posts["window"]))
+        self.posts = {name: values[order] for name, values in posts.items()}
+        self.untimed = untimed
+        self.account_timed = account_timed
+
+    @property
+    def windows(self):
+        """ֹȫںţ"""
+        return np.union1d(self.pairs["window"], self.posts["window"])
+
+    def save(self, cube_dir):
+        os.makedirs(cube_dir, exist_ok=True)
+        arrays = {f"pairs_{name}": values for name, values in self.pairs.items()}
+        arrays.update({f"posts_{name}": values for name, values in self.posts.items()})
+        np.savez(os.path.join(cube_dir, "cube.npz"), **arrays)
+        with open(os.path.join(cube_dir, "instances.json"), "w", encoding="utf-8") as f:
+            json.dump(self.instances, f, ensure_ascii=False)
+        meta = {
+            "window": self.spec.to_dict(), "types": list(INTERACTION_TYPES),
+            "untimed": self.untimed, "account_timed": self.account_timed,
+            "n_windows": int(len(self.windows)), "n_pair_cells": int(len(self.pairs["count"]))
+        }
+        with open(os.path.join(cube_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+    @classmethod
+    def load(cls, cube_dir):
+        with open(os.path.join(cube_dir, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(cube_dir, "instances.json"), "r", encoding="utf-8") as f:
+            instances = json.load(f)
+        with np.load(os.path.join(cube_dir, "cube.npz")) as data:
+            pairs = {name[len("pairs_"):]: data[name] for name in data.files if name.startswith("pairs_")}
+            posts = {name[len("posts_"):]: data[name] for name in data.files if name.startswith("posts_")}
+        spec = WindowSpec(meta["window"]["seconds"], meta["window"]["origin"])
+        return cls(spec, instances, pairs, posts, meta.get("untimed", 0), meta.get("account_timed", 0))
+
+    def instance_stats(self, types=None, span=1):
+        """
+        ڡʵĻͳƣͣ (ں, ͳֵ)
+        ͳֵÿΪ (, ʵ) ڲʵʵ
+        - typesͳƵĻͣĬȫ
+        - spanڿȣԻΪλ>1ʱspanͣںȡĩˣ
+        """
+        windows = self.windows
+        n_windows, n = len(windows), len(self.instances)
+        type_codes = [INTERACTION_TYPES.index(t) for t in (types or INTERACTION_TYPES)]
+        keep = np.isin(self.pairs["type"], type_codes)
+        row = np.searchsorted(windows, self.pairs["window"][keep])
+        src, dst, count = self.pairs["from"][keep], self.pairs["to"][keep], self.pairs["count"][keep]
+        internal = src == dst
+
+        def grid(rows, cols, weights):
+            return np.bincount(rows * n + cols, weights=weights, minlength=n_windows * n).reshape(n_windows, n)
+
+        stats = {
+            "internal": grid(row[internal], src[internal], count[internal]),
+            "cross_out": grid(row[~internal], src[~internal], count[~internal]),
+            "cross_in": grid(row[~internal], dst[~internal], count[~internal]),
+            "posts": grid(np.searchsorted(windows, self.posts["window"]), self.posts["instance"], self.posts["count"])
+        }
+        if span > 1:
+            stats = {name: rolling_sum(values, windows, span) for name, values in stats.items()}
+        return windows, stats
+
+    def ciir_trajectory(self, types=None, span=1):
+        """
+        ÿڸʵCIIR = ʵ / ܻʵ+ƣinstance_interaction_statsھһ£
+        ԼȫCIIR (ʼʱ, ʵCIIR, ȫCIIR)
+        """
+        windows, stats = self.instance_stats(types, span)
+        cross = stats["cross_out"] + stats["cross_in"]
+        total = cross + stats["internal"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            per_instance = np.where(total > 0, cross / total, np.nan)
+            overall = stats["cross_out"].sum(axis=1) / (stats["cross_out"].sum(axis=1) + stats["internal"].sum(axis=1))
+        return self.spec.window_start(windows), per_instance, overall
+
+    def gini_trajectory(self, measure="cross_in", types=None, span=1):
+        """ÿʵĳͳƣĬϿʵGiniϵֻƸôȡֵ>0ʵ"""
+        windows, stats = self.instance_stats(types, span)
+        values = np.sort(stats[measure], axis=1)
+        m = (values > 0).sum(axis=1)
+        n = values.shape[1]
+        # ȡֵ>0ʵλĩβmУеλΪ к-(n-m)+1
+        ranks = np.arange(1, n + 1)[None, :] - (n - m)[:, None]
+        totals = values.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gini = 2.0 * (ranks * values).sum(axis=1) / (m * totals) - (m + 1.0) / m
+        return self.spec.window_start(windows), np.where(totals > 0, gini, np.nan)
+
+
+def rolling_sum(values, windows, span):
+    """
+    شάͣi = ں (windows[i]-span, windows[i]] ڵĸ֮
+    ںſܲںŶкŻ䣩
+    """
+    cumulative = np.concatenate([np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)])
+    start = np.searchsorted(windows, windows - span + 1, side="left")
+    return cumulative[np.arange(1, len(windows) + 1)] - cumulative[start]
\ No newline at end of file
@@ -0,0 +1,99 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import numpy as np
+from array import array
+
+# --------------------------
+# ڶûΪǼǱ
+# --------------------------
+class UserRegistry:
+    """
+     {user_id: {"post_count", "interaction_count"}} Ƕֵ user_to_instance ֵ䣺
+    - ûIDӳΪ룬//ʵڿ
+    - behavior_sequence ¼û״βΪ˳ԭǶֵĲ˳һ£
+    - ʵȳֵӳ䣻ʵIDͬפΪ
+    - ɰֿ˳鲢ֽ̳workerصĵǼǱ
+    """
+    NO_INSTANCE = -1
+
+    def __init__(self):
+        self.index = {}  # user_id  
+        self.user_ids = []
+        self.post_counts = array("q")
+        self.interaction_counts = array("q")
+        self.instance_codes = array("i")
+        self.behavior_sequence = array("i")  # ״Ϊ˳еû
+        self.instances = []  # ʵ  ʵID
+        self._instance_lookup = {}
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def code(self, user_id):
+        """û루û׷һУΪ0ʵ"""
+        idx = self.index.get(user_id)
+        if idx is None:
+            idx = self.index[user_id] = len(self.user_ids)
+            self.user_ids.append(user_id)
+            self.post_counts.append(0)
+            self.interaction_counts.append(0)
+            self.instance_codes.append(self.NO_INSTANCE)
+        return idx
+
+    def instance_code(self, instance_id):
+        code = self._instance_lookup.get(instance_id)
+        if code is None:
+            code = self._instance_lookup[instance_id] = len(self.instances)
+            self.instances.append(instance_id)
+        return code
+
+    def _add_counts(self, idx, posts, interactions):
+        if self.post_counts[idx] == 0 and self.interaction_counts[idx] == 0:
+            self.behavior_sequence.append(idx)
+        self.post_counts[idx] += posts
+        self.interaction_counts[idx] += interactions
+
+    def add_post(self, user_id):
+        """+1"""
+        self._add_counts(self.code(user_id), 1, 0)
+
+    def add_interaction(self, user_id):
+        """+1/ת/ظ"""
+        self._add_counts(self.code(user_id), 0, 1)
+
+    def set_instance(self, user_id, instance_id):
+        """¼ûʵӳʱֲ䣩"""
+        idx = self.code(user_id)
+        if self.instance_codes[idx] == self.NO_INSTANCE:
+            self.instance_codes[idx] = self.instance_code(instance_id)
+
+    @property
+    def behavior_count(self):
+        """Ϊ¼򻥶û"""
+        return len(self.behavior_sequence)
+
+    @property
+    def instance_mapping_count(self):
+        """ʵӳû"""
+        return int(np.count_nonzero(self.arrays()["instance"] != self.NO_INSTANCE))
+
+    def arrays(self):
+        """numpyͼظУûУ"""
+        return {
+            "post": np.frombuffer(self.post_counts, dtype=np.int64),
+            "interaction": np.frombuffer(self.interaction_counts, dtype=np.int64),
+            "instance": np.frombuffer(self.instance_codes, dtype=np.int32),
+            "behavior_sequence": np.frombuffer(self.behavior_sequence, dtype=np.int32)
+        }
+
+    def merge(self, other):
+        """鲢һǼǱΪûotherΪ˳׷ӣۼӣʵӳ䱣ȳֵ"""
+        for other_idx in other.behavior_sequence:
+            idx = self.code(other.user_ids[other_idx])
+            self._add_counts(idx, other.post_counts[other_idx], other.interaction_counts[other_idx])
+        for other_idx, other_code in enumerate(other.instance_codes):
+            if other_code != self.NO_INSTANCE:
+                self.set_instance(other.user_ids[other_idx], other.instances[other_code])
\ No newline at end of file
@@ -0,0 +1,379 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import sys
+import time
+import random
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+# ԤĶȡдͬParquet/Arrowʽļpreprocessing/columnar_tables.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "preprocessing"))
+from columnar_tables import read_output_table
+from interaction_graph_store import InteractionGraphStore, coo_to_csr
+
+# --------------------------
+# ڶȫֲ
+# --------------------------
+class Config:
+    # 1. ļ·
+    DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data")
+    GRAPH_STORE_DIR = None  # Ԥϡ軥ͼĿ¼interaction_graphNoneʱȡinteraction_matrix_total.csv
+    OUTPUT_DIR = None  # Ŀ¼NoneΪ棬ӡ
+
+    # 2. ͼھ
+    INCLUDE_SELF_LOOPS = False  # ǷʵڻԽߣʵĬȥ
+
+    # 3. ȶɨ
+    METHODS = ["louvain", "label_propagation"]
+    RESOLUTIONS = [0.5, 1.0, 1.5, 2.0]  # Louvainֱʣǩʹ÷ֱʣֻظ
+    SEEDS = list(range(10))
+    WORKERS = 1  # ̳worker1Ϊ̴У
+
+    # 4. 㷨
+    MAX_PASSES = 100  # ÿֲƶ
+    MAX_LPA_ITERATIONS = 100  # ǩ
+
+    # 5. һεĻֽCSVʵID,ʵΪ𲽣NoneΪ
+    WARM_START_FILE = None
+
+# --------------------------
+# Ȩϡͼ
+# --------------------------
+class Graph:
+    """
+    ȨͼԳCSR
+    - ڵΪ0..n-1node_idsӦʵID
+    - 򻥶 A + A^T ԳƻԻȨذ
+    - degreesΪȨȣtotal_weightΪȫڽȨ֮ͣ2m
+    """
+    def __init__(self, indptr, indices, weights, node_ids=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.n = len(indptr) - 1
+        self.node_ids = node_ids
+        self.degrees = np.bincount(self.row_ids(), weights=weights, minlength=self.n)
+        self.total_weight = float(weights.sum())
+
+    @classmethod
+    def from_directed_edges(cls, src, dst, weights, n, node_ids=None, include_self_loops=False):
+        weights = np.asarray(weights, dtype=np.float64)
+        if not include_self_loops:
+            keep = src != dst
+            src, dst, weights = src[keep], dst[keep], weights[keep]
+        rows = np.concatenate([src, dst])
+        cols = np.concatenate([dst, src])
+        return cls(*coo_to_csr(rows, cols, np.concatenate([weights, weights]), n, index_dtype=np.int32), node_ids=node_ids)
+
+    def row_ids(self):
+        return np.repeat(np.arange(self.n, dtype=np.int32), np.diff(self.indptr))
+
+    def aggregate(self, membership):
+        """ϲڵ㣨ڲı߳Ϊ½ڵԻ"""
+        n_communities = int(membership.max()) + 1
+        rows = membership[self.row_ids()]
+        cols = membership[self.indices]
+        return Graph(*coo_to_csr(rows, cols, self.weights, n_communities, index_dtype=np.int32))
+
+    def adjacency_lists(self):
+        """תΪPythonбֲƶڵѭбnumpyԪطʿöࣩ"""
+        return self.indptr.tolist(), self.indices.tolist(), self.weights.tolist(), self.degrees.tolist()
+
+
+def load_interaction_graph(data_dir=None, store_dir=None, include_self_loops=None):
+    """ȡܻ󲢹ͼʹԤ.npyϡ洢"""
+    include_self_loops = Config.INCLUDE_SELF_LOOPS if include_self_loops is None else include_self_loops
+    if store_dir:
+        store = InteractionGraphStore.load(store_dir)
+        node_ids = np.array(store.instances, dtype=object)
+        src, dst, weights = store.csr("total").to_coo()
+    else:
+        df = read_output_table(
+            data_dir or Config.DATA_DIR, "interaction_matrix_total.csv", dtype={"ʵ": str, "Ŀʵ": str}
+        )
+        codes, node_ids = pd.factorize(pd.concat([df["ʵ"], df["Ŀʵ"]], ignore_index=True), sort=True)
+        src, dst = codes[:len(df)].astype(np.int64), codes[len(df):].astype(np.int64)
+        weights = df[""].to_numpy()
+        node_ids = np.asarray(node_ids, dtype=object)
+    return Graph.from_directed_edges(src, dst, weights, len(node_ids), node_ids=node_ids, include_self_loops=include_self_loops)
+
+# --------------------------
+# Ĳģ뻮ֱȽ
+# --------------------------
+def relabel(membership):
+    """ǩѹΪ0..k-1ǩֵ˳"""
+    _, compact = np.unique(membership, return_inverse=True)
+    return compact.astype(np.int64)
+
+
+def modularity(graph, membership, resolution=1.0):
+    """Q = sum_c [ in_c / 2m - resolution * (tot_c / 2m)^2 ]"""
+    m2 = graph.total_weight
+    if m2 == 0:
+        return 0.0
+    rows = membership[graph.row_ids()]
+    internal = rows == membership[graph.indices]
+    n_communities = int(membership.max()) + 1
+    in_weight = np.bincount(rows[internal], weights=graph.weights[internal], minlength=n_communities)
+    tot_weight = np.bincount(membership, weights=graph.degrees, minlength=n_communities)
+    return float(np.sum(in_weight / m2 - resolution * (tot_weight / m2) ** 2))
+
+
+def normalized_mutual_info(a, b):
+    """ֵĹһϢƽһϼ"""
+    a, b = relabel(a), relabel(b)
+    n = len(a)
+    if n == 0:
+        return 1.0
+    joint_keys, joint_counts = np.unique(a * (b.max() + 1) + b, return_counts=True)
+    pa = np.bincount(a) / n
+    pb = np.bincount(b) / n
+    pab = joint_counts / n
+    ia, ib = joint_keys // (b.max() + 1), joint_keys % (b.max() + 1)
+    mutual_info = np.sum(pab * np.log(pab / (pa[ia] * pb[ib])))
+    entropy_a = -np.sum(pa * np.log(pa))
+    entropy_b = -np.sum(pb * np.log(pb))
+    denominator = (entropy_a + entropy_b) / 2
+    return float(mutual_info / denominator) if denominator > 0 else 1.0
+
+# --------------------------
+# 岽Louvain㷨ִ֧л
+# --------------------------
+def local_moving(graph, membership, resolution, rng, max_passes=None):
+    """
+    Louvainһ׶Σ˳ڵ㳢ھѡģߣֱ޽ڵƶ
+    棨ӣw_ic - resolution * tot_c * k_i / 2m
+    أµǩ顢ʵƶ
+    """
+    max_passes = max_passes or Config.MAX_PASSES
+    indptr, indices, weights, degrees = graph.adjacency_lists()
+    m2 = graph.total_weight
+    community = membership.tolist()
+    tot = [0.0] * graph.n
+    for node, c in enumerate(community):
+        tot[c] += degrees[node]
+    order = rng.permutation(graph.n).tolist()
+
+    total_moves = 0
+    for _ in range(max_passes):
+        moves = 0
+        for node in order:
+            current = community[node]
+            k_node = degrees[node]
+            # 1. ͳƽڵھ֮ıȨԻ
+            neighbor_weights = {}
+            for p in range(indptr[node], indptr[node + 1]):
+                neighbor = indices[p]
+                if neighbor == node:
+                    continue
+                c = community[neighbor]
+                neighbor_weights[c] = neighbor_weights.get(c, 0.0) + weights[p]
+            # 2. ȽڵƳǰѡԭ
+            tot[current] -= k_node
+            scale = resolution * k_node / m2
+            best, best_gain = current, neighbor_weights.get(current, 0.0) - tot[current] * scale
+            for c, w in neighbor_weights.items():
+                gain = w - tot[c] * scale
+                if gain > best_gain + 1e-12:
+                    best, best_gain = c, gain
+            tot[best] += k_node
+            if best != current:
+                community[node] = best
+                moves += 1
+        total_moves += moves
+        if moves == 0:
+            break
+    return np.array(community, dtype=np.int64), total_moves
+
+
+def louvain(graph, resolution=1.0, seed=0, initial=None):
+    """
+    Louvainֲƶ  ۺ  ھۺͼظֱټ
+    initial: ĳʼ֣ΪڵǩNoneʱÿڵ㵥
+    أ(ԭͼڵǩ, )
+    """
+    rng = np.random.default_rng(seed)
+    if graph.total_weight == 0:
+        return np.arange(graph.n, dtype=np.int64), 0
+    level_membership = np.arange(graph.n, dtype=np.int64) if initial is None else relabel(initial)
+    node_to_current = np.arange(graph.n, dtype=np.int64)  # ԭͼڵ  ǰڵ
+    current = graph
+    levels = 0
+    while True:
+        community, _ = local_moving(current, level_membership, resolution, rng)
+        community = relabel(community)
+        node_to_current = community[node_to_current]
+        levels += 1
+        if community.max() + 1 == current.n:
+            break  # ûκκϲ
+        current = current.aggregate(community)
+        level_membership = np.arange(current.n, dtype=np.int64)
+    return node_to_current, levels
+
+# --------------------------
+# ǩ㷨
+# --------------------------
+def label_propagation(graph, seed=0, max_iterations=None):
+    """첽Ȩǩ˳򽫽ڵǩΪھȨıǩʱǰǩڲ򱣳֣"""
+    max_iterations = max_iterations or Config.MAX_LPA_ITERATIONS
+    rng = random.Random(seed)
+    indptr, indices, weights, _ = graph.adjacency_lists()
+    labels = list(range(graph.n))
+    order = list(range(graph.n))
+    for _ in range(max_iterations):
+        rng.shuffle(order)
+        changed = 0
+        for node in order:
+            label_weights = {}
+            for p in range(indptr[node], indptr[node + 1]):
+                neighbor = indices[p]
+                if neighbor != node:
+                    label = labels[neighbor]
+                    label_weights[label] = label_weights.get(label, 0.0) + weights[p]
+            if not label_weights:
+                continue
+            best_weight = max(label_weights.values())
+            if label_weights.get(labels[node]) == best_weight:
+                continue
+            candidates = [label for label, w in label_weights.items() if w == best_weight]
+            labels[node] = candidates[0] if len(candidates) == 1 else rng.choice(candidates)
+            changed += 1
+        if changed == 0:
+            break
+    return relabel(np.array(labels, dtype=np.int64))
+
+# --------------------------
+# ߲/ֱʲɨ
+# --------------------------
+# ̳workerͼ֣initializerÿworkerһΣ
+_worker_graph = None
+_worker_initial = None
+
+
+def init_worker(graph, initial):
+    global _worker_graph, _worker_initial
+    _worker_graph = graph
+    _worker_initial = initial
+
+
+def run_task(task):
+    """ִе⣬ػָ꣨κʱ"""
+    method, resolution, seed = task
+    start = time.perf_counter()
+    if method == "louvain":
+        membership, levels = louvain(_worker_graph, resolution=resolution, seed=seed, initial=_worker_initial)
+    elif method == "label_propagation":
+        membership, levels = label_propagation(_worker_graph, seed=seed), 0
+    else:
+        raise ValueError(f"Unknown community detection method: {method}")
+    elapsed = time.perf_counter() - start
+    return {
+        "method": method, "resolution": resolution, "seed": seed,
+        "n_communities": int(membership.max()) + 1 if len(membership) else 0,
+        "modularity": modularity(_worker_graph, membership, resolution),
+        # ֱͬµģȲɱȣ׼ֱ1.0һΣڿֱѡŻ
+        "modularity_standard": modularity(_worker_graph, membership, 1.0),
+        "levels": levels, "seconds": elapsed, "membership": membership
+    }
+
+
+def build_tasks(methods, resolutions, seeds):
+    tasks = []
+    for method in methods:
+        # ǩֱ޹أֻظģȰֱ1.0
+        method_resolutions = resolutions if method == "louvain" else [1.0]
+        tasks.extend((method, resolution, seed) for resolution in method_resolutions for seed in seeds)
+    return tasks
+
+
+def run_sweep(graph, methods=None, resolutions=None, seeds=None, workers=None, initial=None):
+    """ִȫ (, ֱ, ) ϣͼͨinitializerֻÿworkerһ"""
+    tasks = build_tasks(methods or Config.METHODS, resolutions or Config.RESOLUTIONS, seeds or Config.SEEDS)
+    workers = workers or Config.WORKERS
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(graph, initial)) as executor:
+            return list(executor.map(run_task, tasks))
+    init_worker(graph, initial)
+    return [run_task(task) for task in tasks]
+
+
+def summarize_stability(runs):
+    """ (, ֱ) ܣģ/ֲԼλŻֵNMI"""
+    rows = []
+    groups = {}
+    for run in runs:
+        groups.setdefault((run["method"], run["resolution"]), []).append(run)
+    for (method, resolution), group in groups.items():
+        best = max(group, key=lambda run: run["modularity"])
+        nmi = [normalized_mutual_info(run["membership"], best["membership"]) for run in group if run is not best]
+        rows.append({
+            "method": method, "resolution": resolution, "runs": len(group),
+            "modularity_mean": np.mean([run["modularity"] for run in group]),
+            "modularity_max": best["modularity"],
+            "communities_mean": np.mean([run["n_communities"] for run in group]),
+            "nmi_to_best_mean": np.mean(nmi) if nmi else 1.0,
+            "seconds_mean": np.mean([run["seconds"] for run in group])
+        })
+    return pd.DataFrame(rows)
+
+
+def load_partition(path, node_ids):
+    """ȡл֣ʵID,ΪͼʵԳΪ"""
+    df = pd.read_csv(path, encoding="utf-8-sig", dtype={"ʵID": str}, keep_default_na=False)
+    previous = dict(zip(df["ʵID"], df[""]))
+    offset = int(df[""].max()) + 1 if len(df) else 0
+    return np.array([
+        previous.get(node_id, offset + i) for i, node_id in enumerate(node_ids)
+    ], dtype=np.int64)
+
+# --------------------------
+# ڰ˲
+# --------------------------
+def main():
+    print("="*60)
+    print("        RQ2: Community Detection Stability Sweep")
+    print("="*60)
+    start = time.perf_counter()
+
+    graph = load_interaction_graph(store_dir=Config.GRAPH_STORE_DIR)
+    print(f"Graph: {graph.n} instances, {len(graph.indices) // 2} undirected edge entries, total weight {graph.total_weight / 2:.0f}")
+
+    initial = None
+    if Config.WARM_START_FILE:
+        initial = load_partition(Config.WARM_START_FILE, graph.node_ids)
+        print(f"Warm start from {Config.WARM_START_FILE} ({int(relabel(initial).max()) + 1} initial communities)")
+
+    runs = run_sweep(graph, initial=initial)
+    summary = summarize_stability(runs)
+    print("\n" + summary.to_string(index=False))
+
+    # Żְ׼ֱʣ=1ģȱȽϣֱµģüСֱӱȽܻѡͷֱ
+    best = max((run for run in runs if run["method"] == "louvain"), key=lambda run: run["modularity_standard"], default=None)
+    if best is not None:
+        print(f"\nBest Louvain partition (by modularity at resolution 1.0): resolution {best['resolution']}, seed {best['seed']}, "
+              f"{best['n_communities']} communities, modularity {best['modularity_standard']:.4f} "
+              f"(at its own resolution: {best['modularity']:.4f})")
+
+    if Config.OUTPUT_DIR:
+        os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
+        pd.DataFrame([{k: v for k, v in run.items() if k != "membership"} for run in runs]).to_csv(
+            os.path.join(Config.OUTPUT_DIR, "community_runs.csv"), index=False, encoding="utf-8-sig"
+        )
+        summary.to_csv(os.path.join(Config.OUTPUT_DIR, "community_stability.csv"), index=False, encoding="utf-8-sig")
+        if best is not None:
+            partition_path = os.path.join(Config.OUTPUT_DIR, "community_partition.csv")
+            pd.DataFrame({"ʵID": graph.node_ids, "": best["membership"]}).to_csv(
+                partition_path, index=False, encoding="utf-8-sig"
+            )
+            print(f"Best partition saved: {partition_path}")
+    print(f"\nTotal time: {time.perf_counter() - start:.2f}s ({len(runs)} runs)")
+    return runs, summary
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,328 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+# ԤĶȡдͬParquet/Arrowʽļpreprocessing/columnar_tables.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "preprocessing"))
+from columnar_tables import read_output_table
+
+# --------------------------
+# ڶȫֲ
+# --------------------------
+class Config:
+    # 1. ļ·
+    DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data")
+    PARTITION_FILE = None  # CSVʵID,community_detection.pycommunity_partition.csv
+    LANGUAGE_FILE = None  # ʵCSVѡNoneʱָֻ
+    LANGUAGE_COLUMN = ""  # CSVеʵIDΪ"ʵID"
+    OUTPUT_DIR = None  # Ŀ¼NoneΪ棬ӡ
+
+    # 2. ǩ
+    TAG_SEPARATOR = ","
+    NO_TAG = ""  # generate_instance_attributesޱǩʵдռλ
+
+    # 3. Jaccard
+    MINHASH_PERMUTATIONS = None  # NoneΪȷ㣻ΪKʱKϣMinHashƣʱܴʱʹã
+    PAIR_BATCH = 5000000  # ȷʱÿչ(, )ֶޣֵڴ棩
+    RANDOM_SEED = 42
+
+# --------------------------
+# ϡָʾʽnumpy
+# --------------------------
+class IndicatorMatrix:
+    """
+    0/1ϡָʾ󣺵rows[k]Уʵ飩еcols[k]ǩ
+    - 갴(, )Ҳظ
+    - vocabulary[к] = ǩı
+    """
+    def __init__(self, rows, cols, n_rows, vocabulary):
+        order = np.lexsort((cols, rows))
+        self.rows = np.asarray(rows, dtype=np.int64)[order]
+        self.cols = np.asarray(cols, dtype=np.int64)[order]
+        self.n_rows = n_rows
+        self.vocabulary = vocabulary
+
+    @property
+    def n_cols(self):
+        return len(self.vocabulary)
+
+    @classmethod
+    def from_multilabel(cls, values, separator=None, missing=None):
+        """
+        ɶƴӵĶǩַÿظǩֻһΣmissingռλΪޱǩ
+        ҲʽеıǩбÿΪlist/ndarrayֱչ
+        """
+        separator = separator or Config.TAG_SEPARATOR
+        missing = Config.NO_TAG if missing is None else missing
+        tags = pd.Series(values, dtype=object).map(
+            lambda value: value if isinstance(value, (list, tuple, np.ndarray))
+            else ("" if pd.isna(value) else value).split(separator)
+        )
+        exploded = tags.explode().dropna().astype(str).str.strip()
+        exploded = exploded[(exploded != "") & (exploded != missing)]
+        exploded = exploded[~pd.DataFrame({"row": exploded.index, "tag": exploded.values}).duplicated().to_numpy()]
+        cols, vocabulary = pd.factorize(exploded, sort=True)
+        return cls(exploded.index.to_numpy(), cols, len(values), list(vocabulary))
+
+    @classmethod
+    def from_labels(cls, values, missing=""):
+        """ɵǩйÿһǩʵԣ"""
+        series = pd.Series(values, dtype=object).fillna(missing)
+        keep = (series != missing).to_numpy()
+        cols, vocabulary = pd.factorize(series[keep], sort=True)
+        return cls(np.flatnonzero(keep), cols, len(values), list(vocabulary))
+
+    def row_sizes(self):
+        """ÿеıǩ"""
+        return np.bincount(self.rows, minlength=self.n_rows)
+
+    def group_counts(self, group_of_row, n_groups):
+        """
+        ͳƱǩִһηԼ
+         (, ǩ, ) 飬(, ǩ)
+        """
+        groups = group_of_row[self.rows]
+        keep = groups >= 0
+        keys = groups[keep] * self.n_cols + self.cols[keep]
+        unique_keys, counts = np.unique(keys, return_counts=True)
+        return unique_keys // self.n_cols, unique_keys % self.n_cols, counts
+
+    def group_union(self, group_of_row, n_groups):
+        """ȡǩõǩָʾ"""
+        groups, cols, _ = self.group_counts(group_of_row, n_groups)
+        return IndicatorMatrix(groups, cols, n_groups, self.vocabulary)
+
+# --------------------------
+# ĲأһηԼõȫأ
+# --------------------------
+def grouped_entropy(groups, counts, n_groups):
+    """
+     (, ) ÿǩֲͳ
+    -  H = -sum p*log2(p)һ H / log2(ͬǩ)
+    - ǩռ max(count) / total
+    """
+    totals = np.bincount(groups, weights=counts, minlength=n_groups)
+    distinct = np.bincount(groups, minlength=n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = counts / totals[groups]
+        entropy = -np.bincount(groups, weights=p * np.log2(p), minlength=n_groups)
+        normalized = np.where(distinct > 1, entropy / np.log2(np.maximum(distinct, 2)), 0.0)
+
+    # ռȣȡֵgroupsѰУ
+    dominant = np.zeros(n_groups)
+    if len(groups):
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        dominant[groups[starts]] = np.maximum.reduceat(counts, starts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dominant_share = np.where(totals > 0, dominant / totals, np.nan)
+    return pd.DataFrame({
+        "ǩ": totals.astype(np.int64),
+        "ͬǩ": distinct,
+        "": np.where(totals > 0, entropy, np.nan),
+        "һ": np.where(totals > 0, normalized, np.nan),
+        "ǩռ": dominant_share
+    })
+
+
+def dominant_labels(groups, cols, counts, n_groups, vocabulary):
+    """ÿִıǩʱȡǩСߣ"""
+    order = np.lexsort((cols, -counts, groups))
+    first = np.r_[True, groups[order][1:] != groups[order][:-1]]
+    labels = np.full(n_groups, "", dtype=object)
+    labels[groups[order][first]] = np.asarray(vocabulary, dtype=object)[cols[order][first]]
+    return labels
+
+# --------------------------
+# 岽Jaccardƶ
+# --------------------------
+def pairwise_intersections(indicator, pair_batch=None):
+    """
+    ȷ GG^Tеıǩȼϡ˻
+    - ǩͬһǩµÿй1
+    - ֶ԰ǩչÿpair_batchԣbincountۼӵnn
+    """
+    pair_batch = pair_batch or Config.PAIR_BATCH
+    n = indicator.n_rows
+    order = np.argsort(indicator.cols, kind="stable")
+    rows_by_col = indicator.rows[order]
+    col_lengths = np.bincount(indicator.cols, minlength=indicator.n_cols)
+    col_starts = np.concatenate(([0], np.cumsum(col_lengths)))
+    pair_counts = col_lengths.astype(np.int64) ** 2
+
+    intersections = np.zeros(n * n, dtype=np.int64)
+    col = 0
+    while col < indicator.n_cols:
+        # 1. ѡȡǩУһУ
+        cumulative = np.cumsum(pair_counts[col:])
+        end = col + max(1, int(np.searchsorted(cumulative, pair_batch, side="right")))
+        lengths = col_lengths[col:end]
+        if lengths.sum() == 0:
+            col = end
+            continue
+        # 2. ÿĿͬȫĿԣĿظгȡΣԶΪжڵȫλ
+        entry_start = col_starts[col:end]
+        entry_pos = np.arange(col_starts[col], col_starts[end])
+        entry_len = np.repeat(lengths, lengths)
+        entry_seg_start = np.repeat(entry_start, lengths)
+        left = np.repeat(rows_by_col[entry_pos], entry_len)
+        offsets = np.arange(entry_len.sum()) - np.repeat(np.cumsum(entry_len) - entry_len, entry_len)
+        right = rows_by_col[np.repeat(entry_seg_start, entry_len) + offsets]
+        intersections += np.bincount(left * n + right, minlength=n * n)
+        col = end
+    return intersections.reshape(n, n)
+
+
+def jaccard_from_intersections(intersections, sizes):
+    union = sizes[:, None] + sizes[None, :] - intersections
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(union > 0, intersections / union, 0.0)
+
+
+def pairwise_jaccard(indicator, pair_batch=None):
+    """֮ľȷJaccardƶȣnn"""
+    return jaccard_from_intersections(pairwise_intersections(indicator, pair_batch), indicator.row_sizes())
+
+
+def minhash_signatures(indicator, n_permutations, seed=None):
+    """
+    MinHashǩȶԱǩһûɢڱǩţԹϣϵƫ
+    ʩKԹϣ (a*x + b) mod p
+    ÿȡǩϣֵСֵзֶminimum.reduceatһεõȫеǩ
+    еǩȫΪpκηǿжȣ֮˴ȣƶminhash_jaccardдС0
+    """
+    rng = np.random.default_rng(Config.RANDOM_SEED if seed is None else seed)
+    prime = np.int64(2 ** 31 - 1)
+    a = rng.integers(1, prime, size=n_permutations, dtype=np.int64)
+    b = rng.integers(0, prime, size=n_permutations, dtype=np.int64)
+    signatures = np.full((indicator.n_rows, n_permutations), prime, dtype=np.int64)
+    if len(indicator.rows):
+        scrambled = rng.permutation(indicator.n_cols).astype(np.int64)[indicator.cols]
+        hashes = (scrambled[:, None] * a[None, :] + b[None, :]) % prime
+        starts = np.flatnonzero(np.r_[True, indicator.rows[1:] != indicator.rows[:-1]])
+        signatures[indicator.rows[starts]] = np.minimum.reduceat(hashes, starts, axis=0)
+    return signatures
+
+
+def minhash_jaccard(signatures, sizes=None, block_rows=256):
+    """
+    ǩJaccardǩȵıзֿȽϣڴ棩
+    sizesбǩʱһΪеƶ0뾫ȷjaccard_from_intersectionsһ
+    """
+    n = len(signatures)
+    similarity = np.empty((n, n))
+    for start in range(0, n, block_rows):
+        block = signatures[start:start + block_rows]
+        similarity[start:start + len(block)] = (block[:, None, :] == signatures[None, :, :]).mean(axis=2)
+    if sizes is not None:
+        empty = np.asarray(sizes) == 0
+        similarity[empty, :] = 0.0
+        similarity[:, empty] = 0.0
+    return similarity
+
+
+def group_jaccard(indicator):
+    """ѡȷMinHash"""
+    if Config.MINHASH_PERMUTATIONS:
+        return minhash_jaccard(minhash_signatures(indicator, Config.MINHASH_PERMUTATIONS), indicator.row_sizes())
+    return pairwise_jaccard(indicator)
+
+# --------------------------
+# ͬԷ
+# --------------------------
+def load_inputs():
+    """ȡ֡ʵǩ루ѡģʵԣеʵ˳"""
+    partition = pd.read_csv(Config.PARTITION_FILE, encoding="utf-8-sig", dtype={"ʵID": str}, keep_default_na=False)
+    attrs = read_output_table(
+        Config.DATA_DIR, "instance_attributes.csv", usecols=["ʵID", "ǩ"], dtype={"ʵID": str, "ǩ": str}
+    )
+    df = partition.merge(attrs, on="ʵID", how="left")
+    df["ǩ"] = df["ǩ"].fillna("")
+    if Config.LANGUAGE_FILE:
+        languages = pd.read_csv(Config.LANGUAGE_FILE, encoding="utf-8-sig", dtype=str, keep_default_na=False)
+        df = df.merge(languages[["ʵID", Config.LANGUAGE_COLUMN]], on="ʵID", how="left")
+        df[Config.LANGUAGE_COLUMN] = df[Config.LANGUAGE_COLUMN].fillna("")
+    return df
+
+
+def community_profile(indicator, communities, n_communities, prefix):
+    """һǩάȣԣȫ/ռ/ǩ"""
+    groups, cols, counts = indicator.group_counts(communities, n_communities)
+    profile = grouped_entropy(groups, counts, n_communities)
+    profile["ǩ"] = dominant_labels(groups, cols, counts, n_communities, indicator.vocabulary)
+    return profile.add_prefix(prefix)
+
+
+def top_similar_pairs(similarity, names, top_n=10):
+    """ƶȾߵɶ"""
+    upper_i, upper_j = np.triu_indices(len(similarity), k=1)
+    values = similarity[upper_i, upper_j]
+    best = np.argsort(-values, kind="stable")[:top_n]
+    return pd.DataFrame({
+        "A": np.asarray(names, dtype=object)[upper_i[best]],
+        "B": np.asarray(names, dtype=object)[upper_j[best]],
+        "Jaccard": values[best]
+    })
+
+
+def main():
+    print("="*60)
+    print("        RQ2: Community Language/Topic Homogeneity")
+    print("="*60)
+    if not Config.PARTITION_FILE:
+        raise ValueError("Config.PARTITION_FILE is not set (run community_detection.py with OUTPUT_DIR first)")
+    start = time.perf_counter()
+
+    df = load_inputs()
+    community_ids, communities = np.unique(df[""].to_numpy(), return_inverse=True)
+    n_communities = len(community_ids)
+    topics = IndicatorMatrix.from_multilabel(df["ǩ"].to_numpy())
+    print(f"{len(df)} instances, {n_communities} communities, {topics.n_cols} distinct topic tags")
+
+    # 1. أ+أ
+    profile = community_profile(topics, communities, n_communities, "")
+    if Config.LANGUAGE_FILE:
+        languages = IndicatorMatrix.from_labels(df[Config.LANGUAGE_COLUMN].to_numpy())
+        profile = pd.concat([profile, community_profile(languages, communities, n_communities, "")], axis=1)
+    profile.insert(0, "ʵ", np.bincount(communities, minlength=n_communities))
+    profile.insert(0, "", community_ids)
+    print("\nLargest communities:")
+    print(profile.sort_values("ʵ", ascending=False).head(10).to_string(index=False))
+
+    # 2. ֮⼯ϵJaccard
+    method = f"MinHash (K={Config.MINHASH_PERMUTATIONS})" if Config.MINHASH_PERMUTATIONS else "exact"
+    community_jaccard = group_jaccard(topics.group_union(communities, n_communities))
+    print(f"\nMost similar community pairs by topic Jaccard ({method}):")
+    print(top_similar_pairs(community_jaccard, community_ids).to_string(index=False))
+
+    # 3. Է֮⼯ϵJaccard
+    language_jaccard = None
+    if Config.LANGUAGE_FILE:
+        language_ids, language_groups = np.unique(df[Config.LANGUAGE_COLUMN].to_numpy(), return_inverse=True)
+        language_jaccard = group_jaccard(topics.group_union(language_groups, len(language_ids)))
+        print(f"\nMost similar language groups by topic Jaccard ({method}):")
+        print(top_similar_pairs(language_jaccard, language_ids).to_string(index=False))
+
+    if Config.OUTPUT_DIR:
+        os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
+        profile.to_csv(os.path.join(Config.OUTPUT_DIR, "community_homogeneity.csv"), index=False, encoding="utf-8-sig")
+        pd.DataFrame(community_jaccard, index=community_ids, columns=community_ids).to_csv(
+            os.path.join(Config.OUTPUT_DIR, "community_topic_jaccard.csv"), encoding="utf-8-sig"
+        )
+        if language_jaccard is not None:
+            pd.DataFrame(language_jaccard, index=language_ids, columns=language_ids).to_csv(
+                os.path.join(Config.OUTPUT_DIR, "language_topic_jaccard.csv"), encoding="utf-8-sig"
+            )
+        print(f"\nResults saved to: {Config.OUTPUT_DIR}")
+    print(f"\nTotal time: {time.perf_counter() - start:.2f}s")
+    return profile
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,193 @@
+# -*- coding: gbk -*-
+
+# --------------------------
+# һ
+# --------------------------
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from centrality_engine import load_instance_graph, centrality_table
+
+# --------------------------
+# ڶȫֲ
+# --------------------------
+class Config:
+    # 1. ļ·
+    CENTRALITY_FILE = None  # centrality_engine.pyinstance_centrality.csvNoneʱֳ
+    GRAPH_STORE_DIR = None  # Ԥϡ軥ͼĿ¼interaction_graphNoneʱȡinteraction_matrix_total.csv
+    OUTPUT_DIR = None  # Ŀ¼NoneΪ棬ӡ
+
+    # 2. ɨ
+    METRICS = ["÷", "÷", "Katz", ""]
+    K_MIN = 3
+    K_MAX = 30  # 1000ʵ-2ʱԶضϣ
+    VALUE_SOURCES = ["score", "strength"]  # score/Χֵָstrength/ΧյͼڵļȨ
+
+    # 3. scoreھʵзŻسÿkŴ
+    N_BOOTSTRAP = 200  # 0Ϊ
+    BOOTSTRAP_BATCH = 50  # ÿͬʱسڴ棺Сʵ
+    CONFIDENCE = 0.95
+    RANDOM_SEED = 42
+
+# --------------------------
+# ǰ׺͵Giniϵ
+# --------------------------
+def gini(values):
+    """Giniϵ G = 2sum(ix_i)/(mS) - (m+1)/mܺΪ0ʱnan"""
+    x = np.sort(np.asarray(values, dtype=np.float64))
+    m, total = len(x), x.sum()
+    if m == 0 or total <= 0:
+        return np.nan
+    return 2.0 * np.dot(np.arange(1, m + 1), x) / (m * total) - (m + 1.0) / m
+
+
+def prefix_gini_scan(descending, ks):
+    """
+    ԰еȡֵһάһȫkĺģǰkΧn-kGini
+    - İλΪ k-j+1sum(ix_i) = (k+1)S_k - P_k
+    - ΧλΪ n-j+1sum(ix_i) = (n+1)(S_n-S_k) - (P_n-P_k)
+     S_k = sum_{j<=k} x_jP_k = sum_{j<=k} jx_jǰ׺͵õ
+    descendingΪάÿһس״Ϊ (..., len(ks)) 
+    """
+    n = descending.shape[-1]
+    ks = np.asarray(ks)
+    positions = np.arange(1, n + 1, dtype=np.float64)
+    s = np.concatenate([np.zeros(descending.shape[:-1] + (1,)), np.cumsum(descending, axis=-1)], axis=-1)
+    p = np.concatenate([np.zeros(descending.shape[:-1] + (1,)), np.cumsum(descending * positions, axis=-1)], axis=-1)
+    s_k, p_k = s[..., ks], p[..., ks]
+    s_n, p_n = s[..., -1:], p[..., -1:]
+
+    m_core, m_periphery = ks.astype(np.float64), (n - ks).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        core = 2.0 * ((ks + 1) * s_k - p_k) / (m_core * s_k) - (m_core + 1) / m_core
+        periphery_sum = s_n - s_k
+        periphery = 2.0 * ((n + 1) * periphery_sum - (p_n - p_k)) / (m_periphery * periphery_sum) - (m_periphery + 1) / m_periphery
+    core = np.where(s_k > 0, core, np.nan)
+    periphery = np.where(periphery_sum > 0, periphery, np.nan)
+    return core, periphery
+
+
+def bootstrap_gini_scan(values, ks, n_bootstrap=None, batch=None, seed=None):
+    """
+    ʵзŻسÿָ꽵һȫkĺ/ΧGini
+    batchһǰ׺ͶһάУ
+     (Gini, ΧGini)״Ϊ (n_bootstrap, len(ks))
+    """
+    n_bootstrap = Config.N_BOOTSTRAP if n_bootstrap is None else n_bootstrap
+    batch = batch or Config.BOOTSTRAP_BATCH
+    rng = np.random.default_rng(Config.RANDOM_SEED if seed is None else seed)
+    values = np.asarray(values, dtype=np.float64)
+    core_batches, periphery_batches = [], []
+    for start in range(0, n_bootstrap, batch):
+        size = min(batch, n_bootstrap - start)
+        samples = values[rng.integers(0, len(values), size=(size, len(values)))]
+        core, periphery = prefix_gini_scan(-np.sort(-samples, axis=1), ks)
+        core_batches.append(core)
+        periphery_batches.append(periphery)
+    if not core_batches:
+        return np.empty((0, len(ks))), np.empty((0, len(ks)))
+    return np.vstack(core_batches), np.vstack(periphery_batches)
+
+# --------------------------
+# Ĳ/Χյͼɨ
+# --------------------------
+def strength_gini_scan(graph, order, ks):
+    """
+    ˳ʵģάյͼڵļȨȣ+룩
+    - ºĽڵvںĵھu֮ıߣuvĺļȨȸw
+    - vΧھu֮ıߣuΧȨȼwñ߲Χͼ
+    ÿһֻvڽӣk1ɨmax(ks)ܴΪO()ksȡֵGini
+    """
+    ks = sorted(ks)
+    scan_points = set(ks)
+    n = graph.n
+    in_core = np.zeros(n, dtype=bool)
+    core_strength = np.zeros(n)
+    periphery_strength = graph.out_strength() + graph.in_strength()
+    results = {}
+    for k in range(1, ks[-1] + 1):
+        v = order[k - 1]
+        neighbors = np.concatenate([
+            graph.indices[graph.indptr[v]:graph.indptr[v + 1]],
+            graph.in_indices[graph.in_indptr[v]:graph.in_indptr[v + 1]]
+        ])
+        weights = np.concatenate([
+            graph.weights[graph.indptr[v]:graph.indptr[v + 1]],
+            graph.in_weights[graph.in_indptr[v]:graph.in_indptr[v + 1]]
+        ])
+        core_side = in_core[neighbors]
+        np.add.at(core_strength, neighbors[core_side], weights[core_side])
+        core_strength[v] += weights[core_side].sum()
+        np.subtract.at(periphery_strength, neighbors[~core_side], weights[~core_side])
+        in_core[v] = True
+        if k in scan_points:
+            results[k] = (gini(core_strength[order[:k]]), gini(periphery_strength[order[k:]]))
+    return np.array([results[k][0] for k in ks]), np.array([results[k][1] for k in ks])
+
+# --------------------------
+# 岽ȫָKɨ
+# --------------------------
+def scan_metric(table, graph, metric, ks):
+    """ָ꣺һΣõscore/strengthֿھȫkĺ/ΧGiniŴ"""
+    values = table[metric].to_numpy(dtype=np.float64)
+    order = np.argsort(-values, kind="stable")
+    frame = pd.DataFrame({"ָ": metric, "k": ks})
+
+    if "score" in Config.VALUE_SOURCES:
+        core, periphery = prefix_gini_scan(values[order], ks)
+        frame["Gini"], frame["ΧGini"] = core, periphery
+        if Config.N_BOOTSTRAP:
+            boot_core, boot_periphery = bootstrap_gini_scan(values, ks)
+            tail = (1 - Config.CONFIDENCE) / 2 * 100
+            frame["Gini½"], frame["GiniϽ"] = np.nanpercentile(boot_core, [tail, 100 - tail], axis=0)
+            frame["ΧGini½"], frame["ΧGiniϽ"] = np.nanpercentile(boot_periphery, [tail, 100 - tail], axis=0)
+    if "strength" in Config.VALUE_SOURCES and graph is not None:
+        core, periphery = strength_gini_scan(graph, order, ks)
+        frame["ͼȨGini"], frame["ΧͼȨGini"] = core, periphery
+    return frame
+
+
+def main():
+    print("="*60)
+    print("        RQ3: K-Point Gini Sensitivity Scan")
+    print("="*60)
+    start = time.perf_counter()
+
+    graph, attrs = load_instance_graph(store_dir=Config.GRAPH_STORE_DIR)
+    if Config.CENTRALITY_FILE:
+        table = pd.read_csv(Config.CENTRALITY_FILE, encoding="utf-8-sig", dtype={"ʵID": str}, keep_default_na=False)
+        table = table.set_index("ʵID").loc[graph.node_ids].reset_index()
+    else:
+        table = centrality_table(graph, attrs)
+
+    k_max = min(Config.K_MAX, graph.n - 2)
+    ks = np.arange(Config.K_MIN, k_max + 1)
+    print(f"Scanning k = {Config.K_MIN}..{k_max} over {graph.n} instances, "
+          f"{len(Config.METRICS)} metrics, {Config.N_BOOTSTRAP} bootstrap resamples")
+
+    frames = []
+    for metric in Config.METRICS:
+        metric_start = time.perf_counter()
+        frame = scan_metric(table, graph, metric, ks)
+        frames.append(frame)
+        summary = [f"{metric}: {time.perf_counter() - metric_start:.2f}s"]
+        for column in ["Gini", "ͼȨGini"]:
+            if column in frame and frame[column].notna().any():
+                best = frame.loc[frame[column].idxmin()]
+                summary.append(f"min {column} {best[column]:.3f} at k={int(best['k'])}")
+        print(", ".join(summary))
+    result = pd.concat(frames, ignore_index=True)
+
+    if Config.OUTPUT_DIR:
+        os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
+        output_path = os.path.join(Config.OUTPUT_DIR, "gini_k_scan.csv")
+        result.to_csv(output_path, index=False, encoding="utf-8-sig")
+        print(f"\nScan results saved: {output_path}")
+    print(f"\nTotal time: {time.perf_counter() - start:.2f}s")
+    return result
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file